@@ -7,9 +7,24 @@ import logging
 import requests
 import zipfile
 import io
+import mmap
+import glob
+import hashlib
 from pathlib import Path
 from bs4 import BeautifulSoup
 
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+try:
+    from datasketch import MinHash, MinHashLSH
+    DATASKETCH_AVAILABLE = True
+except ImportError:
+    DATASKETCH_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 class CustomCorpusManager:
@@ -656,12 +671,13 @@ class CustomCorpusManager:
        
        return results
    
-def consolidate_corpus(self, target_lang):
+def consolidate_corpus(self, target_lang, deduplicate=True):
        """
        Consolide toutes les ressources disponibles pour une langue en un seul corpus
        
        Args:
            target_lang: Code de la langue cible
+           deduplicate: Supprimer les doublons (exacts et quasi-doublons) côté source
            
        Returns:
            Dictionnaire {source_lang: chemin_corpus_consolidé}
@@ -677,34 +693,196 @@ def consolidate_corpus(self, target_lang):
                logger.warning(f"Répertoire non trouvé: {input_dir}")
                continue
            
-           # Collecter toutes les paires de textes
-           all_pairs = []
-           
-           for filename in os.listdir(input_dir):
-               if filename.endswith("_aligned.tsv"):
-                   file_path = os.path.join(input_dir, filename)
-                   try:
-                       with open(file_path, 'r', encoding='utf-8') as f:
-                           reader = csv.reader(f, delimiter='\t')
-                           # Ignorer l'en-tête
-                           next(reader, None)
-                           for row in reader:
-                               if len(row) == 2 and row[0] and row[1]:
-                                   all_pairs.append((row[0], row[1]))
-                   except Exception as e:
-                       logger.error(f"Erreur lors de la lecture de {file_path}: {e}")
+           # Polars ne sait dédoublonner que les paires exactes : le chemin
+           # Python est conservé lorsque la détection MinHash est disponible
+           if POLARS_AVAILABLE and not (deduplicate and DATASKETCH_AVAILABLE):
+               count = _consolidate_with_polars(input_dir, output_path, deduplicate)
+           else:
+               count = _consolidate_with_csv(input_dir, output_path, deduplicate)
            
-           # Écrire le corpus consolidé
-           if all_pairs:
-               with open(output_path, 'w', encoding='utf-8', newline='') as f:
-                   writer = csv.writer(f, delimiter='\t')
-                   writer.writerow(['source_text', 'target_text'])
-                   for src, tgt in all_pairs:
-                       writer.writerow([src, tgt])
-               
+           if count:
                consolidated[source_lang] = output_path
-               logger.info(f"Corpus consolidé créé: {output_path} avec {len(all_pairs)} entrées")
+               logger.info(f"Corpus consolidé créé: {output_path} avec {count} entrées")
            else:
                logger.warning(f"Aucune paire trouvée pour {source_lang}-{target_lang}")
        
-       return consolidated
\ No newline at end of file
+       return consolidated
+
+
+def _consolidate_with_csv(input_dir, output_path, deduplicate=True):
+    """
+    Consolide les fichiers *_aligned.tsv d'un répertoire avec le module csv, en flux
+    
+    Chaque paire valide est écrite dès sa lecture : la mémoire utilisée ne
+    dépend pas de la taille du corpus (hors empreintes de dédoublonnage).
+    
+    Args:
+        input_dir: Répertoire contenant les fichiers alignés
+        output_path: Chemin du corpus consolidé
+        deduplicate: Supprimer les doublons côté source
+        
+    Returns:
+        Nombre de paires écrites (le fichier est supprimé s'il n'y en a aucune)
+    """
+    pairs = _iter_aligned_pairs(input_dir)
+    if deduplicate:
+        pairs = _deduplicate_pairs(pairs)
+    
+    count = 0
+    try:
+        with open(output_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, delimiter='\t')
+            writer.writerow(['source_text', 'target_text'])
+            for src, tgt in pairs:
+                writer.writerow([src, tgt])
+                count += 1
+    finally:
+        if not count and os.path.exists(output_path):
+            os.remove(output_path)
+    
+    return count
+
+
+def _iter_aligned_pairs(input_dir):
+    """Itère sur les paires (source, cible) non vides des fichiers *_aligned.tsv d'un répertoire"""
+    with os.scandir(input_dir) as entries:
+        aligned_files = [entry.path for entry in entries
+                         if entry.name.endswith("_aligned.tsv") and entry.is_file()]
+    
+    for file_path in aligned_files:
+        try:
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # Sans guillemets, aucun champ n'est protégé par csv.writer :
+                    # les lignes peuvent être découpées directement sur les octets
+                    if mm.find(b'"') == -1:
+                        yield from _iter_unquoted_pairs(mm)
+                        continue
+            
+            with open(file_path, 'r', encoding='utf-8', newline='') as f:
+                reader = csv.reader(f, delimiter='\t')
+                # Ignorer l'en-tête
+                next(reader, None)
+                for row in reader:
+                    if len(row) == 2 and row[0] and row[1]:
+                        yield row[0], row[1]
+        except Exception as e:
+            logger.error(f"Erreur lors de la lecture de {file_path}: {e}")
+
+
+def _iter_unquoted_pairs(mm):
+    """Itère sur les paires d'un TSV sans guillemets mappé en mémoire"""
+    # Ignorer l'en-tête
+    mm.readline()
+    for line in iter(mm.readline, b''):
+        fields = line.rstrip(b'\r\n').split(b'\t')
+        if len(fields) == 2 and fields[0] and fields[1]:
+            yield fields[0].decode('utf-8'), fields[1].decode('utf-8')
+
+
+def _consolidate_with_polars(input_dir, output_path, deduplicate=True):
+    """
+    Consolide les fichiers *_aligned.tsv d'un répertoire avec Polars, en flux
+    
+    Le parsing se fait dans le lecteur CSV natif de Polars et la sortie est
+    écrite par sink_csv sans matérialiser les paires en mémoire.
+    
+    Args:
+        input_dir: Répertoire contenant les fichiers alignés
+        output_path: Chemin du corpus consolidé
+        deduplicate: Supprimer les doublons exacts côté source
+
+    Returns:
+        Nombre de paires écrites (0 si aucun fichier ou aucune paire)
+    """
+    pattern = os.path.join(input_dir, '*_aligned.tsv')
+    if not glob.glob(pattern):
+        return 0
+    
+    try:
+        lazy = (
+            pl.scan_csv(pattern, separator='\t', has_header=True,
+                        new_columns=['source_text', 'target_text'])
+            .drop_nulls()
+        )
+        if deduplicate:
+            lazy = lazy.unique(subset=['source_text'], keep='first', maintain_order=True)
+        lazy.sink_csv(output_path, separator='\t')
+        count = pl.scan_csv(output_path, separator='\t').select(pl.len()).collect().item()
+    except Exception as e:
+        # Lignes mal formées (nombre de champs) : le module csv les ignore une à une
+        logger.warning(f"Consolidation Polars impossible pour {input_dir} ({e}), "
+                       f"repli sur le module csv")
+        return _consolidate_with_csv(input_dir, output_path, deduplicate)
+    
+    if not count and os.path.exists(output_path):
+        os.remove(output_path)
+    return count
+
+
+def _source_shingles(text, size=5):
+    """Retourne les shingles de mots (5-grammes) d'un texte source, encodés en UTF-8"""
+    tokens = text.lower().split()
+    if len(tokens) <= size:
+        return [' '.join(tokens).encode('utf-8')]
+    return [' '.join(tokens[i:i + size]).encode('utf-8') for i in range(len(tokens) - size + 1)]
+
+
+def _deduplicate_pairs(pairs, threshold=0.8, num_perm=128, batch_size=1000):
+    """
+    Filtre, en flux, les paires dont le texte source est un doublon ou un quasi-doublon
+    
+    Les doublons exacts sont écartés via une empreinte blake2b de 16 octets ;
+    les quasi-doublons via MinHash-LSH sur des shingles de 5 mots, si
+    datasketch est installé.
+    
+    Args:
+        pairs: Itérable de tuples (texte_source, texte_cible)
+        threshold: Seuil de similarité de Jaccard estimée pour le LSH
+        num_perm: Nombre de permutations MinHash
+        batch_size: Taille des lots pour MinHash.bulk
+        
+    Yields:
+        Les paires conservées, dans l'ordre d'origine
+    """
+    seen = set()
+    lsh = MinHashLSH(threshold=threshold, num_perm=num_perm) if DATASKETCH_AVAILABLE else None
+    batch = []
+    inserted = 0
+    dropped = 0
+    
+    def flush_batch():
+        nonlocal inserted, dropped
+        minhashes = MinHash.bulk([_source_shingles(src) for src, _ in batch], num_perm=num_perm)
+        kept = []
+        for pair, minhash in zip(batch, minhashes):
+            if lsh.query(minhash):
+                dropped += 1
+                continue
+            lsh.insert(str(inserted), minhash)
+            inserted += 1
+            kept.append(pair)
+        batch.clear()
+        return kept
+    
+    for src, tgt in pairs:
+        digest = hashlib.blake2b(src.encode('utf-8'), digest_size=16).digest()
+        if digest in seen:
+            dropped += 1
+            continue
+        seen.add(digest)
+        
+        if lsh is None:
+            yield src, tgt
+            continue
+        
+        batch.append((src, tgt))
+        if len(batch) >= batch_size:
+            yield from flush_batch()
+    
+    if batch:
+        yield from flush_batch()
+    
+    logger.info(f"Doublons supprimés: {dropped}")
@@ -3,10 +3,46 @@
 import os
 import logging
 import json
+import copy
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+
+@functools.lru_cache(maxsize=None)
+def _get_learner(db_path):
+    """Retourne l'apprenant de glossaire partagé pour une base (import différé)"""
+    from src.database.glossary_learner import EnhancedGlossaryLearner
+    return EnhancedGlossaryLearner(db_path)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_custom_corpus_manager(corpus_dir):
+    """Retourne le gestionnaire de corpus personnalisés partagé pour un répertoire"""
+    from src.corpus.custom_corpus import CustomCorpusManager
+    return CustomCorpusManager(corpus_dir)
+
+
+def _database_fingerprint(db_path):
+    """
+    Empreinte (date de modification, taille) de la base et de son journal WAL
+    
+    Toute transaction validée, quelle que soit la connexion ou le processus
+    qui l'écrit, modifie l'un de ces deux fichiers ; une simple lecture non.
+    """
+    fingerprint = []
+    for path in (db_path, db_path + '-wal'):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            fingerprint.append(None)
+        else:
+            fingerprint.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(fingerprint)
+
+
 class LinguisticResourceManager:
     """Gestion centralisée des ressources linguistiques"""
     
@@ -25,6 +61,10 @@ class LinguisticResourceManager:
         # Créer les répertoires nécessaires
         Path(self.corpus_dir).mkdir(parents=True, exist_ok=True)
         Path(self.terminology_dir).mkdir(parents=True, exist_ok=True)
+        
+        # Statistiques du glossaire mémorisées par (base, source, cible),
+        # avec l'empreinte de la base au moment du calcul
+        self._glossary_stats = {}
     
     def download_corpus(self, source_lang, target_lang, domain="WikiMatrix", max_size=None):
         """
@@ -63,7 +103,9 @@ class LinguisticResourceManager:
         from src.database.wiktionary_extractor import WiktionaryExtractor
         extractor = WiktionaryExtractor(self.db_path)
         
-        return extractor.extract_translations(source_lang, target_lang, max_words=max_words)
+        result = extractor.extract_translations(source_lang, target_lang, max_words=max_words)
+        self._invalidate_glossary_statistics()
+        return result
     
     def import_terminology(self, file_path, source_lang, target_lang=None, domain=None):
         """
@@ -82,115 +124,123 @@ class LinguisticResourceManager:
         importer = TerminologyImporter(self.db_path)
         
         target_langs = [target_lang] if target_lang else None
-        return importer.import_multilingual_terminology(file_path, source_lang, target_langs, domain)
-    
-    # Dans src/corpus/resource_manager.py, modifiez la fonction enrich_from_all_sources
-
-def enrich_from_all_sources(self, source_lang, target_lang):
-    """
-    Enrichit le glossaire à partir de toutes les sources disponibles
+        result = importer.import_multilingual_terminology(file_path, source_lang, target_langs, domain)
+        self._invalidate_glossary_statistics()
+        return result
     
-    Args:
-        source_lang: Code de la langue source
-        target_lang: Code de la langue cible
+    def enrich_from_all_sources(self, source_lang, target_lang, learner_workers=1):
+        """
+        Enrichit le glossaire à partir de toutes les sources disponibles
         
-    Returns:
-        Statistiques d'enrichissement
-    """
-    stats = {
-        'corpus': 0,
-        'wiktionary': 0,
-        'terminology': 0,
-        'custom_resources': 0,
-        'total': 0
-    }
-    
-    # 1. Extraire un corpus depuis OPUS si disponible
-    corpus_path = self.download_corpus(source_lang, target_lang)
-    if corpus_path:
-            from src.database.glossary_learner import EnhancedGlossaryLearner
-            learner = EnhancedGlossaryLearner(self.db_path)
+        Args:
+            source_lang: Code de la langue source
+            target_lang: Code de la langue cible
+            learner_workers: Nombre de processus extrayant les paires candidates
+                des ressources spécifiques (1 : dans le processus courant)
+            
+        Returns:
+            Statistiques d'enrichissement
+        """
+        stats = {
+            'corpus': 0,
+            'wiktionary': 0,
+            'terminology': 0,
+            'custom_resources': 0,
+            'total': 0
+        }
+        
+        # Les étapes 1, 2 et 4 sont limitées par le réseau : elles s'exécutent en
+        # parallèle. Wiktionary est la seule à écrire dans le glossaire pendant
+        # cette phase ; les apprentissages et imports sont faits ensuite, un par un.
+        stage_results = {}
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = {
+                executor.submit(self.download_corpus, source_lang, target_lang): 'corpus',
+                executor.submit(self.extract_wiktionary_terms, source_lang, target_lang, max_words=300): 'wiktionary',
+                executor.submit(
+                    lambda: _get_custom_corpus_manager(self.corpus_dir).download_language_specific_resources(target_lang)
+                ): 'custom_resources'
+            }
+            for future in as_completed(futures):
+                stage = futures[future]
+                try:
+                    stage_results[stage] = future.result()
+                except Exception as e:
+                    logger.error(f"Erreur lors de l'étape {stage}: {e}")
+                    stage_results[stage] = None
+        
+        # 1. Apprendre depuis le corpus OPUS si disponible
+        corpus_path = stage_results['corpus']
+        if corpus_path:
+            learner = _get_learner(self.db_path)
             
             corpus_terms = learner.learn_from_aligned_corpus(
                 corpus_path, source_lang, target_lang
             )
             stats['corpus'] = corpus_terms
         
-        # 2. Extraire des termes depuis Wiktionary
-    wiktionary_terms = self.extract_wiktionary_terms(source_lang, target_lang, max_words=300)
-    stats['wiktionary'] = wiktionary_terms
+        # 2. Termes extraits depuis Wiktionary
+        stats['wiktionary'] = stage_results['wiktionary'] or 0
         
         # 3. Importer des ressources terminologiques spécifiques si disponibles
-    terminology_stats = {}
-    for filename in os.listdir(self.terminology_dir):
-            if filename.endswith(('.tbx', '.csv', '.tsv', '.json')):
-                file_path = os.path.join(self.terminology_dir, filename)
-                
-                domain = None
-                if '_' in filename:
-                    # Format attendu: domaine_source_cible.ext
-                    parts = os.path.splitext(filename)[0].split('_')
-                    if len(parts) >= 1:
-                        domain = parts[0]
+        terminology_stats = {}
+        with os.scandir(self.terminology_dir) as entries:
+            terminology_files = [(entry.name, entry.path) for entry in entries
+                                 if entry.name.endswith(('.tbx', '.csv', '.tsv', '.json')) and entry.is_file()]
+        
+        for filename, file_path in terminology_files:
+            domain = None
+            if '_' in filename:
+                # Format attendu: domaine_source_cible.ext
+                parts = os.path.splitext(filename)[0].split('_')
+                if len(parts) >= 1:
+                    domain = parts[0]
+            
+            import_result = self.import_terminology(
+                file_path, source_lang, target_lang, domain
+            )
+            
+            if target_lang in import_result:
+                if domain not in terminology_stats:
+                    terminology_stats[domain] = 0
+                terminology_stats[domain] += import_result[target_lang]
+        
+        stats['terminology'] = sum(terminology_stats.values())
+        stats['terminology_details'] = terminology_stats
+        
+        # 4. Ajouter l'utilisation des ressources spécifiques par langue
+        try:
+            custom_resources = stage_results['custom_resources']
+            
+            if custom_resources:
+                learner = _get_learner(self.db_path)
                 
-                import_result = self.import_terminology(
-                    file_path, source_lang, target_lang, domain
-                )
+                # Aplatir les ressources (uniques ou listes) et les apprendre
+                # toutes dans une seule transaction
+                flat = [res for item in custom_resources
+                        for res in (item if isinstance(item, list) else [item])
+                        if res.get('source_lang') == source_lang]
+                paths = [res['path'] for res in flat]
+                custom_terms = learner.learn_from_aligned_corpora(
+                    paths, source_lang, target_lang, workers=learner_workers
+                ) if paths else 0
                 
-                if target_lang in import_result:
-                    if domain not in terminology_stats:
-                        terminology_stats[domain] = 0
-                    terminology_stats[domain] += import_result[target_lang]
+                stats['custom_resources'] = custom_terms
+                logger.info(f"Termes extraits des ressources spécifiques: {custom_terms}")
+        except Exception as e:
+            logger.error(f"Erreur lors de l'utilisation des ressources spécifiques: {e}")
         
-    stats['terminology'] = sum(terminology_stats.values())
-    stats['terminology_details'] = terminology_stats
-
-    
-    # Ajouter l'utilisation des ressources spécifiques par langue
-    try:
-        from src.corpus.custom_corpus import CustomCorpusManager
-        custom_manager = CustomCorpusManager(self.corpus_dir)
-        
-        # Télécharger des ressources spécifiques pour cette langue
-        custom_resources = custom_manager.download_language_specific_resources(target_lang)
-        
-        if custom_resources:
-            from src.database.glossary_learner import EnhancedGlossaryLearner
-            learner = EnhancedGlossaryLearner(self.db_path)
-            
-            custom_terms = 0
-            
-            # Traiter chaque ressource téléchargée
-            for resource in custom_resources:
-                if isinstance(resource, list):
-                    # Liste de ressources
-                    for res in resource:
-                        if res['source_lang'] == source_lang:
-                            corpus_path = res['path']
-                            terms = learner.learn_from_aligned_corpus(
-                                corpus_path, source_lang, target_lang
-                            )
-                            custom_terms += terms
-                else:
-                    # Ressource unique
-                    if resource['source_lang'] == source_lang:
-                        corpus_path = resource['path']
-                        terms = learner.learn_from_aligned_corpus(
-                            corpus_path, source_lang, target_lang
-                        )
-                        custom_terms += terms
-            
-            stats['custom_resources'] = custom_terms
-            logger.info(f"Termes extraits des ressources spécifiques: {custom_terms}")
-    except Exception as e:
-        logger.error(f"Erreur lors de l'utilisation des ressources spécifiques: {e}")
-    
-    # Mettre à jour le total
-    stats['total'] = stats['corpus'] + stats['wiktionary'] + stats['terminology'] + stats['custom_resources']
-    
-    return stats
+        # Mettre à jour le total
+        stats['total'] = stats['corpus'] + stats['wiktionary'] + stats['terminology'] + stats['custom_resources']
+        
+        self._invalidate_glossary_statistics()
+        return stats
     
-def get_glossary_statistics(self, source_lang=None, target_lang=None):
+    def _invalidate_glossary_statistics(self):
+        """Supprime les statistiques du glossaire mémorisées après une écriture"""
+        self._glossary_stats.clear()
+        
+    def get_glossary_statistics(self, source_lang=None, target_lang=None):
         """
         Obtient des statistiques sur le glossaire actuel
         
@@ -201,25 +251,44 @@ def get_glossary_statistics(self, source_lang=None, target_lang=None):
         Returns:
             Statistiques du glossaire
         """
+        db_path = os.path.realpath(self.db_path)
+        cache_key = (db_path, source_lang, target_lang)
+        fingerprint = _database_fingerprint(db_path)
+        
+        # Résultat mémorisé, tant que la base n'a pas été modifiée depuis
+        cached = self._glossary_stats.get(cache_key)
+        if cached is not None and cached[0] == fingerprint:
+            return copy.deepcopy(cached[1])
+        
         stats = {}
         
         from src.database.glossary_manager import GlossaryManager
         with GlossaryManager(self.db_path) as gm:
-            # Nombre total d'entrées
-            gm.cursor.execute("SELECT COUNT(*) FROM glossary_entries")
-            stats['total_entries'] = gm.cursor.fetchone()[0]
+            gm.conn.execute("PRAGMA cache_size = -65536")
             
-            # Entrées par paire de langues
+            source_lang_id = target_lang_id = None
             if source_lang and target_lang:
                 source_lang_id = gm.get_language_id(source_lang)
                 target_lang_id = gm.get_language_id(target_lang)
-                
-                if source_lang_id and target_lang_id:
-                    gm.cursor.execute("""
-                        SELECT COUNT(*) FROM glossary_entries
-                        WHERE source_language_id = ? AND target_language_id = ?
-                    """, (source_lang_id, target_lang_id))
-                    stats['pair_entries'] = gm.cursor.fetchone()[0]
+            
+            # Tous les agrégats en un seul parcours de glossary_entries
+            gm.cursor.execute("""
+                SELECT
+                    COUNT(*) as total,
+                    COALESCE(SUM(validated = 1), 0) as validated,
+                    COALESCE(SUM(confidence_score < 0.3), 0) as low,
+                    COALESCE(SUM(confidence_score >= 0.3 AND confidence_score < 0.7), 0) as medium,
+                    COALESCE(SUM(confidence_score >= 0.7), 0) as high,
+                    COALESCE(SUM(source_language_id = ? AND target_language_id = ?), 0) as pair_entries
+                FROM glossary_entries
+            """, (source_lang_id, target_lang_id))
+            aggregates = gm.cursor.fetchone()
+            
+            stats['total_entries'] = aggregates['total']
+            
+            # Entrées par paire de langues
+            if source_lang_id and target_lang_id:
+                stats['pair_entries'] = aggregates['pair_entries']
             
             # Statistiques par domaine
             gm.cursor.execute("""
@@ -232,23 +301,17 @@ def get_glossary_statistics(self, source_lang=None, target_lang=None):
             stats['domains'] = {row['name']: row['count'] for row in gm.cursor.fetchall()}
             
             # Entrées validées vs non validées
-            gm.cursor.execute("SELECT COUNT(*) FROM glossary_entries WHERE validated = 1")
-            stats['validated'] = gm.cursor.fetchone()[0]
+            stats['validated'] = aggregates['validated']
             stats['unvalidated'] = stats['total_entries'] - stats['validated']
             
             # Distribution des scores de confiance
-            gm.cursor.execute("""
-                SELECT 
-                    SUM(CASE WHEN confidence_score < 0.3 THEN 1 ELSE 0 END) as low,
-                    SUM(CASE WHEN confidence_score >= 0.3 AND confidence_score < 0.7 THEN 1 ELSE 0 END) as medium,
-                    SUM(CASE WHEN confidence_score >= 0.7 THEN 1 ELSE 0 END) as high
-                FROM glossary_entries
-            """)
-            confidence = gm.cursor.fetchone()
             stats['confidence'] = {
-                'low': confidence['low'],
-                'medium': confidence['medium'],
-                'high': confidence['high']
+                'low': aggregates['low'],
+                'medium': aggregates['medium'],
+                'high': aggregates['high']
             }
         
-        return stats
\ No newline at end of file
+        # Ne mémoriser que si aucune écriture n'a eu lieu pendant le calcul
+        if _database_fingerprint(db_path) == fingerprint:
+            self._glossary_stats[cache_key] = (fingerprint, copy.deepcopy(stats))
+        return stats
@@ -4,90 +4,194 @@ Cache manager for WikiTranslateAI - Multi-level caching system
 """
 
 import json
+import re
 import sqlite3
+import sys
 import threading
 import time
 import hashlib
-from typing import Any, Dict, Optional, Union
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+from datetime import datetime
 import logging
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Bloom filter size in bits (128 KiB); ~1% false positives up to ~100k keys with 3 hashes
+BLOOM_BITS = 1 << 20
+
+# Number of independently locked L1 shards (power of two)
+L1_SHARDS = 16
+
+# Magic number of a zstd frame, used to tell compressed payloads from plain JSON
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# Marker prefixed to msgpack payloads: 0xc1 is unused by msgpack and invalid in UTF-8 JSON
+MSGPACK_MARKER = b'\xc1'
+
+# Schema-like dict keys interned when unpacking msgpack payloads
+_INTERNABLE_KEY_RE = re.compile(r'[a-z_]+')
+
+
+def _intern_keys(obj: Dict) -> Dict:
+    """msgpack object_hook interning short identifier-like keys"""
+    return {
+        sys.intern(k) if isinstance(k, str) and _INTERNABLE_KEY_RE.fullmatch(k) else k: v
+        for k, v in obj.items()
+    }
+
 
 class CacheManager:
     """Multi-level cache manager with L1 (memory) + L3 (SQLite)"""
     
-    def __init__(self, cache_dir: str = "data/cache", max_memory_items: int = 1000, default_ttl: int = 3600):
+    def __init__(self, cache_dir: str = "data/cache", max_memory_items: int = 1000, default_ttl: int = 3600,
+                 cleanup_interval: int = 600):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.max_memory_items = max_memory_items
         self.default_ttl = default_ttl
         
-        # L1 Cache - Memory
-        self._memory_cache: Dict[str, Dict] = {}
-        self._access_times: Dict[str, float] = {}
-        self._lock = threading.RLock()
+        # L1 Cache - Memory, split into shards with their own lock and LRU order
+        # (insertion order = recency order, LRU first); small caches use one shard
+        self._num_shards = L1_SHARDS if max_memory_items >= L1_SHARDS else 1
+        self._shard_capacity = -(-max_memory_items // self._num_shards)
+        self._shards: "list[OrderedDict[str, Dict]]" = [OrderedDict() for _ in range(self._num_shards)]
+        self._locks = [threading.RLock() for _ in range(self._num_shards)]
         
-        # L3 Cache - SQLite
+        # L3 Cache - SQLite (values stored as zstd-compressed msgpack/JSON blobs)
+        self._compressor = zstandard.ZstdCompressor(level=3) if ZSTD_AVAILABLE else None
+        self._decompressor = zstandard.ZstdDecompressor() if ZSTD_AVAILABLE else None
         self._sqlite_db = self.cache_dir / "cache.db"
+        
+        # Bloom filter over L3 keys: a definite miss skips the SQLite lookup
+        self._bloom = bytearray(BLOOM_BITS // 8)
         self._init_sqlite()
         
         # Stats
         self.stats = {'l1_hits': 0, 'l3_hits': 0, 'misses': 0, 'sets': 0}
+        
+        # Janitor thread purging expired L3 rows (disabled when cleanup_interval <= 0)
+        self._stop_event = threading.Event()
+        self._janitor = None
+        if cleanup_interval > 0:
+            self._janitor = threading.Thread(
+                target=self._janitor_loop, args=(cleanup_interval,),
+                name="cache-janitor", daemon=True
+            )
+            self._janitor.start()
     
     def _init_sqlite(self):
-        """Initialize SQLite cache database"""
-        with sqlite3.connect(self._sqlite_db) as conn:
-            conn.execute("""
+        """Initialize SQLite cache database and its persistent connection"""
+        # Single autocommit connection shared by all threads (guarded by _conn_lock)
+        self._conn = sqlite3.connect(self._sqlite_db, check_same_thread=False, isolation_level=None)
+        self._conn_lock = threading.Lock()
+        with self._conn_lock:
+            # Only effective on a new database (before the table is created)
+            self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn.execute("""
                 CREATE TABLE IF NOT EXISTS cache_entries (
                     key TEXT PRIMARY KEY,
-                    value TEXT NOT NULL,
+                    value BLOB NOT NULL,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    expires_at TIMESTAMP
+                    expires_at INTEGER
                 )
             """)
+            # Migrate ISO-8601 expirations written by older versions to unix timestamps
+            self._conn.execute("""
+                UPDATE cache_entries
+                SET expires_at = CAST(strftime('%s', expires_at, 'utc') AS INTEGER)
+                WHERE typeof(expires_at) = 'text'
+            """)
+            for (cache_key,) in self._conn.execute("SELECT key FROM cache_entries"):
+                self._bloom_add(cache_key)
     
     def _generate_key(self, key: Union[str, Dict]) -> str:
         """Generate normalized cache key"""
         if isinstance(key, dict):
-            key_str = json.dumps(key, sort_keys=True)
-            return hashlib.md5(key_str.encode()).hexdigest()
+            if ORJSON_AVAILABLE:
+                key_bytes = orjson.dumps(key, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+            else:
+                key_bytes = json.dumps(key, sort_keys=True).encode()
+            return hashlib.blake2b(key_bytes, digest_size=16).hexdigest()
         return str(key)
     
+    def _shard_index(self, cache_key: str) -> int:
+        """Return the index of the L1 shard holding a key"""
+        return hash(cache_key) & (self._num_shards - 1)
+    
+    def _bloom_positions(self, cache_key: str) -> Tuple[int, int, int]:
+        """Compute the three bloom filter bit positions of a key"""
+        digest = hashlib.blake2b(cache_key.encode(), digest_size=12).digest()
+        return tuple(int.from_bytes(digest[i:i + 4], 'little') % BLOOM_BITS for i in (0, 4, 8))
+    
+    def _bloom_add(self, cache_key: str):
+        """Record a key in the bloom filter (caller must hold _conn_lock)"""
+        for pos in self._bloom_positions(cache_key):
+            self._bloom[pos >> 3] |= 1 << (pos & 7)
+    
+    def _bloom_may_contain(self, cache_key: str) -> bool:
+        """Return False if the key is definitely absent from L3"""
+        return all(self._bloom[pos >> 3] & (1 << (pos & 7)) for pos in self._bloom_positions(cache_key))
+    
     def get(self, key: Union[str, Dict], default: Any = None) -> Any:
         """Get value from multi-level cache"""
         cache_key = self._generate_key(key)
         
         # L1 Cache - Memory
-        with self._lock:
-            if cache_key in self._memory_cache:
-                entry = self._memory_cache[cache_key]
+        idx = self._shard_index(cache_key)
+        with self._locks[idx]:
+            shard = self._shards[idx]
+            if cache_key in shard:
+                entry = shard[cache_key]
                 if not self._is_expired(entry):
-                    self._access_times[cache_key] = time.time()
+                    shard.move_to_end(cache_key)
                     self.stats['l1_hits'] += 1
                     return entry['value']
                 else:
-                    del self._memory_cache[cache_key]
-                    self._access_times.pop(cache_key, None)
+                    del shard[cache_key]
         
         # L3 Cache - SQLite
+        if not self._bloom_may_contain(cache_key):
+            self.stats['misses'] += 1
+            return default
+        
         try:
-            with sqlite3.connect(self._sqlite_db) as conn:
-                cursor = conn.execute(
+            with self._conn_lock:
+                row = self._conn.execute(
                     "SELECT value, expires_at FROM cache_entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
-                    (cache_key, datetime.now().isoformat())
-                )
-                row = cursor.fetchone()
+                    (cache_key, int(time.time()))
+                ).fetchone()
                 if row:
-                    value = json.loads(row[0])
-                    entry = {'value': value, 'expires_at': row[1]}
-                    
-                    # Promote to L1
-                    self._set_l1(cache_key, entry)
-                    self.stats['l3_hits'] += 1
-                    return value
+                    value = self._deserialize(row[0])
+            if row:
+                entry = {'value': value, 'expires_at': row[1]}
+                
+                # Promote to L1
+                self._set_l1(cache_key, entry)
+                self.stats['l3_hits'] += 1
+                return value
         except Exception as e:
             logger.error(f"SQLite get error: {e}")
         
@@ -98,14 +202,7 @@ class CacheManager:
     def set(self, key: Union[str, Dict], value: Any, ttl: Optional[int] = None) -> bool:
         """Store value in multi-level cache"""
         cache_key = self._generate_key(key)
-        ttl = ttl or self.default_ttl
-        expires_at = datetime.now() + timedelta(seconds=ttl)
-        
-        entry = {
-            'value': value,
-            'expires_at': expires_at.isoformat(),
-            'created_at': datetime.now().isoformat()
-        }
+        entry = self._make_entry(value, ttl)
         
         success = True
         success &= self._set_l1(cache_key, entry)
@@ -116,15 +213,61 @@ class CacheManager:
         
         return success
     
+    def set_many(self, items: Union[Dict, Iterable[Tuple[Union[str, Dict], Any]]], ttl: Optional[int] = None) -> bool:
+        """Store several values at once, writing L3 in a single transaction"""
+        pairs = items.items() if isinstance(items, dict) else items
+        entries = [(self._generate_key(key), self._make_entry(value, ttl)) for key, value in pairs]
+        if not entries:
+            return True
+        
+        for cache_key, entry in entries:
+            self._set_l1(cache_key, entry)
+        
+        try:
+            with self._conn_lock:
+                self._conn.execute("BEGIN")
+                try:
+                    self._conn.executemany("""
+                        INSERT OR REPLACE INTO cache_entries 
+                        (key, value, created_at, expires_at)
+                        VALUES (?, ?, ?, ?)
+                    """, [
+                        (cache_key, self._serialize(entry['value']), entry['created_at'], entry['expires_at'])
+                        for cache_key, entry in entries
+                    ])
+                    self._conn.execute("COMMIT")
+                    for cache_key, _ in entries:
+                        self._bloom_add(cache_key)
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+        except Exception as e:
+            logger.error(f"L3 set_many error: {e}")
+            return False
+        
+        self.stats['sets'] += len(entries)
+        return True
+    
+    def _make_entry(self, value: Any, ttl: Optional[int] = None) -> Dict:
+        """Build a cache entry with its expiration metadata"""
+        ttl = ttl or self.default_ttl
+        return {
+            'value': value,
+            'expires_at': int(time.time()) + ttl,
+            'created_at': datetime.now().isoformat()
+        }
+    
     def _set_l1(self, cache_key: str, entry: Dict) -> bool:
         """Store in L1 cache with LRU eviction"""
         try:
-            with self._lock:
-                if len(self._memory_cache) >= self.max_memory_items:
-                    self._evict_lru()
+            idx = self._shard_index(cache_key)
+            with self._locks[idx]:
+                shard = self._shards[idx]
+                shard[cache_key] = entry
+                shard.move_to_end(cache_key)
                 
-                self._memory_cache[cache_key] = entry
-                self._access_times[cache_key] = time.time()
+                if len(shard) > self._shard_capacity:
+                    self._evict_lru(shard)
             return True
         except Exception as e:
             logger.error(f"L1 set error: {e}")
@@ -133,30 +276,60 @@ class CacheManager:
     def _set_l3(self, cache_key: str, entry: Dict) -> bool:
         """Store in L3 SQLite cache"""
         try:
-            with sqlite3.connect(self._sqlite_db) as conn:
-                conn.execute("""
+            with self._conn_lock:
+                self._conn.execute("""
                     INSERT OR REPLACE INTO cache_entries 
                     (key, value, created_at, expires_at)
                     VALUES (?, ?, ?, ?)
                 """, (
                     cache_key,
-                    json.dumps(entry['value']),
+                    self._serialize(entry['value']),
                     entry['created_at'],
                     entry['expires_at']
                 ))
+                self._bloom_add(cache_key)
             return True
         except Exception as e:
             logger.error(f"L3 set error: {e}")
             return False
     
-    def _evict_lru(self):
-        """Evict least recently used item from L1"""
-        if not self._access_times:
-            return
-        
-        lru_key = min(self._access_times.items(), key=lambda x: x[1])[0]
-        self._memory_cache.pop(lru_key, None)
-        self._access_times.pop(lru_key, None)
+    def _serialize(self, value: Any) -> bytes:
+        """Encode a value for L3 storage (caller must hold _conn_lock)"""
+        payload = None
+        if MSGPACK_AVAILABLE:
+            try:
+                payload = MSGPACK_MARKER + msgpack.packb(value, use_bin_type=True)
+            except (TypeError, ValueError, OverflowError):
+                # Types msgpack cannot encode (e.g. datetime) fall back to JSON
+                payload = None
+        if payload is None:
+            if ORJSON_AVAILABLE:
+                payload = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+            else:
+                payload = json.dumps(value).encode('utf-8')
+        if self._compressor is not None:
+            payload = self._compressor.compress(payload)
+        return payload
+    
+    def _deserialize(self, payload: Union[bytes, str]) -> Any:
+        """Decode a value read from L3 (caller must hold _conn_lock)"""
+        if isinstance(payload, str):
+            # Legacy TEXT rows written before values were stored as blobs
+            return json.loads(payload)
+        if payload[:4] == ZSTD_MAGIC:
+            if self._decompressor is None:
+                raise ValueError("zstandard is required to read compressed cache entries")
+            payload = self._decompressor.decompress(payload)
+        if payload[:1] == MSGPACK_MARKER:
+            if not MSGPACK_AVAILABLE:
+                raise ValueError("msgpack is required to read msgpack cache entries")
+            return msgpack.unpackb(payload[1:], raw=False, strict_map_key=False, object_hook=_intern_keys)
+        return orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
+    
+    def _evict_lru(self, shard: OrderedDict):
+        """Evict least recently used item from an L1 shard (caller must hold its lock)"""
+        if shard:
+            shard.popitem(last=False)
     
     def _is_expired(self, entry: Dict) -> bool:
         """Check if cache entry is expired"""
@@ -164,23 +337,76 @@ class CacheManager:
             return False
         
         try:
-            expires_at = datetime.fromisoformat(entry['expires_at'])
-            return datetime.now() > expires_at
-        except:
+            return time.time() > entry['expires_at']
+        except TypeError:
             return True
     
     def clear(self):
         """Clear all cache levels"""
-        with self._lock:
-            self._memory_cache.clear()
-            self._access_times.clear()
+        for lock, shard in zip(self._locks, self._shards):
+            with lock:
+                shard.clear()
         
         try:
-            with sqlite3.connect(self._sqlite_db) as conn:
-                conn.execute("DELETE FROM cache_entries")
+            with self._conn_lock:
+                self._conn.execute("DELETE FROM cache_entries")
+                self._bloom = bytearray(BLOOM_BITS // 8)
         except Exception as e:
             logger.error(f"SQLite clear error: {e}")
     
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete every entry whose string key starts with prefix, returning the number of L3 rows removed"""
+        for lock, shard in zip(self._locks, self._shards):
+            with lock:
+                for cache_key in [k for k in shard if k.startswith(prefix)]:
+                    del shard[cache_key]
+        
+        pattern = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        try:
+            with self._conn_lock:
+                cursor = self._conn.execute(
+                    "DELETE FROM cache_entries WHERE key LIKE ? ESCAPE '\\'", (pattern,)
+                )
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"SQLite delete_prefix error: {e}")
+            return 0
+    
+    def purge_expired(self) -> int:
+        """Delete expired L3 rows, returning the number of rows removed"""
+        try:
+            with self._conn_lock:
+                cursor = self._conn.execute(
+                    "DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at < ?",
+                    (int(time.time()),)
+                )
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"SQLite purge error: {e}")
+            return 0
+    
+    def vacuum(self):
+        """Release free pages left by deleted rows back to the filesystem"""
+        try:
+            with self._conn_lock:
+                self._conn.execute("PRAGMA incremental_vacuum")
+        except Exception as e:
+            logger.error(f"SQLite vacuum error: {e}")
+    
+    def _janitor_loop(self, interval: int):
+        """Periodically purge expired entries until close() is called"""
+        while not self._stop_event.wait(interval):
+            if self.purge_expired():
+                self.vacuum()
+    
+    def close(self):
+        """Stop the janitor thread and close the persistent SQLite connection"""
+        self._stop_event.set()
+        if self._janitor is not None:
+            self._janitor.join()
+        with self._conn_lock:
+            self._conn.close()
+    
     def get_stats(self) -> Dict:
         """Get cache statistics"""
         total_requests = sum([self.stats['l1_hits'], self.stats['l3_hits'], self.stats['misses']])
@@ -193,7 +419,7 @@ class CacheManager:
             **self.stats,
             'total_requests': total_requests,
             'hit_rate': hit_rate,
-            'l1_size': len(self._memory_cache)
+            'l1_size': sum(len(shard) for shard in self._shards)
         }
 
 
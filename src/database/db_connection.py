@@ -2,23 +2,235 @@
 # src/database/db_connection.py
 
 import os
+import heapq
+import queue
+import functools
 import sqlite3
 import logging
+import threading
 from pathlib import Path
 from contextlib import contextmanager
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Iterator, Set
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Normalisation native de texte pour les requetes: NORMALIZE_SQL.format(col="source_term").
+# lower() de SQLite ne replie que l'ASCII et trim() ne retire que les espaces.
+NORMALIZE_SQL = "lower(trim({col}))"
+
+# Requetes preparees gardees par connexion (128 par defaut dans sqlite3)
+STATEMENT_CACHE_SIZE = 1024
+
+# Fonctions SQL pures: SQLite peut factoriser leurs appels (SQLite >= 3.8.3)
+_DETERMINISTIC = {'deterministic': True} if sqlite3.sqlite_version_info >= (3, 8, 3) else {}
+
+# Taille de page des bases (ignoree par SQLite une fois en mode WAL)
+PAGE_SIZE = 8192
+
+# Taille maximale projetee en memoire par connexion (lectures sans pread)
+MMAP_SIZE = 256 * 1024 * 1024
+
+# Reglages appliques une seule fois a chaque nouvelle connexion
+_INIT_SQL = """
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-64000;
+PRAGMA busy_timeout=5000;
+PRAGMA foreign_keys=ON;
+"""
+
+# Reglages supplementaires de la connexion en lecture-ecriture
+_WRITER_INIT_SQL = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA journal_size_limit=67108864;
+PRAGMA wal_autocheckpoint=2000;
+"""
+
+# Index inverse des mots des termes sources pour une similarite de Jaccard en SQL pur.
+# Les WITH sont interdits dans les triggers: ceux-ci notent seulement les entrees
+# modifiees, que ensure_tokens_table() (re)tokenise.
+_TOKENS_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS glossary_tokens (
+        token TEXT NOT NULL,
+        entry_id INTEGER NOT NULL,
+        PRIMARY KEY (token, entry_id)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS idx_glossary_tokens_entry ON glossary_tokens (entry_id)",
+    "CREATE TABLE IF NOT EXISTS glossary_tokens_pending (entry_id INTEGER PRIMARY KEY)",
+    """CREATE TRIGGER IF NOT EXISTS trg_glossary_tokens_insert AFTER INSERT ON glossary_entries
+    BEGIN
+        INSERT OR IGNORE INTO glossary_tokens_pending (entry_id) VALUES (NEW.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_glossary_tokens_update AFTER UPDATE OF source_term ON glossary_entries
+    BEGIN
+        INSERT OR IGNORE INTO glossary_tokens_pending (entry_id) VALUES (NEW.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_glossary_tokens_delete AFTER DELETE ON glossary_entries
+    BEGIN
+        INSERT OR IGNORE INTO glossary_tokens_pending (entry_id) VALUES (OLD.id);
+    END""",
+    """CREATE VIEW IF NOT EXISTS glossary_jaccard AS
+    SELECT pairs.entry_a, pairs.entry_b,
+           CAST(pairs.shared AS REAL) / (sa.n + sb.n - pairs.shared) AS similarity
+    FROM (
+        SELECT a.entry_id AS entry_a, b.entry_id AS entry_b, COUNT(*) AS shared
+        FROM glossary_tokens a
+        JOIN glossary_tokens b ON a.token = b.token
+        GROUP BY a.entry_id, b.entry_id
+    ) pairs
+    JOIN (SELECT entry_id, COUNT(*) AS n FROM glossary_tokens GROUP BY entry_id) sa
+      ON sa.entry_id = pairs.entry_a
+    JOIN (SELECT entry_id, COUNT(*) AS n FROM glossary_tokens GROUP BY entry_id) sb
+      ON sb.entry_id = pairs.entry_b""",
+)
+
+@functools.lru_cache(maxsize=4096)
+def _token_set(text: str) -> frozenset:
+    """Ensemble des mots (en minuscules) d'un texte, memorise pour les textes repetes"""
+    return frozenset(text.lower().split())
+
+
+def calculate_similarity(text1: str, text2: str) -> float:
+    """Fonction SQL personnalisee: similarite de Jaccard entre les mots de deux textes"""
+    if not text1 or not text2:
+        return 0.0
+    
+    set1 = _token_set(text1)
+    set2 = _token_set(text2)
+    
+    if not set1 or not set2:
+        return 1.0 if not set1 and not set2 else 0.0
+    
+    # |A u B| = |A| + |B| - |A n B| evite de construire l'union
+    intersection = len(set1 & set2)
+    return intersection / (len(set1) + len(set2) - intersection)
+
+
+class _ConnectionPool:
+    """Pool borne de connexions SQLite reutilisables (LIFO: la plus recente reste chaude)"""
+    
+    def __init__(self, factory, size: int):
+        """
+        Args:
+            factory: Fonction sans argument qui ouvre une connexion configuree
+            size: Nombre maximum de connexions ouvertes
+        """
+        self._factory = factory
+        self.size = size
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self.created = 0
+    
+    def acquire(self) -> sqlite3.Connection:
+        """Prend une connexion inactive, ou en cree une si le pool n'est pas plein"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            if self.created < self.size:
+                conn = self._factory()
+                self.created += 1
+                return conn
+        
+        # Pool plein: attendre qu'une connexion soit rendue
+        try:
+            return self._idle.get(timeout=30.0)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Aucune connexion disponible dans le pool")
+    
+    def release(self, conn: sqlite3.Connection):
+        """Rend une connexion saine au pool"""
+        self._idle.put_nowait(conn)
+    
+    def discard(self, conn: sqlite3.Connection):
+        """Ferme une connexion inutilisable et libere sa place dans le pool"""
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning("Erreur fermeture connexion: %s", e)
+        with self._lock:
+            self.created -= 1
+    
+    def close_all(self):
+        """Ferme toutes les connexions inactives apres avoir mis a jour les statistiques du planificateur"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.debug("PRAGMA optimize ignore: %s", e)
+            self.discard(conn)
+
+
+class _PooledConn:
+    """Context manager d'emprunt d'une connexion a un pool (sans generateur)"""
+    
+    __slots__ = ('_owner', '_pool', '_conn', '_connection_id')
+    
+    def __init__(self, owner: "DatabaseConnection", pool: _ConnectionPool, connection_id: str):
+        self._owner = owner
+        self._pool = pool
+        self._conn = None
+        self._connection_id = connection_id
+    
+    def __enter__(self) -> sqlite3.Connection:
+        self._conn = self._pool.acquire()
+        self._owner._active_connections[self._connection_id] = self._conn
+        logger.debug("Connexion DB obtenue: %s", self._connection_id)
+        return self._conn
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        conn, connection_id = self._conn, self._connection_id
+        self._conn = None
+        
+        if exc_type is not None and issubclass(exc_type, sqlite3.Error):
+            logger.error("Erreur connexion DB %s: %s", connection_id, exc_val)
+        
+        self._owner._active_connections.pop(connection_id, None)
+        healthy = True
+        try:
+            # Les modifications non validees ne survivent pas au retour dans le pool
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error as e:
+            logger.warning("Erreur rollback connexion %s: %s", connection_id, e)
+            healthy = False
+        
+        if healthy:
+            self._pool.release(conn)
+            logger.debug("Connexion DB rendue au pool: %s", connection_id)
+        else:
+            self._pool.discard(conn)
+        return False
+
+
 class DatabaseConnection:
     """Gestionnaire de connexions de base de donnees centralise pour WikiTranslateAI"""
     
-    def __init__(self, db_path: Optional[str] = None):
+    # Repertoires parents deja crees par ce processus
+    _mkdir_cache: Set[Path] = set()
+    
+    def __init__(self, db_path: Optional[str] = None, pool_size: Optional[int] = None,
+                 checkpoint_interval: float = 30.0, mmap_size: int = MMAP_SIZE):
         """
         Initialise le gestionnaire de connexion DB
         
         Args:
             db_path: Chemin vers la base de donnees SQLite
+            pool_size: Nombre maximum de connexions en lecture (defaut: nombre de CPU)
+            checkpoint_interval: Secondes entre deux checkpoints WAL en arriere-plan (<= 0 pour desactiver)
+            mmap_size: Octets de la base lus via mmap (0 pour desactiver, ex. systeme de fichiers reseau)
         """
         if db_path is None:
             # Utiliser le chemin par defaut depuis les variables d'environnement
@@ -29,61 +241,156 @@ class DatabaseConnection:
         self.db_path = Path(db_path)
         self.connection_params = {}
         self._active_connections = {}
+        self.mmap_size = int(mmap_size)
+        
+        # WAL: plusieurs lecteurs concurrents et un seul ecrivain
+        self.pool_size = pool_size or os.cpu_count() or 4
+        self._reader_pool = _ConnectionPool(self._make_reader, self.pool_size)
+        self._writer_pool = _ConnectionPool(self._make_writer, 1)
         
         # Creer les repertoires parents si necessaire
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        parent = self.db_path.parent
+        if parent not in DatabaseConnection._mkdir_cache:
+            parent.mkdir(parents=True, exist_ok=True)
+            DatabaseConnection._mkdir_cache.add(parent)
+        
+        # Checkpoints WAL periodiques pour eviter les pics de latence a l'autocheckpoint
+        self._stop_event = threading.Event()
+        self._checkpoint_thread = None
+        if checkpoint_interval > 0:
+            self._checkpoint_thread = threading.Thread(
+                target=self._checkpoint_loop, args=(checkpoint_interval,),
+                name="db-wal-checkpoint", daemon=True
+            )
+            self._checkpoint_thread.start()
+        
+        logger.info("Gestionnaire DB initialise: %s", self.db_path)
+    
+    def _make_writer(self) -> sqlite3.Connection:
+        """
+        Ouvre et configure la connexion en lecture-ecriture
+        
+        Returns:
+            sqlite3.Connection: Connexion initialisee
+        """
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=30.0,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            isolation_level=None  # autocommit: transactions explicites via transaction()
+        )
+        
+        # page_size doit etre fixe avant le passage en WAL
+        if conn.execute("PRAGMA page_size").fetchone()[0] != PAGE_SIZE:
+            self._apply_page_size(conn)
         
-        logger.info(f"Gestionnaire DB initialise: {self.db_path}")
+        # Mode Write-Ahead Logging, synchronisation equilibree performance/securite
+        conn.executescript(_WRITER_INIT_SQL)
+        self._configure(conn)
+        return conn
+    
+    def _apply_page_size(self, conn: sqlite3.Connection):
+        """Reecrit la base avec PAGE_SIZE (une seule fois: la taille est persistee dans le fichier)"""
+        try:
+            conn.execute("PRAGMA journal_mode=DELETE")
+            conn.execute(f"PRAGMA page_size={PAGE_SIZE}")
+            conn.execute("VACUUM")
+            logger.info("Taille de page %s appliquee: %s", PAGE_SIZE, self.db_path)
+        except sqlite3.OperationalError as e:
+            # Base utilisee par une autre connexion: reessaye a la prochaine ouverture
+            logger.warning("Changement de page_size reporte: %s", e)
+    
+    def _make_reader(self) -> sqlite3.Connection:
+        """
+        Ouvre et configure une connexion en lecture seule
+        
+        Returns:
+            sqlite3.Connection: Connexion initialisee
+        """
+        if not self.db_path.exists():
+            # mode=ro ne cree pas le fichier: passer une fois par l'ecrivain
+            with self.get_connection("init"):
+                pass
+        
+        conn = sqlite3.connect(
+            f"{self.db_path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            timeout=30.0,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            isolation_level=None
+        )
+        self._configure(conn)
+        return conn
+    
+    def _configure(self, conn: sqlite3.Connection):
+        """Applique les reglages communs aux lecteurs et a l'ecrivain"""
+        conn.executescript(_INIT_SQL)
+        conn.execute(f"PRAGMA mmap_size={self.mmap_size}")
+        # Acces par nom de colonne; l'acces par indice reste possible
+        conn.row_factory = sqlite3.Row
+        
+        # Fonctions SQL personnalisees pour WikiTranslateAI
+        conn.create_function("calculate_similarity", 2, calculate_similarity, **_DETERMINISTIC)
+    
+    def get_connection(self, connection_id: str = "default", readonly: bool = False) -> "_PooledConn":
+        """
+        Context manager pour obtenir une connexion DB du pool
+        
+        Args:
+            connection_id: Identifiant unique pour la connexion
+            readonly: Prendre une connexion en lecture seule
+        
+        Returns:
+            _PooledConn: Context manager donnant une sqlite3.Connection
+        """
+        return _PooledConn(self, self._reader_pool if readonly else self._writer_pool, connection_id)
     
     @contextmanager
-    def get_connection(self, connection_id: str = "default"):
+    def transaction(self, connection_id: str = "default"):
         """
-        Context manager pour obtenir une connexion DB
+        Context manager ouvrant une transaction d'ecriture explicite
         
         Args:
             connection_id: Identifiant unique pour la connexion
         
         Yields:
-            sqlite3.Connection: Connexion a la base de donnees
+            sqlite3.Connection: Connexion en lecture-ecriture, validee a la sortie du bloc
         """
-        conn = None
-        try:
-            conn = sqlite3.connect(
-                str(self.db_path),
-                timeout=30.0,
-                check_same_thread=False
-            )
-            
-            # Configuration optimisee pour SQLite
-            conn.execute("PRAGMA journal_mode=WAL")  # Mode Write-Ahead Logging
-            conn.execute("PRAGMA synchronous=NORMAL")  # Balance performance/securite
-            conn.execute("PRAGMA temp_store=MEMORY")  # Tables temporaires en memoire
-            conn.execute("PRAGMA cache_size=10000")  # Cache plus large
-            conn.execute("PRAGMA foreign_keys=ON")  # Activer contraintes FK
-            
-            # Fonctions SQL personnalisees pour WikiTranslateAI
-            conn.create_function("normalize_text", 1, self._normalize_text)
-            conn.create_function("calculate_similarity", 2, self._calculate_similarity)
-            
-            self._active_connections[connection_id] = conn
-            logger.debug(f"Connexion DB ouverte: {connection_id}")
-            
-            yield conn
-            
-        except sqlite3.Error as e:
-            logger.error(f"Erreur connexion DB {connection_id}: {e}")
-            if conn:
-                conn.rollback()
-            raise
-        finally:
-            if conn:
-                try:
-                    conn.close()
-                    if connection_id in self._active_connections:
-                        del self._active_connections[connection_id]
-                    logger.debug(f"Connexion DB fermee: {connection_id}")
-                except sqlite3.Error as e:
-                    logger.warning(f"Erreur fermeture connexion {connection_id}: {e}")
+        with self.get_connection(connection_id) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+    
+    def close_all(self):
+        """Ferme toutes les connexions inactives des pools"""
+        self._reader_pool.close_all()
+        self._writer_pool.close_all()
+    
+    def _checkpoint_loop(self, interval: float):
+        """Execute un checkpoint WAL passif a intervalle regulier jusqu'a close()"""
+        while not self._stop_event.wait(interval):
+            # Ne pas creer la base si elle n'existe pas encore
+            if self._writer_pool.created == 0 and not self.db_path.exists():
+                continue
+            try:
+                with self.get_connection("wal_checkpoint") as conn:
+                    conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            except sqlite3.Error as e:
+                logger.warning("Echec checkpoint WAL: %s", e)
+    
+    def close(self):
+        """Arrete le thread de checkpoint et ferme les connexions inactives"""
+        self._stop_event.set()
+        if self._checkpoint_thread is not None:
+            self._checkpoint_thread.join()
+            self._checkpoint_thread = None
+        self.close_all()
     
     def execute_query(self, query: str, params: tuple = (), connection_id: str = "default") -> list:
         """
@@ -97,11 +404,9 @@ class DatabaseConnection:
         Returns:
             List des resultats
         """
-        with self.get_connection(connection_id) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            results = cursor.fetchall()
-            logger.debug(f"Requete executee: {len(results)} resultats")
+        with self.get_connection(connection_id, readonly=True) as conn:
+            results = conn.execute(query, params).fetchall()
+            logger.debug("Requete executee: %d resultats", len(results))
             return results
     
     def execute_update(self, query: str, params: tuple = (), connection_id: str = "default") -> int:
@@ -116,14 +421,130 @@ class DatabaseConnection:
         Returns:
             Nombre de lignes affectees
         """
+        # Connexion en autocommit: une instruction seule est sa propre transaction
         with self.get_connection(connection_id) as conn:
+            affected_rows = conn.execute(query, params).rowcount
+            logger.debug("Requete UPDATE executee: %d lignes affectees", affected_rows)
+            return affected_rows
+    
+    def iter_query(self, query: str, params: tuple = (), batch: int = 1000,
+                   connection_id: str = "default") -> Iterator:
+        """
+        Execute une requete SELECT et produit les resultats par lots, sans tout charger en memoire
+        
+        Args:
+            query: Requete SQL SELECT
+            params: Parametres de la requete
+            batch: Nombre de lignes lues a chaque fetchmany
+            connection_id: ID de connexion
+        
+        Yields:
+            Lignes du resultat
+        """
+        with self.get_connection(connection_id, readonly=True) as conn:
             cursor = conn.cursor()
+            cursor.arraysize = batch
             cursor.execute(query, params)
-            conn.commit()
-            affected_rows = cursor.rowcount
-            logger.debug(f"Requete UPDATE executee: {affected_rows} lignes affectees")
+            while rows := cursor.fetchmany():
+                yield from rows
+    
+    def execute_many(self, query: str, rows: Iterable, connection_id: str = "default") -> int:
+        """
+        Execute une requete INSERT/UPDATE/DELETE pour chaque jeu de parametres, en une transaction
+        
+        Args:
+            query: Requete SQL de modification
+            rows: Sequence (ou generateur) de parametres
+            connection_id: ID de connexion
+        
+        Returns:
+            Nombre de lignes affectees
+        """
+        with self.transaction(connection_id) as conn:
+            affected_rows = conn.executemany(query, rows).rowcount
+            logger.debug("Requete executemany executee: %d lignes affectees", affected_rows)
             return affected_rows
     
+    def rank_by_similarity(self, query_text: str, candidate_query: str, top_k: int = 10,
+                           params: tuple = ()) -> list:
+        """
+        Classe des lignes candidates par similarite de Jaccard avec un texte, hors du moteur SQL
+        
+        Args:
+            query_text: Texte de reference
+            candidate_query: Requete SELECT dont la deuxieme colonne contient le texte a comparer
+            top_k: Nombre de resultats a retourner
+            params: Parametres de la requete candidate
+        
+        Returns:
+            Liste de tuples (ligne, score) par score decroissant
+        """
+        rows = self.execute_query(candidate_query, params)
+        if not rows or top_k <= 0:
+            return []
+        
+        # Une seule passe Python: taille de chaque ensemble de mots et intersection avec la requete
+        query_tokens = set((query_text or '').lower().split())
+        token_sets = [set((row[1] or '').lower().split()) for row in rows]
+        
+        if NUMPY_AVAILABLE:
+            count = len(token_sets)
+            sizes = np.fromiter((len(tokens) for tokens in token_sets), dtype=np.int64, count=count)
+            inter = np.fromiter((len(tokens & query_tokens) for tokens in token_sets), dtype=np.int64, count=count)
+            union = sizes + len(query_tokens) - inter
+            scores = inter / np.maximum(union, 1)
+            
+            k = min(top_k, count)
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best], kind='stable')]
+            return [(rows[i], float(scores[i])) for i in best]
+        
+        scored = []
+        for row, tokens in zip(rows, token_sets):
+            inter = len(tokens & query_tokens)
+            union = len(tokens) + len(query_tokens) - inter
+            scored.append((row, inter / union if union else 0.0))
+        return heapq.nlargest(top_k, scored, key=lambda item: item[1])
+    
+    def ensure_tokens_table(self) -> int:
+        """
+        Cree l'index des mots de glossary_entries et le met a jour
+        
+        La vue glossary_jaccard (entry_a, entry_b, similarity) donne ensuite la
+        similarite de Jaccard entre termes sources sans appel Python par ligne.
+        
+        Returns:
+            Nombre d'entrees (re)tokenisees
+        """
+        with self.transaction("tokens") as conn:
+            created = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'glossary_tokens'"
+            ).fetchone() is None
+            for statement in _TOKENS_SCHEMA:
+                conn.execute(statement)
+            if created:
+                conn.execute("INSERT OR IGNORE INTO glossary_tokens_pending (entry_id) SELECT id FROM glossary_entries")
+            
+            pending = conn.execute("""
+                SELECT p.entry_id, ge.source_term
+                FROM glossary_tokens_pending p
+                LEFT JOIN glossary_entries ge ON ge.id = p.entry_id
+            """).fetchall()
+            if not pending:
+                return 0
+            
+            # Memes mots que calculate_similarity: minuscules, separes par les blancs
+            conn.execute("DELETE FROM glossary_tokens WHERE entry_id IN (SELECT entry_id FROM glossary_tokens_pending)")
+            conn.executemany(
+                "INSERT OR IGNORE INTO glossary_tokens (token, entry_id) VALUES (?, ?)",
+                ((token, entry_id) for entry_id, term in pending if term
+                 for token in set(term.lower().split()))
+            )
+            conn.execute("DELETE FROM glossary_tokens_pending")
+        
+        logger.debug("Index des mots mis a jour: %d entrees", len(pending))
+        return len(pending)
+    
     def check_database_health(self) -> Dict[str, Any]:
         """
         Verifie l'etat de sante de la base de donnees
@@ -132,7 +553,7 @@ class DatabaseConnection:
             Dict avec les metriques de sante
         """
         health_info = {
-            'db_exists': self.db_path.exists(),
+            'db_exists': False,
             'db_size_mb': 0,
             'connection_test': False,
             'tables_count': 0,
@@ -140,50 +561,32 @@ class DatabaseConnection:
         }
         
         try:
-            if health_info['db_exists']:
-                health_info['db_size_mb'] = round(self.db_path.stat().st_size / (1024 * 1024), 2)
+            # Un seul stat(2) pour l'existence et la taille
+            try:
+                st = os.stat(self.db_path)
+                health_info['db_exists'] = True
+                health_info['db_size_mb'] = round(st.st_size / (1024 * 1024), 2)
+            except FileNotFoundError:
+                pass
             
             with self.get_connection("health_check") as conn:
                 health_info['connection_test'] = True
                 
                 # Compter les tables
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table'")
-                health_info['tables_count'] = cursor.fetchone()[0]
+                health_info['tables_count'] = conn.execute(
+                    "SELECT COUNT(*) FROM sqlite_master WHERE type='table'"
+                ).fetchone()[0]
                 
         except Exception as e:
             health_info['last_error'] = str(e)
-            logger.error(f"Echec check sante DB: {e}")
+            logger.error("Echec check sante DB: %s", e)
         
         return health_info
-    
-    def _normalize_text(self, text: str) -> str:
-        """Fonction SQL personnalisee pour normaliser le texte"""
-        if not text:
-            return ""
-        return text.lower().strip()
-    
-    def _calculate_similarity(self, text1: str, text2: str) -> float:
-        """Fonction SQL personnalisee pour calculer la similarite"""
-        if not text1 or not text2:
-            return 0.0
-        
-        set1 = set(text1.lower().split())
-        set2 = set(text2.lower().split())
-        
-        if not set1 and not set2:
-            return 1.0
-        if not set1 or not set2:
-            return 0.0
-        
-        intersection = len(set1.intersection(set2))
-        union = len(set1.union(set2))
-        
-        return intersection / union if union > 0 else 0.0
 
 
 # Instance globale pour utilisation dans tout le projet
 _global_db_connection = None
+_global_db_connection_lock = threading.Lock()
 
 def get_database_connection(db_path: Optional[str] = None) -> DatabaseConnection:
     """
@@ -197,8 +600,11 @@ def get_database_connection(db_path: Optional[str] = None) -> DatabaseConnection
     """
     global _global_db_connection
     
+    # Verrouillage double: aucun verrou une fois l'instance creee
     if _global_db_connection is None:
-        _global_db_connection = DatabaseConnection(db_path)
+        with _global_db_connection_lock:
+            if _global_db_connection is None:
+                _global_db_connection = DatabaseConnection(db_path)
     
     return _global_db_connection
 
@@ -1,13 +1,175 @@
 # src/database/glossary_learner.py
+import csv
+import functools
 import logging
 import json
+import multiprocessing
 import re
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 from difflib import SequenceMatcher
 from src.database.glossary_manager import GlossaryManager
 import itertools
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from rapidfuzz.distance import Indel
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Nombre de termes écrits par lot lors de l'import d'un glossaire
+IMPORT_BATCH_SIZE = 1000
+
+# Nombre de textes dont les n-grammes sont gardés en mémoire
+NGRAM_CACHE_SIZE = 8192
+
+# Expressions régulières de tokenisation, compilées une seule fois
+_TOKEN_RE = re.compile(r'\b\w+\b')
+_PUNCT_RE = re.compile(r'[^\w\s\u00E0-\u00FF\u0300-\u036F]')
+# Équivalent de _PUNCT_RE pour un texte ASCII : tout caractère hors \w et \s devient un espace
+_ASCII_PUNCT_TABLE = str.maketrans({
+    chr(c): ' ' for c in range(128)
+    if not (chr(c).isalnum() or chr(c) == '_' or chr(c).isspace())
+})
+
+def string_similarity(text1, text2, score_cutoff=0.0):
+    """
+    Similarité entre deux chaînes, entre 0 et 1
+    
+    Utilise la distance Indel de rapidfuzz si disponible, sinon SequenceMatcher
+    (même formule 2 * correspondances / longueur totale).
+    
+    Args:
+        text1: Première chaîne
+        text2: Seconde chaîne
+        score_cutoff: Similarité minimale utile ; en dessous, le calcul est
+            abandonné dès que possible et 0 est retourné
+        
+    Returns:
+        Similarité, ou 0 si elle est inférieure à score_cutoff
+    """
+    if RAPIDFUZZ_AVAILABLE:
+        return Indel.normalized_similarity(text1, text2, score_cutoff=score_cutoff)
+    
+    matcher = SequenceMatcher(None, text1, text2, autojunk=False)
+    # Bornes supérieures de plus en plus fines avant le calcul complet
+    if score_cutoff > 0 and (matcher.real_quick_ratio() < score_cutoff or
+                             matcher.quick_ratio() < score_cutoff):
+        return 0.0
+    similarity = matcher.ratio()
+    return similarity if similarity >= score_cutoff else 0.0
+
+def tokenize_text(text):
+    """Tokenisation avec gestion des caractères spéciaux des langues ciblées"""
+    text = text.lower()
+    # Remplacer la ponctuation par des espaces
+    if text.isascii():
+        # Cas le plus courant : simple table de traduction
+        return text.translate(_ASCII_PUNCT_TABLE).split()
+    # Préserver certains caractères spéciaux importants pour les langues ciblées
+    return _PUNCT_RE.sub(' ', text).split()
+
+def generate_ngrams(tokens, max_n=3):
+    """Génère des n-grammes à partir d'une liste de tokens"""
+    # Les unigrammes sont les tokens eux-mêmes ; les n-grammes sont internés pour
+    # partager une seule chaîne par n-gramme répété dans les clés des paires
+    ngrams = list(map(sys.intern, tokens))
+    
+    for n in range(2, min(max_n, len(tokens)) + 1):
+        ngrams.extend(map(sys.intern, map(' '.join, zip(*(tokens[i:] for i in range(n))))))
+    
+    return ngrams
+
+@functools.lru_cache(maxsize=NGRAM_CACHE_SIZE)
+def _cached_ngrams(text, max_n=3):
+    """N-grammes d'un texte, partagés entre les segments identiques d'un corpus"""
+    return tuple(generate_ngrams(tokenize_text(text), max_n))
+
+def _extract_batch_translations(learner_class, segments, min_confidence):
+    """
+    Extrait les paires candidates d'un lot dans un processus de travail
+    
+    Seuls la classe (par référence), le lot et le seuil sont transmis au
+    processus, et non l'instance du learner.
+    """
+    return learner_class._extract_potential_translations(segments, min_confidence)
+
+class PairStatistics:
+    """
+    Statistiques des paires candidates d'un lot, stockées par colonnes
+    
+    Les colonnes sont des tableaux compacts alignés sur la liste des paires ;
+    l'accès par paire reconstruit le dictionnaire de statistiques.
+    """
+    
+    __slots__ = ('pairs', 'counts', 'source_occurrences', 'target_occurrences', 'similarities',
+                 'source_stopwords', 'target_stopwords', '_index')
+    
+    def __init__(self):
+        self.pairs = []
+        self.counts = array('q')
+        self.source_occurrences = array('q')
+        self.target_occurrences = array('q')
+        self.similarities = array('d')
+        # N-grammes trop fréquents dans le lot (mots vides)
+        self.source_stopwords = frozenset()
+        self.target_stopwords = frozenset()
+        self._index = None
+    
+    def append(self, pair, count, source_occurrences, target_occurrences, similarity):
+        """Ajoute une paire (terme_source, terme_cible) et ses statistiques"""
+        self.pairs.append(pair)
+        self.counts.append(count)
+        self.source_occurrences.append(source_occurrences)
+        self.target_occurrences.append(target_occurrences)
+        self.similarities.append(similarity)
+        self._index = None
+    
+    def __len__(self):
+        return len(self.pairs)
+    
+    def __iter__(self):
+        return iter(self.pairs)
+    
+    def __contains__(self, pair):
+        return pair in self._pair_index()
+    
+    def __getitem__(self, pair):
+        i = self._pair_index()[pair]
+        return {
+            'count': self.counts[i],
+            'source_occurrences': self.source_occurrences[i],
+            'target_occurrences': self.target_occurrences[i],
+            'similarity': self.similarities[i]
+        }
+    
+    def items(self):
+        """Itère sur les couples (paire, statistiques)"""
+        return ((pair, self[pair]) for pair in self.pairs)
+    
+    def _pair_index(self):
+        """Index {paire: position}, construit à la première recherche"""
+        if self._index is None:
+            self._index = {pair: i for i, pair in enumerate(self.pairs)}
+        return self._index
+
 class GlossaryLearner:
     """Enrichit le glossaire en apprenant de nouvelles traductions"""
     
@@ -18,32 +180,35 @@ class GlossaryLearner:
     def import_external_glossary(self, file_path, source_lang, target_lang, confidence=0.8, validated=True):
         """Importe un glossaire externe depuis un fichier"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                # Déterminer le format du fichier
-                if file_path.endswith('.json'):
-                    data = json.load(f)
-                    return self._process_json_glossary(data, source_lang, target_lang, confidence, validated)
-                elif file_path.endswith('.csv'):
-                    import csv
-                    glossary_data = []
-                    with open(file_path, 'r', encoding='utf-8') as csvfile:
-                        reader = csv.DictReader(csvfile)
-                        for row in reader:
-                            if 'source' in row and 'target' in row:
-                                glossary_data.append({
-                                    'source_term': row['source'],
-                                    'target_term': row['target'],
-                                    'domain': row.get('domain', 'general'),
-                                    'context': row.get('context', '')
-                                })
-                    return self._process_custom_glossary(glossary_data, source_lang, target_lang, confidence, validated)
-                else:
-                    logger.warning(f"Format de fichier non pris en charge: {file_path}")
-                    return 0
+            # Déterminer le format du fichier
+            if file_path.endswith('.json'):
+                with open(file_path, 'rb') as f:
+                    raw = f.read()
+                data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+                return self._process_json_glossary(data, source_lang, target_lang, confidence, validated)
+            elif file_path.endswith('.csv'):
+                glossary_data = self._iter_csv_glossary(file_path)
+                return self._process_custom_glossary(glossary_data, source_lang, target_lang, confidence, validated)
+            else:
+                logger.warning(f"Format de fichier non pris en charge: {file_path}")
+                return 0
         except Exception as e:
             logger.error(f"Erreur lors de l'import du glossaire: {e}")
             return 0
     
+    @staticmethod
+    def _iter_csv_glossary(file_path):
+        """Lit un glossaire CSV (colonnes source, target, domain, context) ligne par ligne"""
+        with open(file_path, 'r', encoding='utf-8', newline='') as csvfile:
+            for row in csv.DictReader(csvfile):
+                if 'source' in row and 'target' in row:
+                    yield {
+                        'source_term': row['source'],
+                        'target_term': row['target'],
+                        'domain': row.get('domain', 'general'),
+                        'context': row.get('context', '')
+                    }
+    
     def _process_json_glossary(self, data, source_lang, target_lang, confidence, validated):
         """Traite un glossaire au format JSON"""
         if isinstance(data, list):
@@ -71,39 +236,32 @@ class GlossaryLearner:
         """Traite un glossaire au format personnalisé"""
         count = 0
         with GlossaryManager(self.db_path) as gm:
+            terms = []
             for entry in glossary_data:
-                try:
-                    source_term = entry.get('source_term')
-                    target_term = entry.get('target_term')
-                    domain = entry.get('domain', 'general')
-                    context = entry.get('context', None)
-                    
-                    if source_term and target_term:
-                        gm.add_term(
-                            source_term=source_term,
-                            source_lang=source_lang,
-                            target_term=target_term,
-                            target_lang=target_lang,
-                            domain=domain,
-                            context=context,
-                            confidence=entry.get('confidence', confidence),
-                            validated=entry.get('validated', validated)
-                        )
-                        count += 1
-                except Exception as e:
-                    logger.warning(f"Erreur lors de l'ajout du terme {entry.get('source_term')}: {e}")
-                    continue
+                source_term = entry.get('source_term')
+                target_term = entry.get('target_term')
+                
+                if source_term and target_term:
+                    terms.append((
+                        source_term, source_lang, target_term, target_lang,
+                        entry.get('domain', 'general'), entry.get('context', None),
+                        entry.get('confidence', confidence), entry.get('validated', validated)
+                    ))
+                
+                # Écrire par lots pour borner la mémoire sur les gros glossaires
+                if len(terms) >= IMPORT_BATCH_SIZE:
+                    count += gm.add_terms_bulk(terms)
+                    terms = []
+            
+            if terms:
+                count += gm.add_terms_bulk(terms)
         
         return count
     
     def learn_from_translations(self, source_text, target_text, source_lang, target_lang, min_length=3, min_similarity=0.7):
         """Apprend de nouvelles traductions à partir de traductions existantes"""
-        # Tokeniser simplement par espaces et ponctuations
-        def tokenize(text):
-            return re.findall(r'\b\w+\b', text.lower())
-        
-        source_tokens = tokenize(source_text)
-        target_tokens = tokenize(target_text)
+        source_tokens = self._word_tokenize(source_text)
+        target_tokens = self._word_tokenize(target_text)
         
         # Pour les phrases courtes, essayer d'apprendre des mots individuels
         if len(source_tokens) <= 10 and len(target_tokens) <= 15:
@@ -113,6 +271,12 @@ class GlossaryLearner:
                 
                 # Chercher des mots similaires (mêmes positions relatives)
                 with GlossaryManager(self.db_path) as gm:
+                    # Termes existants récupérés en une seule recherche
+                    candidates = [token for token in source_tokens if len(token) >= min_length]
+                    existing_map = gm.search_terms_bulk(candidates, source_lang, target_lang)
+                    # Termes écrits depuis leur dernière lecture : à relire depuis la base
+                    stale = set()
+                    
                     for i, s_token in enumerate(source_tokens):
                         if len(s_token) >= min_length:
                             # Déterminer les positions possibles dans la cible
@@ -120,7 +284,10 @@ class GlossaryLearner:
                             end_pos = min(len(target_tokens), int((i+1) * len(target_tokens) / len(source_tokens)) + 1)
                             
                             # Chercher le terme existant pour confirmer
-                            existing_terms = gm.search_term(s_token, source_lang, target_lang)
+                            if s_token in stale:
+                                existing_map[s_token] = gm.search_term(s_token, source_lang, target_lang)
+                                stale.discard(s_token)
+                            existing_terms = existing_map.get(s_token, [])
                             
                             if existing_terms:
                                 # Terme déjà connu, confirmer ou améliorer la confiance
@@ -136,6 +303,7 @@ class GlossaryLearner:
                                                         confidence=min(0.95, term['confidence_score'] + 0.05),
                                                         validated=term['validated']
                                                     )
+                                                    stale.add(s_token)
                                                     learned_terms.append((s_token, term['target_term'], "confirmé"))
                             else:
                                 # Nouveau terme potentiel
@@ -148,12 +316,18 @@ class GlossaryLearner:
                                             confidence=0.5,
                                             validated=False
                                         )
+                                        stale.add(s_token)
                                         learned_terms.append((s_token, target_tokens[j], "nouveau"))
                 
                 return learned_terms
         
         return []
     
+    @staticmethod
+    def _word_tokenize(text):
+        """Tokenise simplement par espaces et ponctuations"""
+        return _TOKEN_RE.findall(text.lower())
+    
     def extract_terms_from_article(self, article_data, source_lang, target_lang):
         """Extrait des termes d'un article traduit"""
         learned_terms = []
@@ -170,16 +344,26 @@ class GlossaryLearner:
                     learned_terms.extend(terms)
         
         return learned_terms
-    
-# Amélioration de src/database/glossary_learner.py
 
 
-class EnhancedGlossaryLearner:
-    """Version améliorée pour l'enrichissement du glossaire"""
+class EnhancedGlossaryLearner(GlossaryLearner):
+    """Version améliorée du GlossaryLearner avec des fonctionnalités supplémentaires"""
+    
+    # Poids de la similarité des chaînes dans le score de confiance
+    SIMILARITY_WEIGHT = 0.3
+    # Rapport de longueur (cible / source) admis pour une paire candidate
+    LENGTH_RATIO_RANGE = (0.5, 2.0)
+    # Filtrage par fréquence documentaire, appliqué aux lots d'au moins
+    # DF_FILTER_MIN_SEGMENTS segments : un n-gramme doit apparaître dans au moins
+    # MIN_DOCUMENT_FREQUENCY segments et au plus MAX_DOCUMENT_FREQUENCY du lot
+    DF_FILTER_MIN_SEGMENTS = 20
+    MIN_DOCUMENT_FREQUENCY = 2
+    MAX_DOCUMENT_FREQUENCY = 0.3
     
     def __init__(self, db_path):
-        """Initialise le GlossaryLearner avec le chemin vers la BDD"""
-        self.db_path = db_path
+        """Initialise le learner ; les mots vides détectés sont mémorisés par paire de langues"""
+        super().__init__(db_path)
+        self._stopword_cache = {}
     
     def learn_from_aligned_corpus(self, corpus_path, source_lang, target_lang, min_confidence=0.6):
         """
@@ -194,32 +378,11 @@ class EnhancedGlossaryLearner:
         Returns:
             Nombre de termes appris
         """
-        import csv
-        
         terms_added = 0
         try:
-            with open(corpus_path, 'r', encoding='utf-8') as f:
-                reader = csv.reader(f, delimiter='\t')
-                # Ignorer l'en-tête
-                next(reader, None)
-                
-                # Traitement par lots
-                batch_size = 100
-                segments = []
-                
-                for row in reader:
-                    if len(row) == 2:
-                        segments.append((row[0], row[1]))
-                    
-                    if len(segments) >= batch_size:
-                        terms = self._process_segment_batch(segments, source_lang, target_lang, min_confidence)
-                        terms_added += len(terms)
-                        segments = []
-                
-                # Traiter le dernier lot
-                if segments:
-                    terms = self._process_segment_batch(segments, source_lang, target_lang, min_confidence)
-                    terms_added += len(terms)
+            for segments in self._iter_segment_batches(corpus_path):
+                terms = self._process_segment_batch(segments, source_lang, target_lang, min_confidence)
+                terms_added += len(terms)
             
             return terms_added
             
@@ -227,349 +390,349 @@ class EnhancedGlossaryLearner:
             logger.error(f"Erreur lors de l'apprentissage depuis le corpus: {e}")
             return 0
     
-    def _process_segment_batch(self, segments, source_lang, target_lang, min_confidence):
+    def learn_from_aligned_corpora(self, corpus_paths, source_lang, target_lang, min_confidence=0.6, workers=1):
         """
-        Traite un lot de segments pour en extraire des termes
+        Apprend des termes à partir de plusieurs corpus alignés en une seule transaction
         
         Args:
-            segments: Liste de tuples (texte_source, texte_cible)
+            corpus_paths: Liste des chemins vers les corpus TSV alignés
             source_lang: Code de la langue source
             target_lang: Code de la langue cible
-            min_confidence: Confiance minimale
+            min_confidence: Confiance minimale pour l'ajout au glossaire
+            workers: Nombre de processus extrayant les paires candidates en parallèle
+                (les écritures restent dans le processus principal)
             
         Returns:
-            Liste des termes appris
+            Nombre de termes appris
         """
-        # Calcul des cooccurrences
-        word_pairs = self._extract_potential_translations(segments)
-        
-        # Filtrer et ajouter au glossaire
-        learned_terms = []
+        terms_added = 0
         
         with GlossaryManager(self.db_path) as gm:
-            for (source_term, target_term), stats in word_pairs.items():
-                # Calculer un score de confiance
-                confidence = self._calculate_confidence_score(stats)
+            if not all([gm.get_language_id(source_lang), gm.get_language_id(target_lang),
+                        gm.get_domain_id('general')]):
+                logger.error(f"Langues ou domaine introuvables pour {source_lang}-{target_lang}")
+                return 0
+            
+            # Processus démarrés par spawn : un fork copierait l'état (verrous
+            # compris) des threads de l'appelant
+            executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+            ) if workers > 1 else None
+            gm.begin()
+            try:
+                for corpus_path in corpus_paths:
+                    try:
+                        batches = self._iter_segment_batches(corpus_path)
+                        for word_pairs in self._iter_word_pairs(batches, min_confidence, executor, 2 * workers):
+                            terms = self._select_learned_terms(gm, word_pairs, source_lang, target_lang, min_confidence)
+                            terms_added += gm.add_terms_bulk(
+                                self._learned_term_rows(terms, source_lang, target_lang), commit=False
+                            )
+                    except (OSError, UnicodeDecodeError, csv.Error) as e:
+                        logger.error(f"Erreur lors de la lecture du corpus {corpus_path}: {e}")
                 
-                if confidence >= min_confidence:
-                    # Vérifier si le terme existe déjà
-                    existing = gm.search_term(source_term, source_lang, target_lang)
-                    
-                    if existing:
-                        # Terme existant avec meilleure confiance, ignorer
-                        if any(term['confidence_score'] >= confidence for term in existing):
-                            continue
-                    
-                    # Ajouter ou mettre à jour
-                    gm.add_term(
-                        source_term=source_term,
-                        source_lang=source_lang,
-                        target_term=target_term,
-                        target_lang=target_lang,
-                        domain='general',
-                        confidence=confidence,
-                        validated=False
-                    )
-                    
-                    learned_terms.append((source_term, target_term, confidence))
-        
-        return learned_terms
+                gm.commit()
+            except Exception as e:
+                gm.rollback()
+                logger.error(f"Erreur lors de l'apprentissage depuis les corpus: {e}")
+                return 0
+            finally:
+                if executor:
+                    executor.shutdown()
+        
+        return terms_added
     
-    def _extract_potential_translations(self, segments):
+    def _iter_word_pairs(self, batches, min_confidence, executor=None, max_pending=2):
         """
-        Extrait des traductions potentielles de termes à partir de segments alignés
+        Extrait les paires candidates de chaque lot, dans l'ordre des lots
         
         Args:
-            segments: Liste de tuples (texte_source, texte_cible)
+            batches: Itérable de lots de segments
+            min_confidence: Confiance minimale
+            executor: ProcessPoolExecutor optionnel pour extraire plusieurs lots en parallèle
+            max_pending: Nombre maximal de lots soumis à l'executor et non encore consommés
             
         Returns:
-            Dictionnaire {(terme_source, terme_cible): statistiques}
+            Générateur des dictionnaires de paires, un par lot
         """
-        word_pairs = {}
-        
-        for source_text, target_text in segments:
-            # Tokenisation simple
-            source_tokens = self._tokenize(source_text)
-            target_tokens = self._tokenize(target_text)
-            
-            # Générer des n-grammes
-            source_ngrams = self._generate_ngrams(source_tokens, max_n=3)
-            target_ngrams = self._generate_ngrams(target_tokens, max_n=3)
-            
-            # Analyser les cooccurrences
-            for source_ngram in source_ngrams:
-                for target_ngram in target_ngrams:
-                    pair = (source_ngram, target_ngram)
-                    
-                    if pair not in word_pairs:
-                        word_pairs[pair] = {
-                            'count': 0,
-                            'source_occurrences': 0,
-                            'target_occurrences': 0,
-                            'similarity': SequenceMatcher(None, source_ngram, target_ngram).ratio()
-                        }
-                    
-                    word_pairs[pair]['count'] += 1
-                    
-            # Compter les occurrences individuelles
-            for source_ngram in set(source_ngrams):
-                for pair in word_pairs:
-                    if pair[0] == source_ngram:
-                        word_pairs[pair]['source_occurrences'] += 1
-            
-            for target_ngram in set(target_ngrams):
-                for pair in word_pairs:
-                    if pair[1] == target_ngram:
-                        word_pairs[pair]['target_occurrences'] += 1
-        
-        return word_pairs
-    
-    def _tokenize(self, text):
-        """Tokenisation améliorée avec gestion des caractères spéciaux"""
-        # Préserver certains caractères spéciaux importants pour les langues ciblées
-        text = text.lower()
-        # Remplacer la ponctuation par des espaces
-        text = re.sub(r'[^\w\s\u00E0-\u00FF\u0300-\u036F]', ' ', text)
-        # Diviser en tokens et filtrer les tokens vides
-        return [token for token in text.split() if token]
+        if executor is None:
+            for segments in batches:
+                yield self._extract_potential_translations(segments, min_confidence)
+            return
+        
+        # Fenêtre bornée de lots en cours pour limiter la mémoire sur les gros corpus
+        pending = deque()
+        for segments in batches:
+            pending.append(executor.submit(_extract_batch_translations, type(self), segments, min_confidence))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        
+        while pending:
+            yield pending.popleft().result()
     
-    def _generate_ngrams(self, tokens, max_n=3):
-        """Génère des n-grammes à partir d'une liste de tokens"""
-        ngrams = []
-        
-        for n in range(1, min(max_n + 1, len(tokens) + 1)):
-            for i in range(len(tokens) - n + 1):
-                ngram = ' '.join(tokens[i:i+n])
-                ngrams.append(ngram)
-        
-        return ngrams
-    
-    def _calculate_confidence_score(self, stats):
-        """
-        Calcule un score de confiance pour une paire de termes
-        
-        Args:
-            stats: Statistiques de la paire
+    def _iter_segment_batches(self, corpus_path, batch_size=100):
+        """Lit un corpus TSV aligné et produit des lots de tuples (texte_source, texte_cible)"""
+        with open(corpus_path, 'r', encoding='utf-8') as f:
+            reader = csv.reader(f, delimiter='\t')
+            # Ignorer l'en-tête
+            next(reader, None)
             
-        Returns:
-            Score de confiance entre 0 et 1
-        """
-        # Facteurs considérés:
-        # - Fréquence de cooccurrence
-        # - Ratio de cooccurrence par rapport aux occurrences individuelles
-        # - Similarité des chaînes
-        
-        count = stats['count']
-        source_occurrences = max(1, stats['source_occurrences'])
-        target_occurrences = max(1, stats['target_occurrences'])
-        
-        # Ratio de cooccurrence
-        cooccurrence_ratio = count / max(source_occurrences, target_occurrences)
-        
-        # Similarité des chaînes (pour les cognats)
-        string_similarity = stats['similarity']
-        
-        # Score combiné
-        confidence = 0.4 * cooccurrence_ratio + 0.3 * (count / 10) + 0.3 * string_similarity
-        
-        # Normaliser entre 0 et 1
-        return min(0.95, confidence)
-    
-# Ajouter cette classe dans src/database/glossary_learner.py
-
-class EnhancedGlossaryLearner(GlossaryLearner):
-    """Version améliorée du GlossaryLearner avec des fonctionnalités supplémentaires"""
+            segments = []
+            for row in reader:
+                if len(row) == 2:
+                    segments.append((row[0], row[1]))
+                
+                if len(segments) >= batch_size:
+                    yield segments
+                    segments = []
+            
+            # Dernier lot
+            if segments:
+                yield segments
     
-    def learn_from_aligned_corpus(self, corpus_path, source_lang, target_lang, min_confidence=0.6):
+    def _process_segment_batch(self, segments, source_lang, target_lang, min_confidence):
         """
-        Apprend des termes à partir d'un corpus parallèle aligné
+        Traite un lot de segments pour en extraire des termes
         
         Args:
-            corpus_path: Chemin vers le corpus TSV aligné
+            segments: Liste de tuples (texte_source, texte_cible)
             source_lang: Code de la langue source
             target_lang: Code de la langue cible
-            min_confidence: Confiance minimale pour l'ajout au glossaire
+            min_confidence: Confiance minimale
             
         Returns:
-            Nombre de termes appris
+            Liste des termes appris
         """
-        import csv
+        # Calcul des cooccurrences
+        word_pairs = self._extract_potential_translations(segments, min_confidence)
         
-        terms_added = 0
-        try:
-            with open(corpus_path, 'r', encoding='utf-8') as f:
-                reader = csv.reader(f, delimiter='\t')
-                # Ignorer l'en-tête
-                next(reader, None)
-                
-                # Traitement par lots
-                batch_size = 100
-                segments = []
-                
-                for row in reader:
-                    if len(row) == 2:
-                        segments.append((row[0], row[1]))
-                    
-                    if len(segments) >= batch_size:
-                        terms = self._process_segment_batch(segments, source_lang, target_lang, min_confidence)
-                        terms_added += len(terms)
-                        segments = []
-                
-                # Traiter le dernier lot
-                if segments:
-                    terms = self._process_segment_batch(segments, source_lang, target_lang, min_confidence)
-                    terms_added += len(terms)
-            
-            return terms_added
+        with GlossaryManager(self.db_path) as gm:
+            learned_terms = self._select_learned_terms(gm, word_pairs, source_lang, target_lang, min_confidence)
             
-        except Exception as e:
-            logger.error(f"Erreur lors de l'apprentissage depuis le corpus: {e}")
-            return 0
+            # Ajouter ou mettre à jour
+            gm.add_terms_bulk(self._learned_term_rows(learned_terms, source_lang, target_lang))
+        
+        return learned_terms
     
-    def _process_segment_batch(self, segments, source_lang, target_lang, min_confidence):
+    def _learned_term_rows(self, learned_terms, source_lang, target_lang):
+        """Convertit des termes appris en lignes pour GlossaryManager.add_terms_bulk"""
+        return [
+            (source_term, source_lang, target_term, target_lang, 'general', None, confidence, False)
+            for source_term, target_term, confidence in learned_terms
+        ]
+    
+    def _select_learned_terms(self, gm, word_pairs, source_lang, target_lang, min_confidence):
         """
-        Traite un lot de segments pour en extraire des termes
+        Sélectionne les paires de termes d'un lot qui doivent être écrites au glossaire
         
         Args:
-            segments: Liste de tuples (texte_source, texte_cible)
+            gm: GlossaryManager ouvert
+            word_pairs: Paires candidates issues de _extract_potential_translations
             source_lang: Code de la langue source
             target_lang: Code de la langue cible
             min_confidence: Confiance minimale
             
         Returns:
-            Liste des termes appris
+            Liste de tuples (terme_source, terme_cible, confiance)
         """
-        # Calcul des cooccurrences
-        word_pairs = self._extract_potential_translations(segments)
+        # Mots vides détectés dans les lots précédents pour cette paire de langues
+        source_stopwords, target_stopwords = self._stopword_cache.setdefault(
+            (source_lang, target_lang), (set(), set())
+        )
+        
+        # Calculer un score de confiance
+        confidences = self._calculate_confidence_scores(word_pairs)
+        candidates = [
+            (source_term, target_term, confidence)
+            for (source_term, target_term), confidence in zip(word_pairs, confidences)
+            if confidence >= min_confidence
+            and source_term not in source_stopwords and target_term not in target_stopwords
+        ]
+        
+        source_stopwords.update(word_pairs.source_stopwords)
+        target_stopwords.update(word_pairs.target_stopwords)
+        
+        # Termes existants récupérés en une seule recherche
+        existing_map = gm.search_terms_bulk(
+            (source_term for source_term, _, _ in candidates), source_lang, target_lang
+        )
         
-        # Filtrer et ajouter au glossaire
         learned_terms = []
+        # Meilleure confiance déjà retenue dans ce lot pour chaque terme source
+        selected = {}
         
-        with GlossaryManager(self.db_path) as gm:
-            for (source_term, target_term), stats in word_pairs.items():
-                # Calculer un score de confiance
-                confidence = self._calculate_confidence_score(stats)
-                
-                if confidence >= min_confidence:
-                    # Vérifier si le terme existe déjà
-                    existing = gm.search_term(source_term, source_lang, target_lang)
-                    
-                    if existing:
-                        # Terme existant avec meilleure confiance, ignorer
-                        if any(term['confidence_score'] >= confidence for term in existing):
-                            continue
-                    
-                    # Ajouter ou mettre à jour
-                    gm.add_term(
-                        source_term=source_term,
-                        source_lang=source_lang,
-                        target_term=target_term,
-                        target_lang=target_lang,
-                        domain='general',
-                        confidence=confidence,
-                        validated=False
-                    )
-                    
-                    learned_terms.append((source_term, target_term, confidence))
+        for source_term, target_term, confidence in candidates:
+            if selected.get(source_term, -1) >= confidence:
+                continue
+            
+            # Vérifier si le terme existe déjà
+            existing = existing_map.get(source_term)
+            
+            if existing:
+                # Terme existant avec meilleure confiance, ignorer
+                if any(term['confidence_score'] >= confidence for term in existing):
+                    continue
+            
+            selected[source_term] = confidence
+            learned_terms.append((source_term, target_term, confidence))
         
         return learned_terms
     
-    def _extract_potential_translations(self, segments):
+    @classmethod
+    def _extract_potential_translations(cls, segments, min_confidence=None):
         """
         Extrait des traductions potentielles de termes à partir de segments alignés
         
         Args:
             segments: Liste de tuples (texte_source, texte_cible)
+            min_confidence: Si fourni, écarte avant tout calcul de similarité les
+                paires qui ne peuvent pas atteindre cette confiance
             
         Returns:
-            Dictionnaire {(terme_source, terme_cible): statistiques}
+            PairStatistics des paires (terme_source, terme_cible) retenues
         """
-        word_pairs = {}
-        
+        # Les n-grammes sont numérotés pour le lot et une paire est la clé entière
+        # (source << 32) | cible
+        vocab = {}
+        # Nombre de segments contenant chaque n-gramme (fréquence documentaire)
+        source_counts = Counter()
+        target_counts = Counter()
+        
+        segment_ngrams = []
         for source_text, target_text in segments:
-            # Tokenisation simple
-            source_tokens = self._tokenize(source_text)
-            target_tokens = self._tokenize(target_text)
+            # Tokenisation et n-grammes (mis en cache pour les segments répétés)
+            source_ngrams = _cached_ngrams(source_text)
+            target_ngrams = sorted(_cached_ngrams(target_text), key=len)
+            source_ids = [vocab.setdefault(ngram, len(vocab)) for ngram in source_ngrams]
+            target_ids = [vocab.setdefault(ngram, len(vocab)) for ngram in target_ngrams]
+            segment_ngrams.append((source_ngrams, source_ids, target_ngrams, target_ids))
             
-            # Générer des n-grammes
-            source_ngrams = self._generate_ngrams(source_tokens, max_n=3)
-            target_ngrams = self._generate_ngrams(target_tokens, max_n=3)
+            # Compter les occurrences individuelles (une fois par segment)
+            source_counts.update(set(source_ids))
+            target_counts.update(set(target_ids))
+        
+        ngrams = list(vocab)
+        word_pairs = PairStatistics()
+        
+        # Sur un lot assez grand, écarter les mots vides (trop fréquents) et les hapax
+        source_rejected = target_rejected = frozenset()
+        if len(segments) >= cls.DF_FILTER_MIN_SEGMENTS:
+            min_df = cls.MIN_DOCUMENT_FREQUENCY
+            max_df = cls.MAX_DOCUMENT_FREQUENCY * len(segments)
+            source_rejected = {i for i, df in source_counts.items() if not min_df <= df <= max_df}
+            target_rejected = {i for i, df in target_counts.items() if not min_df <= df <= max_df}
+            word_pairs.source_stopwords = frozenset(ngrams[i] for i, df in source_counts.items() if df > max_df)
+            word_pairs.target_stopwords = frozenset(ngrams[i] for i, df in target_counts.items() if df > max_df)
+        
+        # Analyser les cooccurrences des seules paires de longueurs comparables
+        pair_counts = Counter()
+        min_ratio, max_ratio = cls.LENGTH_RATIO_RANGE
+        
+        for source_ngrams, source_ids, target_ngrams, target_ids in segment_ngrams:
+            if target_rejected:
+                kept = [k for k, i in enumerate(target_ids) if i not in target_rejected]
+                target_ngrams = [target_ngrams[k] for k in kept]
+                target_ids = [target_ids[k] for k in kept]
             
-            # Analyser les cooccurrences
-            for source_ngram in source_ngrams:
-                for target_ngram in target_ngrams:
-                    pair = (source_ngram, target_ngram)
-                    
-                    if pair not in word_pairs:
-                        word_pairs[pair] = {
-                            'count': 0,
-                            'source_occurrences': 0,
-                            'target_occurrences': 0,
-                            'similarity': SequenceMatcher(None, source_ngram, target_ngram).ratio()
-                        }
-                    
-                    word_pairs[pair]['count'] += 1
-                    
-            # Compter les occurrences individuelles
-            for source_ngram in set(source_ngrams):
-                for pair in word_pairs:
-                    if pair[0] == source_ngram:
-                        word_pairs[pair]['source_occurrences'] += 1
+            target_lengths = [len(ngram) for ngram in target_ngrams]
+            for source_ngram, source_id in zip(source_ngrams, source_ids):
+                if source_id in source_rejected:
+                    continue
+                start = bisect_left(target_lengths, len(source_ngram) * min_ratio)
+                end = bisect_right(target_lengths, len(source_ngram) * max_ratio)
+                pair_counts.update(map((source_id << 32).__or__, target_ids[start:end]))
+        
+        for pair, count in pair_counts.items():
+            source_id, target_id = pair >> 32, pair & 0xFFFFFFFF
+            source_occurrences = source_counts[source_id]
+            target_occurrences = target_counts[target_id]
             
-            for target_ngram in set(target_ngrams):
-                for pair in word_pairs:
-                    if pair[1] == target_ngram:
-                        word_pairs[pair]['target_occurrences'] += 1
+            # Similarité minimale nécessaire pour atteindre le seuil (la marge absorbe
+            # les arrondis) : au-delà de 1, inutile de la calculer
+            score_cutoff = 0.0
+            if min_confidence is not None:
+                estimate = cls._confidence(count, source_occurrences, target_occurrences)
+                score_cutoff = max(0.0, (min_confidence - estimate) / cls.SIMILARITY_WEIGHT - 1e-9)
+                if score_cutoff > 1:
+                    continue
+            
+            source_ngram, target_ngram = ngrams[source_id], ngrams[target_id]
+            similarity = string_similarity(source_ngram, target_ngram, score_cutoff)
+            if similarity < score_cutoff:
+                continue
+            
+            word_pairs.append((source_ngram, target_ngram), count,
+                              source_occurrences, target_occurrences, similarity)
         
         return word_pairs
     
     def _tokenize(self, text):
         """Tokenisation améliorée avec gestion des caractères spéciaux"""
-        # Préserver certains caractères spéciaux importants pour les langues ciblées
-        text = text.lower()
-        # Remplacer la ponctuation par des espaces
-        text = re.sub(r'[^\w\s\u00E0-\u00FF\u0300-\u036F]', ' ', text)
-        # Diviser en tokens et filtrer les tokens vides
-        return [token for token in text.split() if token]
+        return tokenize_text(text)
     
     def _generate_ngrams(self, tokens, max_n=3):
         """Génère des n-grammes à partir d'une liste de tokens"""
-        ngrams = []
+        return generate_ngrams(tokens, max_n)
+    
+    def _calculate_confidence_scores(self, word_pairs):
+        """
+        Calcule les scores de confiance de toutes les paires d'un lot
         
-        for n in range(1, min(max_n + 1, len(tokens) + 1)):
-            for i in range(len(tokens) - n + 1):
-                ngram = ' '.join(tokens[i:i+n])
-                ngrams.append(ngram)
+        Args:
+            word_pairs: PairStatistics issues de _extract_potential_translations
+            
+        Returns:
+            Liste des scores, dans l'ordre de word_pairs
+        """
+        if not NUMPY_AVAILABLE or not word_pairs:
+            return list(map(self._confidence, word_pairs.counts, word_pairs.source_occurrences,
+                            word_pairs.target_occurrences, word_pairs.similarities))
+        
+        # Même formule que _confidence, sur les colonnes (sans copie)
+        counts = np.frombuffer(word_pairs.counts, dtype=np.int64)
+        source_occurrences = np.frombuffer(word_pairs.source_occurrences, dtype=np.int64)
+        target_occurrences = np.frombuffer(word_pairs.target_occurrences, dtype=np.int64)
+        similarities = np.frombuffer(word_pairs.similarities, dtype=np.float64)
+        
+        occurrences = np.maximum(np.maximum(source_occurrences, target_occurrences), 1)
+        confidence = 0.4 * (counts / occurrences) + 0.3 * (counts / 10) + self.SIMILARITY_WEIGHT * similarities
         
-        return ngrams
+        return np.minimum(0.95, confidence).tolist()
     
     def _calculate_confidence_score(self, stats):
         """
         Calcule un score de confiance pour une paire de termes
         
         Args:
-            stats: Statistiques de la paire
+            stats: Statistiques de la paire (similarité à None pour une estimation
+                sans le terme de similarité)
             
         Returns:
             Score de confiance entre 0 et 1
         """
+        return self._confidence(stats['count'], stats['source_occurrences'],
+                                stats['target_occurrences'], stats['similarity'])
+    
+    @classmethod
+    def _confidence(cls, count, source_occurrences, target_occurrences, similarity=None):
+        """Score de confiance à partir des statistiques d'une paire (voir _calculate_confidence_score)"""
         # Facteurs considérés:
         # - Fréquence de cooccurrence
         # - Ratio de cooccurrence par rapport aux occurrences individuelles
         # - Similarité des chaînes
         
-        count = stats['count']
-        source_occurrences = max(1, stats['source_occurrences'])
-        target_occurrences = max(1, stats['target_occurrences'])
+        source_occurrences = max(1, source_occurrences)
+        target_occurrences = max(1, target_occurrences)
         
         # Ratio de cooccurrence
         cooccurrence_ratio = count / max(source_occurrences, target_occurrences)
         
-        # Similarité des chaînes (pour les cognats)
-        string_similarity = stats['similarity']
-        
         # Score combiné
-        confidence = 0.4 * cooccurrence_ratio + 0.3 * (count / 10) + 0.3 * string_similarity
+        confidence = 0.4 * cooccurrence_ratio + 0.3 * (count / 10)
+        
+        # Similarité des chaînes (pour les cognats)
+        if similarity is not None:
+            confidence += cls.SIMILARITY_WEIGHT * similarity
         
         # Normaliser entre 0 et 1
         return min(0.95, confidence)
\ No newline at end of file
@@ -1,24 +1,237 @@
 # src/database/glossary_manager.py
 
+import mmap
+import os
 import sqlite3
 import json
+from collections import defaultdict
 from datetime import datetime
+from itertools import chain, islice
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import apsw
+    APSW_AVAILABLE = True
+except ImportError:
+    APSW_AVAILABLE = False
+
+# Lier les booléens (validated, is_source) comme des entiers : sans adaptateur,
+# sqlite3 essaie les autres protocoles d'adaptation avant de lier un bool
+sqlite3.register_adapter(bool, int)
+
+# Réglages de chaque connexion : journal WAL, synchronisation équilibrée,
+# temporaires en mémoire, cache de 64 Mo et lectures via mmap (256 Mo)
+_CONNECTION_PRAGMAS = """
+PRAGMA foreign_keys=ON;
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-64000;
+PRAGMA mmap_size=268435456;
+"""
+
+# Réglages supplémentaires des imports massifs (bulk=True) : ni fsync ni journal
+# sur disque, une interruption pendant l'import peut corrompre la base
+_BULK_PRAGMAS = """
+PRAGMA synchronous=OFF;
+PRAGMA journal_mode=MEMORY;
+"""
+
+# Requêtes préparées gardées par connexion (128 par défaut dans sqlite3)
+STATEMENT_CACHE_SIZE = 256
+
+# Attente maximale (secondes) du verrou d'écriture détenu par une autre connexion
+BUSY_TIMEOUT = 30.0
+
+# Les requêtes fréquentes sont des constantes : le même texte SQL retrouve la
+# requête déjà compilée dans le cache de la connexion
+_SELECT_LANGUAGE_ID = "SELECT id FROM languages WHERE code = ?"
+
+_SELECT_DOMAIN_ID = "SELECT id FROM domains WHERE name = ?"
+
+_INSERT_VARIANT = """
+    INSERT INTO term_variants (entry_id, variant, is_source)
+    VALUES (?, ?, ?)
+"""
+
+# Entrées directes puis entrées trouvées par variante, en une seule requête.
+# La seconde branche exclut les entrées déjà renvoyées par la première, ce qui
+# évite le dédoublonnage (et le tri) d'un UNION et garde cet ordre.
+_SEARCH_TERM = """
+    SELECT ge.id, ge.source_term, ge.target_term, ge.context_example,
+           ge.confidence_score, ge.validated, d.name as domain
+    FROM glossary_entries ge
+    LEFT JOIN domains d ON ge.domain_id = d.id
+    WHERE ge.source_term = :term
+      AND ge.source_language_id = :source_lang_id AND ge.target_language_id = :target_lang_id
+      AND (:domain_id IS NULL OR ge.domain_id = :domain_id)
+    UNION ALL
+    SELECT ge.id, ge.source_term, ge.target_term, ge.context_example,
+           ge.confidence_score, ge.validated, d.name as domain
+    FROM term_variants tv
+    JOIN glossary_entries ge ON tv.entry_id = ge.id
+    LEFT JOIN domains d ON ge.domain_id = d.id
+    WHERE tv.variant = :term AND tv.is_source = 1
+      AND ge.source_language_id = :source_lang_id AND ge.target_language_id = :target_lang_id
+      AND NOT (ge.source_term = :term AND (:domain_id IS NULL OR ge.domain_id = :domain_id))
+"""
+
+# Insertion ou mise à jour d'un terme (même effet que add_term)
+_UPSERT_TERM = """
+    INSERT INTO glossary_entries
+    (source_term, source_language_id, target_term, target_language_id,
+     domain_id, context_example, confidence_score, validated)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (source_term, source_language_id, target_language_id, domain_id)
+    DO UPDATE SET target_term = excluded.target_term,
+                  context_example = excluded.context_example,
+                  confidence_score = excluded.confidence_score,
+                  validated = excluded.validated,
+                  updated_at = CURRENT_TIMESTAMP
+"""
+
+# Lignes par requête INSERT multi-lignes de _bulk_upsert (8 paramètres par
+# ligne, bien en dessous de la limite de paramètres de SQLite)
+UPSERT_CHUNK_SIZE = 500
+
+_VALUES_ROW = "(?, ?, ?, ?, ?, ?, ?, ?)"
+
+# Même requête avec UPSERT_CHUNK_SIZE lignes : une seule exécution par lot
+_UPSERT_TERMS_CHUNK = _UPSERT_TERM.replace(_VALUES_ROW, ", ".join([_VALUES_ROW] * UPSERT_CHUNK_SIZE))
+
+# Même requête, pour une seule entrée dont l'ID est renvoyé (SQLite >= 3.35)
+_UPSERT_TERM_RETURNING_ID = _UPSERT_TERM + "    RETURNING id\n"
+
+# Identifiant d'une entrée à partir des codes de langue et du nom de domaine
+_SELECT_ENTRY_ID = """
+    SELECT ge.id
+    FROM glossary_entries ge
+    JOIN languages l1 ON ge.source_language_id = l1.id
+    JOIN languages l2 ON ge.target_language_id = l2.id
+    JOIN domains d ON ge.domain_id = d.id
+    WHERE ge.source_term = ? AND l1.code = ? AND l2.code = ? AND d.name = ?
+"""
+
+# Ajout d'une variante, sans erreur si elle existe déjà
+# Types acceptés pour le contexte et la confiance d'un terme importé
+_SCALAR_TYPES = (str, int, float, type(None))
+
+_INSERT_VARIANT_OR_IGNORE = """
+    INSERT OR IGNORE INTO term_variants (entry_id, variant, is_source)
+    VALUES (?, ?, ?)
+"""
+
+# Nombre maximal de termes par clause IN (limite de paramètres SQLite)
+SEARCH_CHUNK_SIZE = 500
+
+# Taille maximale d'un fichier JSON chargé en entier par orjson ; au-delà,
+# le fichier est lu au fil de l'eau par ijson s'il est disponible
+ORJSON_MAX_FILE_SIZE = 256 * 1024 * 1024
+
+def load_json_file(file_path):
+    """
+    Charge un fichier JSON entier, avec orjson sur une projection mmap si disponible
+    
+    Args:
+        file_path: Chemin vers le fichier JSON
+        
+    Returns:
+        Données du fichier
+    """
+    if ORJSON_AVAILABLE:
+        # orjson analyse directement les octets projetés, sans copie ni décodage préalable
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def iter_json_items(file_path, prefix='item'):
+    """
+    Itère sur les éléments d'un tableau JSON
+    
+    Les fichiers jusqu'à ORJSON_MAX_FILE_SIZE sont chargés en entier par orjson s'il est
+    disponible ; les autres sont lus au fil de l'eau par ijson s'il est disponible.
+    
+    Args:
+        file_path: Chemin vers le fichier JSON
+        prefix: Chemin ijson du tableau ('item' pour un tableau racine,
+                'terms.item' pour le tableau data["terms"])
+        
+    Yields:
+        Éléments du tableau, au fur et à mesure de la lecture
+    """
+    if IJSON_AVAILABLE and not (ORJSON_AVAILABLE and os.path.getsize(file_path) <= ORJSON_MAX_FILE_SIZE):
+        with open(file_path, 'rb') as f:
+            yield from ijson.items(f, prefix, use_float=True)
+        return
+    
+    data = load_json_file(file_path)
+    for key in prefix.split('.')[:-1]:
+        data = data.get(key) if isinstance(data, dict) else None
+    if isinstance(data, list):
+        yield from data
+
+
+def _column_names(cursor):
+    """Noms des colonnes de la dernière requête d'un curseur"""
+    return tuple(description[0] for description in cursor.description)
 
 class GlossaryManager:
-    def __init__(self, db_path):
-        """Initialise le gestionnaire de glossaire avec le chemin vers la base de données"""
+    def __init__(self, db_path, autocommit=True, bulk=False):
+        """
+        Initialise le gestionnaire de glossaire avec le chemin vers la base de données
+        
+        Args:
+            db_path: Chemin vers la base de données SQLite
+            autocommit: Laisser chaque add_term / add_term_variant / validate_term former sa
+                        propre transaction (False pour grouper les écritures dans une
+                        transaction ouverte au besoin et appeler commit() soi-même)
+            bulk: Désactiver fsync et journal sur disque pour un import massif
+        """
         self.db_path = db_path
+        self.autocommit = autocommit
+        self.bulk = bulk
         self.conn = None
         self.cursor = None
+        # Identifiants des langues et domaines, qui ne changent pas pendant l'utilisation
+        self._language_ids = {}
+        self._domain_ids = {}
     
     def __enter__(self):
         """Permet l'utilisation du gestionnaire dans un bloc with"""
-        self.conn = sqlite3.connect(self.db_path)
-        # Activer les clés étrangères
-        self.conn.execute("PRAGMA foreign_keys = ON")
+        # Pas de BEGIN implicite : les transactions sont ouvertes par begin()
+        self.conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT,
+                                    cached_statements=STATEMENT_CACHE_SIZE,
+                                    isolation_level=None)
+        # Activer les clés étrangères et le mode WAL
+        self.conn.executescript(_CONNECTION_PRAGMAS)
+        if self.bulk:
+            self.conn.executescript(_BULK_PRAGMAS)
         # Permettre l'accès par nom de colonne
         self.conn.row_factory = sqlite3.Row
         self.cursor = self.conn.cursor()
+        # Curseur à tuples pour les lectures volumineuses : les dictionnaires de
+        # résultats sont construits par zip avec les noms de colonnes, plus
+        # rapidement que dict(sqlite3.Row)
+        self._tuple_cursor = self.conn.cursor()
+        self._tuple_cursor.row_factory = None
+        
+        # Précharger les langues et domaines (quelques lignes) en deux requêtes
+        self._language_ids = dict(self.conn.execute("SELECT code, id FROM languages").fetchall())
+        self._domain_ids = dict(self.conn.execute("SELECT name, id FROM domains").fetchall())
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -26,19 +239,45 @@ class GlossaryManager:
         if self.conn:
             self.conn.close()
     
+    def begin(self):
+        """Ouvre une transaction d'écriture, sauf si une transaction est déjà en cours"""
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+    
+    def commit(self):
+        """Valide la transaction en cours"""
+        if self.conn.in_transaction:
+            self.conn.execute("COMMIT")
+    
+    def rollback(self):
+        """Annule la transaction en cours"""
+        if self.conn.in_transaction:
+            self.conn.execute("ROLLBACK")
+    
     def get_language_id(self, language_code):
         """Récupère l'ID d'une langue à partir de son code"""
-        self.cursor.execute("SELECT id FROM languages WHERE code = ?", (language_code,))
-        result = self.cursor.fetchone()
+        language_id = self._language_ids.get(language_code)
+        if language_id is not None:
+            return language_id
+        
+        # Langue absente du préchargement : interroger la base (sans self.cursor,
+        # qui peut être en cours d'executemany sur un générateur qui appelle cette méthode)
+        result = self.conn.execute(_SELECT_LANGUAGE_ID, (language_code,)).fetchone()
         if result:
+            self._language_ids[language_code] = result['id']
             return result['id']
         return None
     
     def get_domain_id(self, domain_name):
         """Récupère l'ID d'un domaine à partir de son nom"""
-        self.cursor.execute("SELECT id FROM domains WHERE name = ?", (domain_name,))
-        result = self.cursor.fetchone()
+        domain_id = self._domain_ids.get(domain_name)
+        if domain_id is not None:
+            return domain_id
+        
+        # Domaine absent du préchargement : interroger la base (voir get_language_id)
+        result = self.conn.execute(_SELECT_DOMAIN_ID, (domain_name,)).fetchone()
         if result:
+            self._domain_ids[domain_name] = result['id']
             return result['id']
         return None
     
@@ -59,46 +298,142 @@ class GlossaryManager:
                 missing.append(f"domaine '{domain}'")
             raise ValueError(f"Éléments introuvables: {', '.join(missing)}")
         
-        # Vérifier si l'entrée existe déjà
-        self.cursor.execute("""
-            SELECT id FROM glossary_entries 
-            WHERE source_term = ? AND source_language_id = ? 
-              AND target_language_id = ? AND (domain_id = ? OR (domain_id IS NULL AND ? IS NULL))
-        """, (source_term, source_lang_id, target_lang_id, domain_id, domain_id))
-        
-        existing_entry = self.cursor.fetchone()
-        
-        if existing_entry:
-            # Mise à jour de l'entrée existante
-            self.cursor.execute("""
-                UPDATE glossary_entries
-                SET target_term = ?, context_example = ?, confidence_score = ?,
-                    validated = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (target_term, context, confidence, validated, existing_entry['id']))
-            entry_id = existing_entry['id']
-        else:
-            # Création d'une nouvelle entrée
-            self.cursor.execute("""
-                INSERT INTO glossary_entries
-                (source_term, source_language_id, target_term, target_language_id,
-                 domain_id, context_example, confidence_score, validated)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (source_term, source_lang_id, target_term, target_lang_id,
-                 domain_id, context, confidence, validated))
-            entry_id = self.cursor.lastrowid
-        
-        self.conn.commit()
-        return entry_id
+        if not self.autocommit:
+            self.begin()
+        
+        # Insertion ou mise à jour en une seule requête, qui renvoie l'ID de l'entrée
+        self.cursor.execute(_UPSERT_TERM_RETURNING_ID, (source_term, source_lang_id, target_term, target_lang_id,
+                                                        domain_id, context, confidence, validated))
+        return self.cursor.fetchone()[0]
+    
+    def add_terms_bulk(self, terms, commit=True):
+        """
+        Ajoute ou met à jour plusieurs termes en une seule requête executemany
+        
+        Args:
+            terms: Itérable de tuples (source_term, source_lang, target_term, target_lang,
+                   domain, context, confidence, validated), dans l'ordre des arguments de add_term
+            commit: Écrire dans une transaction validée à la fin (False pour écrire dans
+                    une transaction ouverte par begin())
+            
+        Returns:
+            Nombre de termes écrits
+        """
+        if commit:
+            self.begin()
+        try:
+            count = self._bulk_upsert(self._term_rows(terms))
+            if commit:
+                self.commit()
+        except sqlite3.Error:
+            if commit:
+                self.rollback()
+            raise
+        
+        return count
+    
+    def _bulk_upsert(self, rows):
+        """
+        Écrit des lignes de _UPSERT_TERM par requêtes INSERT de UPSERT_CHUNK_SIZE lignes
+        
+        Une requête multi-lignes fait un seul passage dans SQLite là où executemany
+        exécute la requête pour chaque ligne ; le dernier lot incomplet passe par executemany.
+        
+        Args:
+            rows: Itérable de tuples de paramètres de _UPSERT_TERM, consommé par lots
+            
+        Returns:
+            Nombre de lignes écrites
+        """
+        rows = iter(rows)
+        count = 0
+        
+        while True:
+            chunk = list(islice(rows, UPSERT_CHUNK_SIZE))
+            if len(chunk) < UPSERT_CHUNK_SIZE:
+                self.cursor.executemany(_UPSERT_TERM, chunk)
+                return count + self.cursor.rowcount
+            
+            self.cursor.execute(_UPSERT_TERMS_CHUNK, list(chain.from_iterable(chunk)))
+            count += self.cursor.rowcount
+    
+    def bulk_insert(self, terms):
+        """
+        Ajoute ou met à jour un grand nombre de termes par une connexion apsw
+        
+        apsw lie les paramètres directement par l'API C de SQLite, avec moins de
+        surcoût par ligne que sqlite3. Sans apsw, ou si une transaction est déjà
+        ouverte sur la connexion du gestionnaire, les termes passent par add_terms_bulk
+        (dans la transaction en cours, sans la valider).
+        
+        Args:
+            terms: Itérable de tuples (source_term, source_lang, target_term, target_lang,
+                   domain, context, confidence, validated), comme pour add_terms_bulk
+            
+        Returns:
+            Nombre de termes écrits
+        """
+        # Une seconde connexion attendrait le verrou d'écriture de la transaction en cours,
+        # qui reste à valider par l'appelant
+        if self.conn.in_transaction:
+            return self.add_terms_bulk(terms, commit=False)
+        if not APSW_AVAILABLE:
+            return self.add_terms_bulk(terms)
+        
+        connection = apsw.Connection(self.db_path)
+        try:
+            connection.setbusytimeout(int(BUSY_TIMEOUT * 1000))
+            cursor = connection.cursor()
+            # apsw exécute un script instruction par instruction, au fil de la lecture
+            # du curseur : le consommer entièrement avant la requête suivante
+            list(cursor.execute(_CONNECTION_PRAGMAS))
+            if self.bulk:
+                list(cursor.execute(_BULK_PRAGMAS))
+            
+            changes = connection.totalchanges()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.executemany(_UPSERT_TERM, self._term_rows(terms))
+                cursor.execute("COMMIT")
+            except apsw.Error:
+                cursor.execute("ROLLBACK")
+                raise
+            return connection.totalchanges() - changes
+        finally:
+            connection.close()
+    
+    def _term_rows(self, terms):
+        """
+        Convertit des termes en lignes de paramètres pour _UPSERT_TERM
+        
+        Les termes dont une langue ou le domaine est introuvable sont ignorés.
+        
+        Args:
+            terms: Itérable de tuples (source_term, source_lang, target_term, target_lang,
+                   domain, context, confidence, validated)
+            
+        Yields:
+            Tuples (source_term, source_language_id, target_term, target_language_id,
+            domain_id, context, confidence, validated)
+        """
+        for source_term, source_lang, target_term, target_lang, domain, context, confidence, validated in terms:
+            ids = (self.get_language_id(source_lang), self.get_language_id(target_lang),
+                   self.get_domain_id(domain))
+            if not all(ids):
+                print(f"Terme ignoré {source_term}: langue ou domaine introuvable "
+                      f"({source_lang}, {target_lang}, {domain})")
+                continue
+            
+            # validated déjà converti en entier : pas d'adaptation par sqlite3
+            yield (source_term, ids[0], target_term, ids[1], ids[2], context, confidence,
+                   1 if validated else 0)
     
     def add_term_variant(self, entry_id, variant, is_source=True):
         """Ajoute une variante d'un terme"""
+        if not self.autocommit:
+            self.begin()
         try:
-            self.cursor.execute("""
-                INSERT INTO term_variants (entry_id, variant, is_source)
-                VALUES (?, ?, ?)
-            """, (entry_id, variant, is_source))
-            self.conn.commit()
+            self.cursor.execute(_INSERT_VARIANT, (entry_id, variant, is_source))
             return self.cursor.lastrowid
         except sqlite3.IntegrityError:
             # La variante existe déjà
@@ -109,81 +444,188 @@ class GlossaryManager:
         source_lang_id = self.get_language_id(source_lang)
         target_lang_id = self.get_language_id(target_lang)
         
-        query = """
-            SELECT ge.id, ge.source_term, ge.target_term, ge.context_example,
-                   ge.confidence_score, ge.validated, d.name as domain
-            FROM glossary_entries ge
-            LEFT JOIN domains d ON ge.domain_id = d.id
-            WHERE ge.source_term = ? AND ge.source_language_id = ? AND ge.target_language_id = ?
+        domain_id = self.get_domain_id(domain) if domain else None
+        
+        # Recherche aussi dans les variantes, sans doublons
+        cursor = self._tuple_cursor.execute(_SEARCH_TERM, {
+            'term': term,
+            'source_lang_id': source_lang_id,
+            'target_lang_id': target_lang_id,
+            'domain_id': domain_id
+        })
+        columns = _column_names(cursor)
+        return [dict(zip(columns, row)) for row in cursor]
+    
+    def search_terms_bulk(self, terms, source_lang, target_lang, domain=None):
+        """
+        Recherche plusieurs termes à la fois, comme search_term pour chacun
+        
+        Args:
+            terms: Itérable de termes source
+            source_lang: Code de la langue source
+            target_lang: Code de la langue cible
+            domain: Domaine optionnel (filtre les entrées directes comme search_term)
+            
+        Returns:
+            Dictionnaire {terme: résultats} limité aux termes trouvés
         """
-        params = [term, source_lang_id, target_lang_id]
+        source_lang_id = self.get_language_id(source_lang)
+        target_lang_id = self.get_language_id(target_lang)
+        domain_id = self.get_domain_id(domain) if domain else None
         
-        if domain:
-            domain_id = self.get_domain_id(domain)
+        unique_terms = list(dict.fromkeys(terms))
+        found = {}
+        
+        for start in range(0, len(unique_terms), SEARCH_CHUNK_SIZE):
+            chunk = unique_terms[start:start + SEARCH_CHUNK_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            
+            query = f"""
+                SELECT ge.source_term AS match_term, ge.id, ge.source_term, ge.target_term,
+                       ge.context_example, ge.confidence_score, ge.validated, d.name as domain
+                FROM glossary_entries ge
+                LEFT JOIN domains d ON ge.domain_id = d.id
+                WHERE ge.source_term IN ({placeholders})
+                  AND ge.source_language_id = ? AND ge.target_language_id = ?
+            """
+            params = chunk + [source_lang_id, target_lang_id]
             if domain_id:
                 query += " AND ge.domain_id = ?"
                 params.append(domain_id)
+            
+            variant_query = f"""
+                SELECT tv.variant AS match_term, ge.id, ge.source_term, ge.target_term,
+                       ge.context_example, ge.confidence_score, ge.validated, d.name as domain
+                FROM term_variants tv
+                JOIN glossary_entries ge ON tv.entry_id = ge.id
+                LEFT JOIN domains d ON ge.domain_id = d.id
+                WHERE tv.variant IN ({placeholders}) AND tv.is_source = 1
+                  AND ge.source_language_id = ? AND ge.target_language_id = ?
+            """
+            
+            # Entrées directes d'abord, puis variantes sans doublons
+            for sql, sql_params in ((query, params), (variant_query, chunk + [source_lang_id, target_lang_id])):
+                cursor = self._tuple_cursor.execute(sql, sql_params)
+                # La première colonne (match_term) sert de clé et n'est pas renvoyée
+                columns = _column_names(cursor)[1:]
+                for row in cursor.fetchall():
+                    result = dict(zip(columns, row[1:]))
+                    results = found.setdefault(row[0], [])
+                    if not any(r['id'] == result['id'] for r in results):
+                        results.append(result)
         
-        self.cursor.execute(query, params)
-        results = [dict(row) for row in self.cursor.fetchall()]
+        return found
+    
+    def get_existing_terms(self, source_lang, target_lang, terms):
+        """
+        Renvoie ceux des termes déjà présents dans le glossaire pour une paire de langues
         
-        # Recherche aussi dans les variantes
-        variant_query = """
-            SELECT ge.id, ge.source_term, ge.target_term, ge.context_example,
-                   ge.confidence_score, ge.validated, d.name as domain
-            FROM term_variants tv
-            JOIN glossary_entries ge ON tv.entry_id = ge.id
-            LEFT JOIN domains d ON ge.domain_id = d.id
-            WHERE tv.variant = ? AND tv.is_source = 1
-              AND ge.source_language_id = ? AND ge.target_language_id = ?
+        Un terme est présent s'il a une entrée ou une variante source, comme pour search_term.
+        
+        Args:
+            source_lang: Code de la langue source
+            target_lang: Code de la langue cible
+            terms: Itérable de termes source
+            
+        Returns:
+            Ensemble des termes trouvés
         """
+        source_lang_id = self.get_language_id(source_lang)
+        target_lang_id = self.get_language_id(target_lang)
         
-        self.cursor.execute(variant_query, [term, source_lang_id, target_lang_id])
-        variant_results = [dict(row) for row in self.cursor.fetchall()]
+        unique_terms = list(dict.fromkeys(terms))
+        existing = set()
         
-        # Combiner les résultats sans doublons
-        all_results = results.copy()
-        for vr in variant_results:
-            if not any(r['id'] == vr['id'] for r in all_results):
-                all_results.append(vr)
+        for start in range(0, len(unique_terms), SEARCH_CHUNK_SIZE):
+            chunk = unique_terms[start:start + SEARCH_CHUNK_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            
+            query = f"""
+                SELECT source_term FROM glossary_entries
+                WHERE source_term IN ({placeholders})
+                  AND source_language_id = ? AND target_language_id = ?
+                UNION
+                SELECT tv.variant FROM term_variants tv
+                JOIN glossary_entries ge ON tv.entry_id = ge.id
+                WHERE tv.variant IN ({placeholders}) AND tv.is_source = 1
+                  AND ge.source_language_id = ? AND ge.target_language_id = ?
+            """
+            params = (chunk + [source_lang_id, target_lang_id]) * 2
+            existing.update(term for term, in self._tuple_cursor.execute(query, params))
         
-        return all_results
+        return existing
+    
+    def _iter_import_rows(self, json_file_path, variants_by_term):
+        """
+        Génère les termes d'un fichier JSON de glossaire au fil de la lecture
+        
+        Args:
+            json_file_path: Chemin vers le fichier JSON
+            variants_by_term: Liste complétée par les couples (terme, [(variante, is_source)])
+                              des termes qui ont des variantes
+            
+        Yields:
+            Tuples (source_term, source_lang, target_term, target_lang,
+            domain, context, confidence, validated)
+        """
+        for term in iter_json_items(json_file_path):
+            try:
+                row = (
+                    term['source_term'],
+                    term['source_lang'],
+                    term['target_term'],
+                    term['target_lang'],
+                    term.get('domain', 'general'),
+                    term.get('context'),
+                    term.get('confidence', 0.5),
+                    term.get('validated', False)
+                )
+                variants = [(variant['term'], variant.get('is_source', True))
+                            for variant in term.get('variants', ())]
+                
+                # Un terme invalide est ignoré ici : en base, il annulerait tout le fichier
+                if not all(isinstance(value, str) and value for value in (row[0], row[2])):
+                    raise ValueError("les termes source et cible doivent être des chaînes non vides")
+                if not all(isinstance(value, str) for value in (row[1], row[3], row[4])):
+                    raise ValueError("les langues et le domaine doivent être des chaînes")
+                if not all(isinstance(value, _SCALAR_TYPES) for value in (row[5], row[6])):
+                    raise ValueError("le contexte et la confiance doivent être des valeurs simples")
+                if not all(isinstance(variant, str) and variant for variant, _ in variants):
+                    raise ValueError("les variantes doivent être des chaînes non vides")
+            except Exception as e:
+                source_term = term.get('source_term') if isinstance(term, dict) else term
+                print(f"Erreur lors de l'importation du terme {source_term}: {e}")
+                continue
+            
+            if variants:
+                variants_by_term.append((row, variants))
+            yield row
     
     def batch_import(self, json_file_path):
-        """Importe un lot de termes à partir d'un fichier JSON"""
+        """Importe un lot de termes à partir d'un fichier JSON, en une seule transaction"""
+        variants_by_term = []
+        
         try:
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                terms = json.load(f)
-            
-            imported_count = 0
-            for term in terms:
-                try:
-                    entry_id = self.add_term(
-                        term['source_term'],
-                        term['source_lang'],
-                        term['target_term'],
-                        term['target_lang'],
-                        term.get('domain', 'general'),
-                        term.get('context'),
-                        term.get('confidence', 0.5),
-                        term.get('validated', False)
-                    )
-                    
-                    # Ajouter les variantes si présentes
-                    if 'variants' in term and entry_id:
-                        for variant in term['variants']:
-                            self.add_term_variant(
-                                entry_id,
-                                variant['term'],
-                                variant.get('is_source', True)
-                            )
-                    
-                    imported_count += 1
-                except Exception as e:
-                    print(f"Erreur lors de l'importation du terme {term.get('source_term')}: {e}")
+            # Un seul COMMIT (et donc un seul fsync) pour tout le fichier
+            self.begin()
+            
+            # Les termes sont lus au fil du fichier et écrits par un seul executemany
+            imported_count = self.add_terms_bulk(self._iter_import_rows(json_file_path, variants_by_term),
+                                                 commit=False)
+            
+            # Les variantes sont rattachées aux entrées une fois celles-ci écrites
+            variant_rows = []
+            for (source_term, source_lang, _, target_lang, domain, *_), variants in variants_by_term:
+                self.cursor.execute(_SELECT_ENTRY_ID, (source_term, source_lang, target_lang, domain))
+                entry = self.cursor.fetchone()
+                if entry:
+                    variant_rows.extend((entry['id'], variant, is_source) for variant, is_source in variants)
             
+            self.cursor.executemany(_INSERT_VARIANT_OR_IGNORE, variant_rows)
+            self.commit()
             return imported_count
         except Exception as e:
+            self.rollback()
             print(f"Erreur lors de l'importation du fichier {json_file_path}: {e}")
             return 0
     
@@ -198,48 +640,63 @@ class GlossaryManager:
             JOIN languages l2 ON ge.target_language_id = l2.id
             LEFT JOIN domains d ON ge.domain_id = d.id
         """
+        # Les variantes des entrées exportées, en une seule requête
+        variant_query = """
+            SELECT tv.entry_id, tv.variant, tv.is_source
+            FROM term_variants tv
+            JOIN glossary_entries ge ON tv.entry_id = ge.id
+        """
+        conditions = []
         params = []
         
         if source_lang:
             source_lang_id = self.get_language_id(source_lang)
             if source_lang_id:
-                query += " WHERE ge.source_language_id = ?"
+                conditions.append("ge.source_language_id = ?")
                 params.append(source_lang_id)
         
         if target_lang:
             target_lang_id = self.get_language_id(target_lang)
             if target_lang_id:
-                query += " AND " if "WHERE" in query else " WHERE "
-                query += "ge.target_language_id = ?"
+                conditions.append("ge.target_language_id = ?")
                 params.append(target_lang_id)
         
-        self.cursor.execute(query, params)
-        entries = [dict(row) for row in self.cursor.fetchall()]
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
         
-        # Récupérer les variantes pour chaque entrée
-        for entry in entries:
-            self.cursor.execute("""
-                SELECT variant, is_source
-                FROM term_variants
-                WHERE entry_id = ?
-            """, (entry['id'],))
-            
-            variants = [dict(row) for row in self.cursor.fetchall()]
-            if variants:
-                entry['variants'] = variants
+        variants_by_entry = defaultdict(list)
+        self.cursor.execute(variant_query + where + " ORDER BY tv.entry_id, tv.variant, tv.is_source", params)
+        for entry_id, variant, is_source in self.cursor.fetchall():
+            variants_by_entry[entry_id].append({'variant': variant, 'is_source': is_source})
+        
+        cursor = self._tuple_cursor.execute(query + where + " ORDER BY ge.id", params)
+        columns = _column_names(cursor)
         
-        # Écrire dans le fichier JSON
+        # Écrire le tableau JSON entrée par entrée, au fil du curseur, avec la
+        # même mise en forme que json.dump(entries, indent=2)
+        count = 0
         with open(output_file_path, 'w', encoding='utf-8') as f:
-            json.dump(entries, f, ensure_ascii=False, indent=2)
+            f.write('[')
+            for row in cursor:
+                entry = dict(zip(columns, row))
+                # Rattacher les variantes à leur entrée
+                variants = variants_by_entry.get(entry['id'])
+                if variants:
+                    entry['variants'] = variants
+                
+                f.write(',\n  ' if count else '\n  ')
+                f.write(json.dumps(entry, ensure_ascii=False, indent=2).replace('\n', '\n  '))
+                count += 1
+            f.write('\n]' if count else ']')
         
-        return len(entries)
+        return count
     
     def validate_term(self, entry_id, validated=True):
         """Marque un terme comme validé ou non"""
+        if not self.autocommit:
+            self.begin()
         self.cursor.execute("""
             UPDATE glossary_entries
             SET validated = ?, updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
         """, (validated, entry_id))
-        self.conn.commit()
         return self.cursor.rowcount > 0
\ No newline at end of file
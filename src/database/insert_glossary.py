@@ -7,8 +7,14 @@ from pathlib import Path
 from .glossary_manager import GlossaryManager
 
 def insert_initial_glossary(db_path, json_files_dir):
-    """Insère les glossaires initiaux depuis les fichiers JSON"""
-    with GlossaryManager(db_path) as gm:
+    """
+    Insère les glossaires initiaux depuis les fichiers JSON
+    
+    Les fichiers sont importés l'un après l'autre par une seule connexion :
+    SQLite n'admet qu'un écrivain à la fois et batch_import garde le verrou
+    d'écriture pendant toute la lecture d'un fichier.
+    """
+    with GlossaryManager(db_path, bulk=True) as gm:
         total_imported = 0
         for lang in ['fon', 'dindi', 'ewe', 'yor']:
             # Pour chaque langue cible, chercher des fichiers de glossaire
@@ -63,6 +63,24 @@ def create_database_schema(db_path):
     )
     ''')
     
+    # Index pour les filtres et agrégats fréquents (statistiques du glossaire).
+    # L'index par paire de langues couvre aussi confidence_score et validated
+    # pour que les agrégats puissent être calculés sans lire les lignes.
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_ge_lang_pair
+    ON glossary_entries (source_language_id, target_language_id, confidence_score, validated)
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ge_validated ON glossary_entries (validated)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ge_domain ON glossary_entries (domain_id)')
+    
+    # Recherche par variante (search_term) : la contrainte UNIQUE commence par
+    # entry_id et ne sert pas ; cet index couvre le filtre et la jointure.
+    # Les recherches d'entrées utilisent déjà l'index de la contrainte UNIQUE.
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_variants_variant
+    ON term_variants (variant, is_source, entry_id)
+    ''')
+    
     # Insertion des langues de base
     languages = [
         ('en', 'English'),
@@ -96,6 +114,9 @@ def create_database_schema(db_path):
     )
     
     conn.commit()
+    
+    # Statistiques pour le planificateur de requêtes
+    cursor.execute('ANALYZE')
     conn.close()
     
     print(f"Base de données créée à {db_path}")
@@ -2,14 +2,27 @@
 
 import os
 import csv
-import json
 import logging
 import re
+from collections import Counter
 from pathlib import Path
-from src.database.glossary_manager import GlossaryManager
+from src.database.glossary_manager import GlossaryManager, iter_json_items
 
 logger = logging.getLogger(__name__)
 
+# En-tête de colonne d'un fichier tabulaire: "term_XX" où XX est le code de langue
+_TERM_COL_RE = re.compile(r'term_([a-z]{2,5})$')
+
+# Noms qualifiés des éléments TBX, comparés directement aux balises d'ElementTree
+# (sans évaluer d'expression XPath pour chaque terme)
+_TBX_NS = 'urn:iso:std:iso:30042:ed-1'
+_CONCEPT_TAG = '{%s}conceptEntry' % _TBX_NS
+_TERMSEC_TAG = '{%s}termSec' % _TBX_NS
+_TERMNOTE_TAG = '{%s}termNote' % _TBX_NS
+_TERM_TAG = '{%s}term' % _TBX_NS
+# Attribut xml:lang tel qu'ElementTree le nomme
+_XML_LANG_ATTR = '{http://www.w3.org/XML/1998/namespace}lang'
+
 class TerminologyImporter:
     """Importation de ressources terminologiques depuis diverses sources"""
     
@@ -30,6 +43,10 @@ class TerminologyImporter:
         Returns:
             Dictionnaire {langue: nombre de termes importés}
         """
+        # Ensemble des langues cibles, construit une seule fois pour les tests
+        # d'appartenance faits à chaque traduction (None: toutes les langues)
+        target_langs = frozenset(target_langs) if target_langs else None
+        
         # Déterminer le format du fichier
         file_ext = os.path.splitext(file_path)[1].lower()
         
@@ -44,71 +61,66 @@ class TerminologyImporter:
             return {}
     
     def _import_tbx(self, file_path, source_lang, target_langs, domain):
-        """Importe un fichier TBX (TermBase eXchange)"""
+        """Importe un fichier TBX (TermBase eXchange), concept par concept"""
         try:
-            import xml.etree.ElementTree as ET
-            
             # Statistiques d'importation
-            import_stats = {}
-            
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            
-            ns = {'tbx': 'urn:iso:std:iso:30042:ed-1'}
+            import_stats = Counter()
+            rows = self._iter_tbx_rows(file_path, source_lang, target_langs, domain or 'terminology')
             
             with GlossaryManager(self.db_path) as gm:
-                # Parcourir les concepts
-                for concept in root.findall('.//tbx:conceptEntry', ns):
-                    source_term = None
-                    translations = {}
-                    
-                    # Extraire le terme source
-                    for term_sec in concept.findall('.//tbx:termSec', ns):
-                        lang_code = term_sec.find('.//tbx:termNote[@type="language"]', ns)
-                        if lang_code is None:
-                            # Essayer d'autres formats
-                            lang_code = term_sec.get('xml:lang', '')
-                        else:
-                            lang_code = lang_code.text
-                        
-                        # Normaliser le code de langue
-                        lang_code = lang_code.split('-')[0].lower()
-                        
-                        if lang_code == source_lang:
-                            term = term_sec.find('.//tbx:term', ns)
-                            if term is not None:
-                                source_term = term.text
-                        elif target_langs is None or lang_code in target_langs:
-                            term = term_sec.find('.//tbx:term', ns)
-                            if term is not None:
-                                translations[lang_code] = term.text
-                    
-                    # Si un terme source a été trouvé, ajouter les traductions
-                    if source_term:
-                        for target_lang, target_term in translations.items():
-                            # Mettre à jour les statistiques
-                            if target_lang not in import_stats:
-                                import_stats[target_lang] = 0
-                            
-                            # Ajouter au glossaire
-                            gm.add_term(
-                                source_term=source_term,
-                                source_lang=source_lang,
-                                target_term=target_term,
-                                target_lang=target_lang,
-                                domain=domain or 'terminology',
-                                confidence=0.85,  # Confiance élevée pour les ressources terminologiques
-                                validated=True
-                            )
-                            
-                            import_stats[target_lang] += 1
+                gm.begin()
+                self._write_rows(gm, rows, import_stats)
+                gm.commit()
             
-            return import_stats
+            return dict(import_stats)
             
         except Exception as e:
             logger.error(f"Erreur lors de l'importation du fichier TBX: {e}")
             return {}
     
+    @staticmethod
+    def _iter_tbx_rows(file_path, source_lang, target_langs, default_domain):
+        """Génère les traductions d'un fichier TBX au fil de la lecture, sans construire tout l'arbre"""
+        import xml.etree.ElementTree as ET
+        
+        # Parcourir les concepts
+        for _, concept in ET.iterparse(file_path, events=('end',)):
+            if concept.tag != _CONCEPT_TAG:
+                continue
+            
+            source_term = None
+            translations = {}
+            
+            # Extraire le terme source
+            for term_sec in concept.iter(_TERMSEC_TAG):
+                lang_code = next((note.text for note in term_sec.iter(_TERMNOTE_TAG)
+                                  if note.get('type') == 'language'), None)
+                if lang_code is None:
+                    # Essayer d'autres formats
+                    lang_code = term_sec.get(_XML_LANG_ATTR, '')
+                
+                # Normaliser le code de langue
+                lang_code = lang_code.split('-')[0].lower()
+                
+                if lang_code == source_lang:
+                    term = next(term_sec.iter(_TERM_TAG), None)
+                    if term is not None:
+                        source_term = term.text
+                elif target_langs is None or lang_code in target_langs:
+                    term = next(term_sec.iter(_TERM_TAG), None)
+                    if term is not None:
+                        translations[lang_code] = term.text
+            
+            # Libérer le concept traité
+            concept.clear()
+            
+            # Si un terme source a été trouvé, générer les traductions
+            if source_term:
+                for target_lang, target_term in translations.items():
+                    # Confiance élevée pour les ressources terminologiques
+                    yield (source_term, source_lang, target_term, target_lang,
+                           default_domain, None, 0.85, True)
+    
     def _import_tabular(self, file_path, source_lang, target_langs, domain):
         """Importe un fichier CSV/TSV"""
         try:
@@ -116,7 +128,7 @@ class TerminologyImporter:
             delimiter = '\t' if file_path.endswith('.tsv') else ','
             
             # Statistiques d'importation
-            import_stats = {}
+            import_stats = Counter()
             
             with open(file_path, 'r', encoding='utf-8') as f:
                 reader = csv.DictReader(f, delimiter=delimiter)
@@ -124,8 +136,7 @@ class TerminologyImporter:
                 # Identifier les colonnes de langue
                 lang_columns = {}
                 for header in reader.fieldnames:
-                    # Format attendu: "term_XX" où XX est le code de langue
-                    match = re.match(r'term_([a-z]{2,5})$', header.lower())
+                    match = _TERM_COL_RE.match(header.lower())
                     if match:
                         lang_code = match.group(1)
                         lang_columns[lang_code] = header
@@ -134,135 +145,143 @@ class TerminologyImporter:
                     logger.error(f"Colonne pour la langue source {source_lang} non trouvée")
                     return {}
                 
+                source_column = lang_columns.pop(source_lang)
+                
+                # Ne garder que les colonnes des langues cibles, une fois pour toutes les lignes
+                if target_langs is not None:
+                    lang_columns = {lang_code: column for lang_code, column in lang_columns.items()
+                                    if lang_code in target_langs}
+                
+                rows = self._iter_tabular_rows(reader, source_lang, source_column, lang_columns,
+                                               domain or 'terminology')
+                
                 with GlossaryManager(self.db_path) as gm:
-                    for row in reader:
-                        source_term = row[lang_columns[source_lang]]
-                        
-                        if not source_term:
-                            continue
-                        
-                        # Extraire les traductions
-                        for lang_code, column in lang_columns.items():
-                            if lang_code == source_lang:
-                                continue
-                                
-                            if target_langs and lang_code not in target_langs:
-                                continue
-                            
-                            target_term = row[column]
-                            if not target_term:
-                                continue
-                            
-                            # Mettre à jour les statistiques
-                            if lang_code not in import_stats:
-                                import_stats[lang_code] = 0
-                            
-                            # Ajouter au glossaire
-                            term_domain = row.get('domain', domain or 'terminology')
-                            
-                            gm.add_term(
-                                source_term=source_term,
-                                source_lang=source_lang,
-                                target_term=target_term,
-                                target_lang=lang_code,
-                                domain=term_domain,
-                                confidence=0.85,
-                                validated=True
-                            )
-                            
-                            import_stats[lang_code] += 1
+                    gm.begin()
+                    self._write_rows(gm, rows, import_stats)
+                    gm.commit()
             
-            return import_stats
+            return dict(import_stats)
             
         except Exception as e:
             logger.error(f"Erreur lors de l'importation du fichier tabulaire: {e}")
             return {}
     
+    @staticmethod
+    def _iter_tabular_rows(reader, source_lang, source_column, lang_columns, default_domain):
+        """Génère les traductions des lignes d'un fichier CSV/TSV"""
+        for row in reader:
+            source_term = row[source_column]
+            
+            if not source_term:
+                continue
+            
+            term_domain = row.get('domain', default_domain)
+            
+            # Extraire les traductions
+            for lang_code, column in lang_columns.items():
+                target_term = row[column]
+                if not target_term:
+                    continue
+                
+                yield (source_term, source_lang, target_term, lang_code,
+                       term_domain, None, 0.85, True)
+    
     def _import_json(self, file_path, source_lang, target_langs, domain):
-        """Importe un fichier JSON"""
+        """Importe un fichier JSON, lu au fil de l'eau"""
         try:
             # Statistiques d'importation
-            import_stats = {}
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            import_stats = Counter()
+            rows = self._iter_json_rows(file_path, source_lang, target_langs, domain or 'terminology')
             
             with GlossaryManager(self.db_path) as gm:
-                # Format attendu: liste de concepts
-                if isinstance(data, list):
-                    for item in data:
-                        if "source_term" in item and "translations" in item:
-                            source_term = item["source_term"]
-                            translations = item["translations"]
-                            
-                            for trans in translations:
-                                lang_code = trans.get("language")
-                                target_term = trans.get("term")
-                                
-                                if not lang_code or not target_term:
-                                    continue
-                                
-                                if target_langs and lang_code not in target_langs:
-                                    continue
-                                
-                                # Mettre à jour les statistiques
-                                if lang_code not in import_stats:
-                                    import_stats[lang_code] = 0
-                                
-                                # Ajouter au glossaire
-                                term_domain = trans.get("domain", item.get("domain", domain or "terminology"))
-                                
-                                gm.add_term(
-                                    source_term=source_term,
-                                    source_lang=source_lang,
-                                    target_term=target_term,
-                                    target_lang=lang_code,
-                                    domain=term_domain,
-                                    confidence=0.9,
-                                    validated=True
-                                )
-                                
-                                import_stats[lang_code] += 1
-                
-                # Format alternatif: structure imbriquée par langue
-                elif isinstance(data, dict) and "terms" in data:
-                    for term_entry in data["terms"]:
-                        source_term = term_entry.get(source_lang)
-                        
-                        if not source_term:
-                            continue
-                        
-                        for lang_code, target_term in term_entry.items():
-                            if lang_code == source_lang:
-                                continue
-                            
-                            if target_langs and lang_code not in target_langs:
-                                continue
-                            
-                            if not target_term:
-                                continue
-                            
-                            # Mettre à jour les statistiques
-                            if lang_code not in import_stats:
-                                import_stats[lang_code] = 0
-                            
-                            # Ajouter au glossaire
-                            term_domain = term_entry.get("domain", domain or "terminology")
-                            
-                            gm.add_term(
-                                source_term=source_term,
-                                source_lang=source_lang,
-                                target_term=target_term,
-                                target_lang=lang_code,
-                                domain=term_domain,
-                                confidence=0.85,
-                                validated=True
-                            )
-                            
-                            import_stats[lang_code] += 1
+                gm.begin()
+                self._write_rows(gm, rows, import_stats)
+                gm.commit()
             
-            return import_stats
+            return dict(import_stats)
             
         except Exception as e:
             logger.error(f"Erreur lors de l'importation du fichier JSON: {e}")
-            return {} 
\ No newline at end of file
+            return {}
+    
+    @staticmethod
+    def _iter_json_rows(file_path, source_lang, target_langs, default_domain):
+        """Génère les traductions d'un fichier JSON de terminologie"""
+        # Format attendu: liste de concepts
+        if _json_root_is_array(file_path):
+            for item in iter_json_items(file_path, 'item'):
+                if "source_term" in item and "translations" in item:
+                    source_term = item["source_term"]
+                    translations = item["translations"]
+                    
+                    for trans in translations:
+                        lang_code = trans.get("language")
+                        target_term = trans.get("term")
+                        
+                        if not lang_code or not target_term:
+                            continue
+                        
+                        if target_langs is not None and lang_code not in target_langs:
+                            continue
+                        
+                        term_domain = trans.get("domain", item.get("domain", default_domain))
+                        yield (source_term, source_lang, target_term, lang_code,
+                               term_domain, None, 0.9, True)
+        
+        # Format alternatif: structure imbriquée par langue
+        else:
+            for term_entry in iter_json_items(file_path, 'terms.item'):
+                source_term = term_entry.get(source_lang)
+                
+                if not source_term:
+                    continue
+                
+                for lang_code, target_term in term_entry.items():
+                    if lang_code == source_lang or lang_code == "domain":
+                        continue
+                    
+                    if target_langs is not None and lang_code not in target_langs:
+                        continue
+                    
+                    if not target_term:
+                        continue
+                    
+                    term_domain = term_entry.get("domain", default_domain)
+                    yield (source_term, source_lang, target_term, lang_code,
+                           term_domain, None, 0.85, True)
+    
+    def _write_rows(self, gm, rows, import_stats):
+        """
+        Écrit des traductions dans la transaction ouverte et met à jour les statistiques
+        
+        Les lignes sont consommées au fil de l'écriture, sans être gardées en mémoire.
+        
+        Args:
+            gm: GlossaryManager ouvert, avec une transaction ouverte par begin()
+            rows: Itérable de tuples (source_term, source_lang, target_term, target_lang,
+                  domain, context, confidence, validated)
+            import_stats: Counter {langue: nombre de termes importés} à compléter
+        """
+        def valid_rows():
+            for row in rows:
+                # Écarter les langues ou domaines inconnus (identifiants en cache)
+                if not (gm.get_language_id(row[1]) and gm.get_language_id(row[3]) and gm.get_domain_id(row[4])):
+                    logger.warning(f"Terme ignoré {row[0]}: langue ou domaine introuvable "
+                                   f"({row[1]}, {row[3]}, {row[4]})")
+                    continue
+                
+                # Mettre à jour les statistiques
+                import_stats[row[3]] += 1
+                yield row
+        
+        gm.add_terms_bulk(valid_rows(), commit=False)
+
+
+def _json_root_is_array(file_path):
+    """Indique si la valeur racine d'un fichier JSON est un tableau, en ne lisant que son début"""
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(4096), b''):
+            stripped = chunk.lstrip()
+            if stripped:
+                return stripped.startswith(b'[')
+    return False
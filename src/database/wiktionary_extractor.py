@@ -1,22 +1,61 @@
 # src/database/wiktionary_extractor.py
 
 import re
+import sqlite3
 import requests
 import logging
 import time
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from src.database.glossary_manager import GlossaryManager
 
 logger = logging.getLogger(__name__)
 
+# Nombre de pages Wiktionary téléchargées en parallèle
+FETCH_WORKERS = 8
+
+# Connexions HTTP gardées ouvertes par hôte (au moins une par thread)
+HTTP_POOL_SIZE = 32
+
+# Délai maximal d'attente d'une réponse, en secondes
+REQUEST_TIMEOUT = 10
+
+# Nombre de traductions écrites ensemble dans le glossaire
+INSERT_BATCH_SIZE = 200
+
+# Taille des blocs de page transmis à l'analyseur HTML incrémental
+STREAM_CHUNK_SIZE = 8192
+
 class WiktionaryExtractor:
     """Extraction de termes et traductions depuis Wiktionary"""
     
-    def __init__(self, db_path, user_agent="WikiTranslateAI/1.0"):
+    # Codes de langue Wiktionary des langues du projet
+    _LANG_CODES = {
+        'en': 'en', 'fr': 'fr', 
+        'fon': 'fon', 'ewe': 'ee', 
+        'dindi': 'ddn', 'yor': 'yo'
+    }
+    
+    # Traduction entre parenthèses dans un bloc de langue
+    _PAREN_RE = re.compile(r'\(([^)]+)\)')
+    
+    def __init__(self, db_path, user_agent="WikiTranslateAI/1.0", workers=FETCH_WORKERS):
         """Initialise l'extracteur Wiktionary"""
         self.db_path = db_path
         self.headers = {'User-Agent': user_agent}
-        self.rate_limit_delay = 1  # Délai entre les requêtes
+        self.rate_limit_delay = 1  # Délai entre deux requêtes d'un même thread
+        self.workers = workers
+        
+        # Session partagée : connexions TLS réutilisées d'un mot à l'autre,
+        # nouvelles tentatives avec attente croissante sur 429 et erreurs 5xx
+        pool_size = max(HTTP_POOL_SIZE, workers)
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                                                   max_retries=retries))
     
     def extract_translations(self, source_lang, target_lang, word_list=None, max_words=100):
         """
@@ -38,40 +77,67 @@ class WiktionaryExtractor:
         extracted_count = 0
         
         with GlossaryManager(self.db_path) as gm:
+            # Vérifier quels termes existent déjà dans le glossaire, en quelques requêtes
+            existing = gm.get_existing_terms(source_lang, target_lang, word_list)
+            missing_words = []
             for word in word_list:
-                try:
-                    # Vérifier si le terme existe déjà dans le glossaire
-                    existing = gm.search_term(word, source_lang, target_lang)
-                    if existing:
-                        logger.info(f"Le terme '{word}' existe déjà dans le glossaire")
+                if word in existing:
+                    logger.info(f"Le terme '{word}' existe déjà dans le glossaire")
+                else:
+                    missing_words.append(word)
+            
+            # Télécharger les pages en parallèle (l'attente réseau domine) et écrire
+            # les traductions par lots, dans l'ordre de la liste
+            pending = []
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                translations = executor.map(
+                    lambda word: self._fetch_translation(word, source_lang, target_lang), missing_words
+                )
+                
+                for word, translation in zip(missing_words, translations):
+                    if not translation:
                         continue
                     
-                    # Extraire la traduction depuis Wiktionary
-                    translation = self._get_wiktionary_translation(word, source_lang, target_lang)
-                    
-                    if translation:
-                        # Ajouter au glossaire
-                        gm.add_term(
-                            source_term=word,
-                            source_lang=source_lang,
-                            target_term=translation,
-                            target_lang=target_lang,
-                            domain='general',
-                            confidence=0.7,  # Confiance moyenne pour Wiktionary
-                            validated=False  # Nécessite validation
-                        )
-                        extracted_count += 1
-                        logger.info(f"Ajouté: {word} → {translation}")
+                    # Confiance moyenne pour Wiktionary, validation nécessaire
+                    pending.append((word, source_lang, translation, target_lang,
+                                    'general', None, 0.7, False))
+                    logger.info(f"Extrait: {word} → {translation}")
                     
-                    # Respecter la limite de taux
-                    time.sleep(self.rate_limit_delay)
-                    
-                except Exception as e:
-                    logger.error(f"Erreur lors de l'extraction de '{word}': {e}")
-                    continue
+                    if len(pending) >= INSERT_BATCH_SIZE:
+                        extracted_count += self._flush(gm, pending)
+            
+            extracted_count += self._flush(gm, pending)
         
         return extracted_count
     
+    def _flush(self, gm, pending):
+        """
+        Écrit les traductions en attente dans le glossaire, en une seule transaction
+        
+        Args:
+            gm: GlossaryManager ouvert
+            pending: Liste de tuples pour add_terms_bulk, vidée après l'écriture
+            
+        Returns:
+            Nombre de traductions écrites
+        """
+        if not pending:
+            return 0
+        
+        try:
+            return gm.add_terms_bulk(pending)
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lors de l'ajout de {len(pending)} traductions: {e}")
+            return 0
+        finally:
+            pending.clear()
+    
+    def _fetch_translation(self, word, source_lang, target_lang):
+        """Extrait la traduction d'un mot puis respecte la limite de taux du thread"""
+        translation = self._get_wiktionary_translation(word, source_lang, target_lang)
+        time.sleep(self.rate_limit_delay)
+        return translation
+    
     def _get_frequent_words(self, lang, count=100):
         """
         Récupère une liste de mots fréquents dans la langue
@@ -94,21 +160,24 @@ class WiktionaryExtractor:
             return []
         
         try:
-            response = requests.get(frequency_urls[lang])
-            response.raise_for_status()
-            
-            # Format: mot fréquence
-            words = []
-            for line in response.text.splitlines():
-                if line.strip():
-                    parts = line.strip().split(' ')
-                    if len(parts) >= 1:
-                        words.append(parts[0])
+            # Liste lue ligne par ligne : le téléchargement s'arrête après count mots
+            with self.session.get(frequency_urls[lang], stream=True, timeout=REQUEST_TIMEOUT) as response:
+                response.raise_for_status()
+                # Listes de fréquence encodées en UTF-8
+                response.encoding = 'utf-8'
                 
-                if len(words) >= count:
-                    break
-            
-            return words
+                # Format: mot fréquence
+                words = []
+                for line in response.iter_lines(decode_unicode=True):
+                    if line.strip():
+                        parts = line.strip().split(' ')
+                        if len(parts) >= 1:
+                            words.append(parts[0])
+                    
+                    if len(words) >= count:
+                        break
+                
+                return words
             
         except Exception as e:
             logger.error(f"Erreur lors de la récupération des mots fréquents: {e}")
@@ -126,43 +195,76 @@ class WiktionaryExtractor:
         Returns:
             Traduction ou None si non trouvée
         """
-        # Construire l'URL Wiktionary
-        lang_codes = {
-            'en': 'en', 'fr': 'fr', 
-            'fon': 'fon', 'ewe': 'ee', 
-            'dindi': 'ddn', 'yor': 'yo'
-        }
-        
         # Adapter les codes de langue pour Wiktionary
-        target_code = lang_codes.get(target_lang, target_lang)
+        target_code = self._LANG_CODES.get(target_lang, target_lang)
         
         # Utiliser l'édition Wiktionary dans la langue source
         wiktionary_url = f"https://{source_lang}.wiktionary.org/wiki/{word}"
         
         try:
-            response = requests.get(wiktionary_url, headers=self.headers)
-            
-            if response.status_code != 200:
-                return None
-            
-            soup = BeautifulSoup(response.text, 'lxml')
-            
-            # Chercher la section de traductions
-            translation_sections = soup.find_all('div', class_='translations')
-            
-            for section in translation_sections:
-                # Chercher le bloc de la langue cible
-                target_blocks = section.find_all('li', class_='interwiki')
+            # Page lue par blocs : la connexion est fermée dès que la traduction est trouvée
+            with self.session.get(wiktionary_url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                if response.status_code != 200:
+                    return None
                 
-                for block in target_blocks:
-                    if target_code in block.text or target_lang in block.text:
-                        # Extraire la traduction
-                        translation_match = re.search(r'\(([^)]+)\)', block.text)
-                        if translation_match:
-                            return translation_match.group(1).strip()
-            
-            return None
+                # Seules les fins des éléments div et li sont signalées (filtrage fait par lxml)
+                parser = etree.HTMLPullParser(events=('end',), tag=('div', 'li'),
+                                              encoding=response.encoding)
+                
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    parser.feed(chunk)
+                    translation = self._find_translation(parser.read_events(), target_code, target_lang)
+                    if translation:
+                        return translation
+                
+                parser.close()
+                return self._find_translation(parser.read_events(), target_code, target_lang)
             
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction depuis Wiktionary: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def _find_translation(self, events, target_code, target_lang):
+        """
+        Cherche la traduction dans les éléments li.interwiki des sections div.translations
+        
+        Args:
+            events: Événements ('end', élément) de l'analyseur incrémental
+            target_code: Code Wiktionary de la langue cible
+            target_lang: Code de la langue cible
+            
+        Returns:
+            Traduction ou None si non trouvée dans ces éléments
+        """
+        for _, elem in events:
+            if elem.tag == 'li':
+                if not _has_class(elem, 'interwiki'):
+                    continue
+                if not any(_has_class(div, 'translations') for div in elem.iterancestors('div')):
+                    continue
+                # Un bloc imbriqué se termine avant celui qui le contient : seul le bloc
+                # englobant, dont le texte inclut le sien, est examiné (ordre du document)
+                if any(_has_class(li, 'interwiki') for li in elem.iterancestors('li')):
+                    continue
+
+                # Chercher le bloc de la langue cible
+                block_text = ''.join(elem.itertext())
+                if target_code in block_text or target_lang in block_text:
+                    # Extraire la traduction
+                    translation_match = self._PAREN_RE.search(block_text)
+                    if translation_match:
+                        return translation_match.group(1).strip()
+            elif next(elem.iterancestors('li'), None) is None:
+                # Bloc terminé et déjà examiné : libérer son contenu et ce qui le précède
+                # (pas dans un li encore ouvert, dont le texte reste à lire ; la queue
+                # du bloc appartient au texte de son parent)
+                elem.clear(keep_tail=True)
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+        
+        return None
+
+
+def _has_class(elem, class_name):
+    """Indique si un élément HTML porte la classe donnée"""
+    return class_name in elem.get('class', '').split()
@@ -6,13 +6,16 @@ Evaluation system for African language translations
 import re
 import json
 import math
-from typing import Dict, List, Tuple, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass
 from collections import Counter
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Population count of an int (int.bit_count on Python 3.10+)
+_popcount = int.bit_count if hasattr(int, 'bit_count') else (lambda x: bin(x).count('1'))
+
 
 @dataclass
 class EvaluationResult:
@@ -38,6 +41,8 @@ class AfricanLanguageEvaluator:
             'ewe': ['nogbe', 'mawu', 'legba', 'togbe'],
             'dindi': ['sannu', 'sarki', 'gari']
         }.get(language, [])
+        # Lowercased once, matched against token sets by set intersection
+        self.cultural_terms_lc = frozenset(term.lower() for term in self.cultural_terms)
         
         # Weights for overall score
         self.weights = {
@@ -54,10 +59,14 @@ class AfricanLanguageEvaluator:
             candidate_norm = self._normalize_text(candidate)
             reference_norm = self._normalize_text(reference)
             
+            # Tokenize once for all token-based metrics
+            candidate_tokens = candidate_norm.split()
+            reference_tokens = reference_norm.split()
+            
             # Calculate metrics
-            bleu_score = self._calculate_bleu(candidate_norm, reference_norm)
-            rouge_l = self._calculate_rouge_l(candidate_norm, reference_norm)
-            cultural_preservation = self._evaluate_cultural_preservation(candidate_norm, reference_norm)
+            bleu_score = self._calculate_bleu(candidate_tokens, reference_tokens)
+            rouge_l = self._calculate_rouge_l(candidate_tokens, reference_tokens)
+            cultural_preservation = self._evaluate_cultural_preservation(candidate_tokens, reference_tokens)
             tonal_accuracy = self._evaluate_tonal_accuracy(candidate_norm, reference_norm)
             
             # Overall score
@@ -70,9 +79,9 @@ class AfricanLanguageEvaluator:
             
             # Detailed metrics
             detailed_metrics = {
-                'candidate_length': len(candidate_norm.split()),
-                'reference_length': len(reference_norm.split()),
-                'cultural_terms_found': self._count_cultural_terms(candidate_norm)
+                'candidate_length': len(candidate_tokens),
+                'reference_length': len(reference_tokens),
+                'cultural_terms_found': self._count_cultural_terms(candidate_tokens)
             }
             
             return EvaluationResult(
@@ -101,28 +110,39 @@ class AfricanLanguageEvaluator:
         text = re.sub(r'\s+', ' ', text)
         return text
     
-    def _calculate_bleu(self, candidate: str, reference: str, max_n: int = 4) -> float:
+    def _calculate_bleu(self, candidate_tokens: List[str], reference_tokens: List[str], max_n: int = 4) -> float:
         """Calculate BLEU score"""
-        candidate_tokens = candidate.split()
-        reference_tokens = reference.split()
-        
         if not candidate_tokens or not reference_tokens:
             return 0.0
         
+        # One int id per distinct token of the pair: an n-gram is then keyed by the
+        # base-V number of its ids (exact, no collisions), cheaper to build and
+        # hash than a tuple of strings
+        token_ids = {}
+        candidate_ids = [token_ids.setdefault(token, len(token_ids)) for token in candidate_tokens]
+        reference_ids = [token_ids.setdefault(token, len(token_ids)) for token in reference_tokens]
+        base = len(token_ids)
+        
+        candidate_keys, reference_keys = candidate_ids, reference_ids
         precisions = []
         
         for n in range(1, max_n + 1):
-            candidate_ngrams = Counter(self._get_ngrams(candidate_tokens, n))
-            reference_ngrams = Counter(self._get_ngrams(reference_tokens, n))
+            if n > 1:
+                # Extend each (n-1)-gram key with the id of the token that follows it
+                candidate_keys = [key * base + token for key, token in zip(candidate_keys, candidate_ids[n-1:])]
+                reference_keys = [key * base + token for key, token in zip(reference_keys, reference_ids[n-1:])]
             
-            if not candidate_ngrams:
+            if not candidate_keys:
                 precisions.append(0.0)
                 continue
             
-            matches = sum(min(candidate_ngrams[ngram], reference_ngrams[ngram]) 
-                         for ngram in candidate_ngrams)
+            candidate_ngrams = Counter(candidate_keys)
+            reference_ngrams = Counter(reference_keys)
             
-            precision = matches / sum(candidate_ngrams.values())
+            matches = sum(min(count, reference_ngrams[ngram])
+                          for ngram, count in candidate_ngrams.items() if ngram in reference_ngrams)
+            
+            precision = matches / len(candidate_keys)
             precisions.append(precision)
         
         if 0.0 in precisions:
@@ -132,11 +152,8 @@ class AfricanLanguageEvaluator:
         bleu = brevity_penalty * math.exp(sum(math.log(p) for p in precisions) / len(precisions))
         return bleu
     
-    def _calculate_rouge_l(self, candidate: str, reference: str) -> float:
+    def _calculate_rouge_l(self, candidate_tokens: List[str], reference_tokens: List[str]) -> float:
         """Calculate ROUGE-L score"""
-        candidate_tokens = candidate.split()
-        reference_tokens = reference.split()
-        
         if not candidate_tokens or not reference_tokens:
             return 0.0
         
@@ -154,23 +171,17 @@ class AfricanLanguageEvaluator:
         rouge_l = 2 * precision * recall / (precision + recall)
         return rouge_l
     
-    def _evaluate_cultural_preservation(self, candidate: str, reference: str) -> float:
+    def _evaluate_cultural_preservation(self, candidate_tokens: List[str], reference_tokens: List[str]) -> float:
         """Evaluate cultural term preservation"""
-        if not self.cultural_terms:
+        if not self.cultural_terms_lc:
             return 0.5  # Neutral score
         
-        candidate_tokens = set(candidate.split())
-        reference_tokens = set(reference.split())
-        
-        cultural_in_reference = set()
-        for term in self.cultural_terms:
-            if term.lower() in reference_tokens:
-                cultural_in_reference.add(term.lower())
+        cultural_in_reference = self.cultural_terms_lc.intersection(reference_tokens)
         
         if not cultural_in_reference:
             return 1.0  # No cultural terms to preserve
         
-        preserved = sum(1 for term in cultural_in_reference if term in candidate_tokens)
+        preserved = len(cultural_in_reference.intersection(candidate_tokens))
         return preserved / len(cultural_in_reference)
     
     def _evaluate_tonal_accuracy(self, candidate: str, reference: str) -> float:
@@ -197,28 +208,31 @@ class AfricanLanguageEvaluator:
         matches = sum(1 for cv, rv in zip(candidate_vowels, reference_vowels) if cv == rv)
         return matches / len(reference_vowels) if reference_vowels else 0.0
     
-    def _count_cultural_terms(self, text: str) -> int:
-        """Count cultural terms in text"""
-        tokens = text.split()
-        return sum(1 for term in self.cultural_terms if term.lower() in tokens)
-    
-    def _get_ngrams(self, tokens: List[str], n: int) -> List[Tuple[str, ...]]:
-        """Generate n-grams from tokens"""
-        return [tuple(tokens[i:i+n]) for i in range(len(tokens) - n + 1)]
+    def _count_cultural_terms(self, tokens: List[str]) -> int:
+        """Count cultural terms in tokenized text"""
+        return len(self.cultural_terms_lc.intersection(tokens))
     
     def _lcs_length(self, seq1: List[str], seq2: List[str]) -> int:
-        """Calculate longest common subsequence length"""
-        m, n = len(seq1), len(seq2)
-        dp = [[0] * (n + 1) for _ in range(m + 1)]
-        
-        for i in range(1, m + 1):
-            for j in range(1, n + 1):
-                if seq1[i-1] == seq2[j-1]:
-                    dp[i][j] = dp[i-1][j-1] + 1
-                else:
-                    dp[i][j] = max(dp[i-1][j], dp[i][j-1])
-        
-        return dp[m][n]
+        """
+        Calculate longest common subsequence length
+        
+        Bit-parallel LCS (Hyyrö): each DP row of seq2 is held as the bits of one
+        int, so a token of seq1 costs a few big-int operations instead of a
+        Python loop over seq2. Same result as the quadratic DP table.
+        """
+        # Bit i of masks[token] is set when seq2[i] == token
+        masks = {}
+        for i, token in enumerate(seq2):
+            masks[token] = masks.get(token, 0) | (1 << i)
+        
+        full = (1 << len(seq2)) - 1
+        row = full
+        for token in seq1:
+            matches = row & masks.get(token, 0)
+            row = ((row + matches) | (row - matches)) & full
+        
+        # Zero bits of the final row count the LCS length
+        return len(seq2) - _popcount(row)
 
 
 def evaluate_translation(candidate: str, reference: str, language: str) -> EvaluationResult:
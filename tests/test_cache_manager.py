@@ -0,0 +1,161 @@
+# tests/test_cache_manager.py
+
+import os
+import sys
+import unittest
+import tempfile
+import shutil
+import sqlite3
+from datetime import datetime, timedelta
+
+# Ajouter le répertoire parent au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database.cache_manager import CacheManager, MSGPACK_AVAILABLE, MSGPACK_MARKER, ZSTD_MAGIC
+
+
+class TestCacheManager(unittest.TestCase):
+    """Tests du cache multi-niveaux (L1 mémoire + L3 SQLite)"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = CacheManager(cache_dir=self.cache_dir, max_memory_items=2)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_set_and_get(self):
+        """Une valeur stockée est relue depuis L1"""
+        self.assertTrue(self.cache.set("hello", {"fon": "kúdéwú"}))
+        self.assertEqual(self.cache.get("hello"), {"fon": "kúdéwú"})
+        self.assertEqual(self.cache.get_stats()['l1_hits'], 1)
+
+    def test_l3_promotion(self):
+        """Une valeur évincée de L1 est relue depuis SQLite"""
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.set("c", 3)
+
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.get_stats()['l3_hits'], 1)
+
+    def test_lru_eviction_order(self):
+        """L'entrée la moins récemment utilisée est évincée en premier"""
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+
+        self.assertEqual(list(self.cache._shards[0]), ["a", "c"])
+    
+    def test_sharded_l1(self):
+        """Un grand cache répartit L1 en shards bornés indépendamment"""
+        self.cache.close()
+        self.cache = CacheManager(cache_dir=self.cache_dir, max_memory_items=32)
+        self.assertEqual(len(self.cache._shards), 16)
+        
+        keys = [f"k{i}" for i in range(200) if self.cache._shard_index(f"k{i}") == 3][:3]
+        for i, key in enumerate(keys):
+            self.cache.set(key, i)
+        
+        # Chaque shard contient au plus 2 entrées : la plus ancienne est évincée
+        self.assertEqual(list(self.cache._shards[3]), keys[1:])
+        self.assertEqual(self.cache.get_stats()['l1_size'], 2)
+        self.assertEqual(self.cache.get(keys[0]), 0)
+        self.assertEqual(self.cache.get_stats()['l3_hits'], 1)
+
+    def test_set_many(self):
+        """set_many écrit toutes les entrées en une transaction"""
+        self.assertTrue(self.cache.set_many({"x": "1", "y": "2", "z": "3"}))
+        self.assertEqual(self.cache.get_stats()['sets'], 3)
+
+        # Les entrées doivent survivre à la réouverture du cache
+        self.cache.close()
+        self.cache = CacheManager(cache_dir=self.cache_dir)
+        self.assertEqual(self.cache.get("x"), "1")
+        self.assertEqual(self.cache.get({"op": "missing"}, default="none"), "none")
+
+    def test_legacy_text_rows(self):
+        """Les entrées JSON stockées en TEXT restent lisibles"""
+        self.cache._conn.execute(
+            "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, ?, NULL)",
+            ("legacy", '{"yor": "ẹ kú"}')
+        )
+        self.cache.close()
+
+        self.cache = CacheManager(cache_dir=self.cache_dir)
+        self.assertEqual(self.cache.get("legacy"), {"yor": "ẹ kú"})
+
+    @unittest.skipUnless(MSGPACK_AVAILABLE, "msgpack non installé")
+    def test_msgpack_payload(self):
+        """Les valeurs sont stockées en msgpack et relues à l'identique"""
+        value = {"source_term": "water", "targets": ["sin", "omi"], 3: b"raw"}
+        self.cache.set("packed", value)
+        self.cache.close()
+
+        self.cache = CacheManager(cache_dir=self.cache_dir)
+        payload = self.cache._conn.execute(
+            "SELECT value FROM cache_entries WHERE key = 'packed'"
+        ).fetchone()[0]
+        if payload[:4] == ZSTD_MAGIC:
+            payload = self.cache._decompressor.decompress(payload)
+        self.assertEqual(payload[:1], MSGPACK_MARKER)
+        self.assertEqual(self.cache.get("packed"), value)
+    
+    def test_iso_expiration_migration(self):
+        """Les dates d'expiration ISO-8601 sont converties en timestamps"""
+        self.cache.close()
+        expires_at = (datetime.now() + timedelta(hours=1)).isoformat()
+        with sqlite3.connect(os.path.join(self.cache_dir, "cache.db")) as conn:
+            conn.execute(
+                "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                ("iso", '"valeur"', expires_at)
+            )
+
+        self.cache = CacheManager(cache_dir=self.cache_dir)
+        row = self.cache._conn.execute(
+            "SELECT typeof(expires_at) FROM cache_entries WHERE key = 'iso'"
+        ).fetchone()
+        self.assertEqual(row[0], "integer")
+        self.assertEqual(self.cache.get("iso"), "valeur")
+
+    def test_purge_expired(self):
+        """purge_expired supprime les lignes expirées de SQLite"""
+        self.cache.set("old", "value", ttl=-1)
+        self.cache.set("fresh", "value")
+
+        self.assertEqual(self.cache.purge_expired(), 1)
+        self.cache.vacuum()
+        self.assertIsNone(self.cache.get("old"))
+        self.assertEqual(self.cache.get("fresh"), "value")
+
+    def test_bloom_filter_skips_sqlite_on_miss(self):
+        """Une clé jamais écrite est rejetée sans requête SQLite"""
+        self.cache.set("known", 1)
+        self.assertTrue(self.cache._bloom_may_contain("known"))
+        self.assertFalse(self.cache._bloom_may_contain("unknown"))
+
+        self.cache.clear()
+        self.assertFalse(self.cache._bloom_may_contain("known"))
+
+    def test_delete_prefix(self):
+        """delete_prefix ne supprime que les clés du préfixe donné"""
+        self.cache.set("stats:en:fon", 1)
+        self.cache.set("stats:en:yor", 2)
+        self.cache.set("stats_other", 3)
+
+        self.assertEqual(self.cache.delete_prefix("stats:"), 2)
+        self.assertIsNone(self.cache.get("stats:en:fon"))
+        self.assertIsNone(self.cache.get("stats:en:yor"))
+        self.assertEqual(self.cache.get("stats_other"), 3)
+    
+    def test_clear(self):
+        """clear vide la mémoire et SQLite"""
+        self.cache.set("hello", "world")
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("hello"))
+
+
+if __name__ == '__main__':
+    unittest.main()
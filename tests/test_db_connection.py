@@ -0,0 +1,211 @@
+# tests/test_db_connection.py
+
+import os
+import sys
+import unittest
+import tempfile
+import shutil
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+# Ajouter le répertoire parent au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database import db_connection
+from src.database.db_connection import DatabaseConnection, calculate_similarity, get_database_connection
+from src.database.glossary_manager import GlossaryManager
+from src.database.schema import create_database_schema
+
+
+class TestDatabaseConnection(unittest.TestCase):
+    """Tests du gestionnaire de connexions SQLite"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db = DatabaseConnection(os.path.join(self.temp_dir, 'test.db'), pool_size=2)
+        self.db.execute_update("CREATE TABLE terms (id INTEGER PRIMARY KEY, term TEXT)")
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_connection_reused(self):
+        """Une connexion rendue au pool est réutilisée"""
+        with self.db.get_connection() as first:
+            pass
+        with self.db.get_connection() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(self.db._writer_pool.created, 1)
+
+    def test_page_size_applied_before_wal(self):
+        """La base utilise PAGE_SIZE et le mode WAL, y compris une base existante"""
+        legacy_path = os.path.join(self.temp_dir, 'legacy.db')
+        with sqlite3.connect(legacy_path) as conn:
+            conn.execute("PRAGMA page_size=4096")
+            conn.execute("CREATE TABLE terms (term TEXT)")
+            conn.execute("INSERT INTO terms VALUES ('sin')")
+        conn.close()
+
+        legacy = DatabaseConnection(legacy_path, pool_size=1)
+        try:
+            with legacy.get_connection() as conn:
+                self.assertEqual(conn.execute("PRAGMA page_size").fetchone()[0], db_connection.PAGE_SIZE)
+                self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(legacy.execute_query("SELECT term FROM terms")[0][0], "sin")
+        finally:
+            legacy.close()
+
+    def test_mmap_size(self):
+        """Les connexions lisent la base via mmap, désactivable par instance"""
+        with self.db.get_connection(readonly=True) as conn:
+            self.assertEqual(conn.execute("PRAGMA mmap_size").fetchone()[0], db_connection.MMAP_SIZE)
+
+        no_mmap = DatabaseConnection(os.path.join(self.temp_dir, 'test.db'), checkpoint_interval=0, mmap_size=0)
+        try:
+            with no_mmap.get_connection() as conn:
+                self.assertEqual(conn.execute("PRAGMA mmap_size").fetchone()[0], 0)
+        finally:
+            no_mmap.close()
+
+    def test_pool_size_bounded(self):
+        """Le pool de lecture n'ouvre pas plus de pool_size connexions"""
+        with self.db.get_connection("a", readonly=True) as a, self.db.get_connection("b", readonly=True) as b:
+            self.assertIsNot(a, b)
+        with self.db.get_connection("c", readonly=True):
+            pass
+        self.assertEqual(self.db._reader_pool.created, 2)
+
+    def test_readonly_connection(self):
+        """Les connexions en lecture seule refusent les écritures"""
+        self.db.execute_update("INSERT INTO terms (term) VALUES (?)", ("sin",))
+        with self.db.get_connection(readonly=True) as conn:
+            self.assertEqual(conn.execute("SELECT term FROM terms").fetchone()[0], "sin")
+            with self.assertRaises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO terms (term) VALUES ('omi')")
+
+    def test_uncommitted_changes_discarded(self):
+        """Les modifications non validées sont annulées au retour dans le pool"""
+        with self.db.get_connection() as conn:
+            conn.execute("BEGIN")
+            conn.execute("INSERT INTO terms (term) VALUES ('eau')")
+        self.assertEqual(self.db.execute_query("SELECT COUNT(*) FROM terms")[0][0], 0)
+
+        self.db.execute_update("INSERT INTO terms (term) VALUES (?)", ("sin",))
+        row = self.db.execute_query("SELECT term FROM terms")[0]
+        self.assertEqual(row[0], "sin")
+        self.assertEqual(row['term'], "sin")
+
+    def test_execute_many_and_iter_query(self):
+        """execute_many écrit en une transaction, iter_query relit par lots"""
+        count = self.db.execute_many("INSERT INTO terms (term) VALUES (?)",
+                                     ((f"terme{i}",) for i in range(25)))
+        self.assertEqual(count, 25)
+
+        terms = [row[0] for row in self.db.iter_query("SELECT term FROM terms ORDER BY id", batch=10)]
+        self.assertEqual(len(terms), 25)
+        self.assertEqual(terms[0], "terme0")
+        self.assertEqual(terms[-1], "terme24")
+
+    def test_transaction(self):
+        """transaction valide le bloc ou l'annule entièrement en cas d'erreur"""
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO terms (term) VALUES ('sin')")
+            conn.execute("INSERT INTO terms (term) VALUES ('omi')")
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            with self.db.transaction() as conn:
+                conn.execute("INSERT INTO terms (term) VALUES ('eau')")
+                conn.execute("INSERT INTO terms (id, term) VALUES (1, 'doublon')")
+
+        self.assertEqual(self.db.execute_query("SELECT COUNT(*) FROM terms")[0][0], 2)
+
+    def test_error_propagates(self):
+        """Les erreurs SQL sont propagées et la connexion reste utilisable"""
+        with self.assertRaises(sqlite3.OperationalError):
+            self.db.execute_query("SELECT * FROM missing_table")
+        self.assertEqual(self.db.execute_query("SELECT COUNT(*) FROM terms")[0][0], 0)
+
+    def test_check_database_health(self):
+        """Le bilan de santé rapporte l'existence et les tables de la base"""
+        health = self.db.check_database_health()
+        self.assertTrue(health['db_exists'])
+        self.assertTrue(health['connection_test'])
+        self.assertEqual(health['tables_count'], 1)
+        self.assertIsNone(health['last_error'])
+
+    def test_tokens_table_jaccard(self):
+        """La vue glossary_jaccard reproduit calculate_similarity et suit les écritures"""
+        db_path = os.path.join(self.temp_dir, 'glossary.db')
+        create_database_schema(db_path)
+        with GlossaryManager(db_path) as gm:
+            water = gm.add_term("fresh water", "en", "sin", "fon")
+            river = gm.add_term("fresh river water", "en", "tɔ", "fon")
+
+        db = DatabaseConnection(db_path, checkpoint_interval=0)
+        try:
+            self.assertEqual(db.ensure_tokens_table(), 2)
+            query = "SELECT similarity FROM glossary_jaccard WHERE entry_a = ? AND entry_b = ?"
+            self.assertAlmostEqual(db.execute_query(query, (water, river))[0][0],
+                                   calculate_similarity("fresh water", "fresh river water"))
+
+            # Les triggers notent les entrées modifiées par n'importe quelle connexion
+            with GlossaryManager(db_path) as gm:
+                sea = gm.add_term("sea", "en", "xu", "fon")
+            self.assertEqual(db.ensure_tokens_table(), 1)
+            self.assertEqual(db.execute_query(query, (water, sea)), [])
+            self.assertEqual(db.ensure_tokens_table(), 0)
+        finally:
+            db.close()
+
+    def test_rank_by_similarity(self):
+        """rank_by_similarity retourne les top_k candidats les plus proches"""
+        self.db.execute_many("INSERT INTO terms (term) VALUES (?)",
+                             [("fresh water",), ("fresh river water",), ("sea",), ("",)])
+
+        ranked = self.db.rank_by_similarity("fresh water", "SELECT id, term FROM terms", top_k=2)
+        self.assertEqual([row['term'] for row, _ in ranked], ["fresh water", "fresh river water"])
+        self.assertEqual(ranked[0][1], 1.0)
+        self.assertAlmostEqual(ranked[1][1], calculate_similarity("fresh water", "fresh river water"))
+
+    def test_global_connection_thread_safe(self):
+        """Des appels concurrents partagent une seule instance globale"""
+        db_path = os.path.join(self.temp_dir, 'global.db')
+        with mock.patch.object(db_connection, '_global_db_connection', None):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                instances = list(executor.map(lambda _: get_database_connection(db_path), range(32)))
+        self.assertEqual(len({id(instance) for instance in instances}), 1)
+        instances[0].close()
+
+    def test_wal_checkpoint_thread(self):
+        """Le thread de checkpoint tourne en arrière-plan et s'arrête avec close()"""
+        db = DatabaseConnection(os.path.join(self.temp_dir, 'wal.db'), checkpoint_interval=0.01)
+        db.execute_update("CREATE TABLE t (x)")
+        thread = db._checkpoint_thread
+        self.assertTrue(thread.is_alive())
+        db.close()
+        self.assertFalse(thread.is_alive())
+
+    def test_close_all(self):
+        """close_all ferme les connexions inactives"""
+        with self.db.get_connection():
+            pass
+        self.db.execute_query("SELECT 1")
+        self.db.close_all()
+        self.assertEqual(self.db._writer_pool.created, 0)
+        self.assertEqual(self.db._reader_pool.created, 0)
+
+    def test_calculate_similarity(self):
+        """Similarité de Jaccard sur les ensembles de mots, en Python et en SQL"""
+        self.assertEqual(calculate_similarity("le chat noir", "Le chat blanc"), 0.5)
+        self.assertEqual(calculate_similarity("", "chat"), 0.0)
+        self.assertEqual(calculate_similarity(" ", "  "), 1.0)
+        self.assertEqual(calculate_similarity(" ", "chat"), 0.0)
+
+        rows = self.db.execute_query("SELECT calculate_similarity(?, ?)", ("sin nyi", "sin"))
+        self.assertEqual(rows[0][0], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,13 +4,19 @@ import os
 import sys
 import unittest
 import tempfile
+import shutil
 import json
+from unittest import mock
 
 # Ajouter le répertoire parent au chemin de recherche
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.database.schema import create_database_schema
-from src.database.glossary_manager import GlossaryManager
+from src.database import glossary_manager
+from src.database.glossary_manager import GlossaryManager, iter_json_items
+from src.database.glossary_learner import EnhancedGlossaryLearner
+from src.database.terminology_importer import TerminologyImporter
+from src.database.insert_glossary import insert_initial_glossary
 from src.translation.glossary_match import GlossaryMatcher
 
 class TestGlossary(unittest.TestCase):
@@ -68,6 +74,333 @@ class TestGlossary(unittest.TestCase):
             self.assertEqual(len(results), 1, "Un terme devrait être trouvé")
             self.assertEqual(results[0]['target_term'], "ordinatɛ")
     
+    def test_connection_pragmas(self):
+        """Le gestionnaire ouvre la base en WAL, et sans journal sur disque en mode bulk"""
+        with GlossaryManager(self.db_path) as gm:
+            self.assertEqual(gm.conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(gm.conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+        
+        with GlossaryManager(self.db_path, bulk=True) as gm:
+            self.assertEqual(gm.conn.execute("PRAGMA journal_mode").fetchone()[0], "memory")
+            self.assertEqual(gm.conn.execute("PRAGMA synchronous").fetchone()[0], 0)
+            self.assertEqual(gm.batch_import(self.glossary_path), 2)
+    
+    def test_language_and_domain_cache(self):
+        """Les identifiants de langue et de domaine sont lus une seule fois"""
+        with GlossaryManager(self.db_path) as gm:
+            statements = []
+            gm.conn.set_trace_callback(statements.append)
+        
+            fon_id = gm.get_language_id("fon")
+            self.assertEqual(gm.get_language_id("fon"), fon_id)
+            self.assertIsNotNone(gm.get_domain_id("tech"))
+            self.assertEqual(statements, [])
+        
+            self.assertIsNone(gm.get_language_id("xx"))
+            self.assertIsNone(gm.get_domain_id("inconnu"))
+            self.assertEqual(len(statements), 2)
+        
+            gm.conn.set_trace_callback(None)
+            row = gm.conn.execute("SELECT id FROM languages WHERE code = 'fon'").fetchone()
+            self.assertEqual(fon_id, row['id'])
+    
+    def test_batch_import_variants(self):
+        """batch_import écrit les variantes et ignore les entrées invalides"""
+        glossary = [
+            {"source_term": "water", "source_lang": "en", "target_term": "sin", "target_lang": "fon",
+             "variants": [{"term": "waters"}, {"term": "sinnu", "is_source": False}]},
+            {"source_term": "fire", "source_lang": "en", "target_lang": "fon"},
+            {"source_term": "moon", "source_lang": "en", "target_term": "sun", "target_lang": "xx",
+             "variants": [{"term": "moons"}]}
+        ]
+        with open(self.glossary_path, 'w', encoding='utf-8') as f:
+            json.dump(glossary, f, ensure_ascii=False)
+        
+        with GlossaryManager(self.db_path) as gm:
+            self.assertEqual(gm.batch_import(self.glossary_path), 1)
+            # Réimporter ne duplique pas les variantes
+            self.assertEqual(gm.batch_import(self.glossary_path), 1)
+        
+            self.assertEqual(gm.search_term("waters", "en", "fon")[0]['target_term'], "sin")
+            variants = gm.conn.execute("SELECT variant, is_source FROM term_variants ORDER BY variant")
+            self.assertEqual([tuple(row) for row in variants], [("sinnu", 0), ("waters", 1)])
+            self.assertEqual(gm.search_term("fire", "en", "fon"), [])
+    
+    def test_batch_import_skips_malformed_terms(self):
+        """Un terme mal formé est ignoré sans annuler l'import du fichier"""
+        glossary = [{"source_term": f"word{i}", "source_lang": "en", "target_term": f"mɔ{i}",
+                     "target_lang": "fon"} for i in range(6)]
+        glossary += [
+            {"source_term": "null", "source_lang": "en", "target_term": None, "target_lang": "fon"},
+            {"source_term": "", "source_lang": "en", "target_term": "vide", "target_lang": "fon"},
+            {"source_term": "list", "source_lang": "en", "target_term": "lo", "target_lang": "fon",
+             "confidence": [0.5]},
+            {"source_term": "dict", "source_lang": "en", "target_term": "do", "target_lang": "fon",
+             "context": {"text": "..."}},
+            {"source_term": "variant", "source_lang": "en", "target_term": "va", "target_lang": "fon",
+             "variants": [{"term": None}]},
+            "word"
+        ]
+        with open(self.glossary_path, 'w', encoding='utf-8') as f:
+            json.dump(glossary, f, ensure_ascii=False)
+        
+        with GlossaryManager(self.db_path) as gm:
+            self.assertEqual(gm.batch_import(self.glossary_path), 6)
+            self.assertEqual(gm.conn.execute("SELECT COUNT(*) FROM glossary_entries").fetchone()[0], 6)
+    
+    def test_insert_initial_glossary(self):
+        """Tous les fichiers de glossaire sont importés dans la même base"""
+        glossary_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, glossary_dir)
+        for source_lang, target_lang in [("en", "fon"), ("fr", "fon"), ("en", "ewe"), ("en", "yor")]:
+            terms = [{"source_term": f"{source_lang}{i}", "source_lang": source_lang,
+                      "target_term": f"{target_lang}{i}", "target_lang": target_lang,
+                      "variants": [{"term": f"{source_lang}{i}s"}]} for i in range(50)]
+            with open(os.path.join(glossary_dir, f"{source_lang}_{target_lang}_glossary.json"), 'w') as f:
+                json.dump(terms, f)
+        
+        self.assertEqual(insert_initial_glossary(self.db_path, glossary_dir), 200)
+        with GlossaryManager(self.db_path) as gm:
+            self.assertEqual(gm.conn.execute("SELECT COUNT(*) FROM glossary_entries").fetchone()[0], 200)
+            self.assertEqual(gm.conn.execute("SELECT COUNT(*) FROM term_variants").fetchone()[0], 200)
+    
+    def test_add_term_upsert(self):
+        """add_term met à jour l'entrée existante et renvoie le même ID"""
+        with GlossaryManager(self.db_path) as gm:
+            entry_id = gm.add_term("water", "en", "sin", "fon", confidence=0.5)
+            self.assertEqual(gm.add_term("water", "en", "sìn", "fon", confidence=0.9), entry_id)
+            self.assertNotEqual(gm.add_term("water", "en", "sin", "fon", domain="science"), entry_id)
+        
+            results = gm.search_term("water", "en", "fon", domain="general")
+            self.assertEqual([(r['id'], r['target_term'], r['confidence_score']) for r in results],
+                             [(entry_id, "sìn", 0.9)])
+    
+    def test_explicit_transaction(self):
+        """Sans autocommit, les écritures restent dans la transaction jusqu'à commit()"""
+        with GlossaryManager(self.db_path, autocommit=False) as gm:
+            entry_id = gm.add_term("water", "en", "sin", "fon")
+            gm.add_term_variant(entry_id, "waters")
+            self.assertTrue(gm.conn.in_transaction)
+            gm.rollback()
+            self.assertEqual(gm.search_term("water", "en", "fon"), [])
+            
+            gm.add_term("fire", "en", "myɔ", "fon")
+            gm.commit()
+            self.assertFalse(gm.conn.in_transaction)
+        
+        with GlossaryManager(self.db_path) as gm:
+            self.assertEqual(gm.search_term("fire", "en", "fon")[0]['target_term'], "myɔ")
+            gm.add_term("moon", "en", "sun", "fon")
+            self.assertFalse(gm.conn.in_transaction)
+    
+    def test_variant_search_uses_index(self):
+        """La recherche par variante passe par un index plutôt qu'un parcours de table"""
+        with GlossaryManager(self.db_path) as gm:
+            plan = gm.conn.execute(
+                "EXPLAIN QUERY PLAN SELECT entry_id FROM term_variants WHERE variant = ? AND is_source = 1",
+                ("waters",)
+            ).fetchall()
+        self.assertIn("idx_variants_variant", plan[0]['detail'])
+    
+    def test_search_term_variants(self):
+        """search_term renvoie les entrées directes puis celles trouvées par variante, sans doublon"""
+        with GlossaryManager(self.db_path) as gm:
+            water = gm.add_term("water", "en", "sin", "fon")
+            gm.add_term_variant(water, "water")
+            science = gm.add_term("water", "en", "sin", "fon", domain="science")
+            river = gm.add_term("river", "en", "tɔ", "fon")
+            gm.add_term_variant(river, "water")
+            
+            ids = [r['id'] for r in gm.search_term("water", "en", "fon")]
+            self.assertEqual(ids, [water, science, river])
+            
+            # Le filtre de domaine ne s'applique qu'aux entrées directes
+            ids = [r['id'] for r in gm.search_term("water", "en", "fon", domain="science")]
+            self.assertEqual(ids, [science, water, river])
+    
+    def test_add_terms_bulk(self):
+        """add_terms_bulk insère, met à jour et ignore les domaines inconnus"""
+        with GlossaryManager(self.db_path) as gm:
+            gm.add_term("water", "en", "sin", "fon", confidence=0.5)
+            count = gm.add_terms_bulk([
+                ("water", "en", "sin", "fon", "general", "fresh water", 0.9, True),
+                ("fire", "en", "myɔ", "fon", "general", None, 0.7, False),
+                ("moon", "en", "sun", "fon", "domaine_inconnu", None, 0.7, False)
+            ])
+            self.assertEqual(count, 2)
+            
+            water = gm.search_term("water", "en", "fon")
+            self.assertEqual(len(water), 1)
+            self.assertEqual(water[0]['confidence_score'], 0.9)
+            self.assertEqual(water[0]['context_example'], "fresh water")
+            self.assertEqual(water[0]['validated'], 1)
+            self.assertEqual(gm.search_term("fire", "en", "fon")[0]['target_term'], "myɔ")
+            self.assertEqual(gm.search_term("moon", "en", "fon"), [])
+    
+    def test_add_terms_bulk_chunks(self):
+        """add_terms_bulk écrit les lots complets puis le dernier lot incomplet"""
+        rows = [(f"term{i}", "en", f"nyi{i}", "fon", "general", None, 0.5, False) for i in range(1203)]
+        with GlossaryManager(self.db_path) as gm:
+            self.assertEqual(gm.add_terms_bulk(rows), 1203)
+            
+            # Doublon dans un même lot: la dernière ligne l'emporte
+            duplicate = ("term0", "en", "nyi", "fon", "general", None, 0.9, True)
+            self.assertEqual(gm.add_terms_bulk(rows[:499] + [duplicate]), 500)
+            
+            count = gm.conn.execute("SELECT COUNT(*) FROM glossary_entries").fetchone()[0]
+            self.assertEqual(count, 1203)
+            self.assertEqual(gm.search_term("term0", "en", "fon")[0]['target_term'], "nyi")
+            self.assertEqual(gm.search_term("term1202", "en", "fon")[0]['target_term'], "nyi1202")
+    
+    def test_bulk_insert(self):
+        """bulk_insert écrit les termes (par apsw s'il est installé, sinon par sqlite3)"""
+        rows = [(f"term{i}", "en", f"nyi{i}", "fon", "general", None, 0.5, True) for i in range(600)]
+        with GlossaryManager(self.db_path) as gm:
+            self.assertEqual(gm.bulk_insert(rows), 600)
+            self.assertEqual(gm.search_term("term599", "en", "fon")[0]['target_term'], "nyi599")
+            
+            # Dans une transaction ouverte, les termes passent par la connexion du gestionnaire
+            # et la transaction reste à valider par l'appelant
+            gm.begin()
+            self.assertEqual(gm.bulk_insert([("moon", "en", "sun", "fon", "general", None, 0.7, False)]), 1)
+            self.assertTrue(gm.conn.in_transaction)
+            self.assertEqual(len(gm.search_term("moon", "en", "fon")), 1)
+            gm.rollback()
+            self.assertEqual(gm.search_term("moon", "en", "fon"), [])
+    
+    @unittest.skipUnless(glossary_manager.APSW_AVAILABLE, "apsw non installé")
+    def test_bulk_insert_apsw(self):
+        """bulk_insert écrit par apsw, y compris en mode bulk"""
+        rows = [(f"term{i}", "en", f"nyi{i}", "fon", "general", None, 0.5, True) for i in range(600)]
+        with GlossaryManager(self.db_path, bulk=True) as gm:
+            self.assertEqual(gm.bulk_insert(rows), 600)
+            self.assertEqual(gm.bulk_insert(rows[:10]), 10)
+            self.assertFalse(gm.conn.in_transaction)
+            
+            results = gm.search_term("term599", "en", "fon")
+            self.assertEqual([(r['target_term'], r['validated']) for r in results], [("nyi599", 1)])
+            count = gm.conn.execute("SELECT COUNT(*) FROM glossary_entries").fetchone()[0]
+            self.assertEqual(count, 600)
+    
+    def test_import_external_glossary_csv(self):
+        """Un glossaire CSV est importé ligne par ligne"""
+        csv_path = self.db_path + '.csv'
+        self.addCleanup(os.unlink, csv_path)
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.write("source,target,domain\nwater,sin,general\nmoon,sun,general\nfire,myɔ,inconnu\n")
+        
+        learner = EnhancedGlossaryLearner(self.db_path)
+        self.assertEqual(learner.import_external_glossary(csv_path, "en", "fon"), 2)
+        
+        with GlossaryManager(self.db_path) as gm:
+            self.assertEqual(gm.search_term("moon", "en", "fon")[0]['target_term'], "sun")
+    
+    def test_iter_json_items(self):
+        """Les éléments JSON sont identiques avec et sans orjson"""
+        json_path = self.db_path + '.json'
+        self.addCleanup(os.unlink, json_path)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({"terms": [{"en": "water", "fon": "sìn", "score": 0.5}]}, f, ensure_ascii=False)
+        
+        items = list(iter_json_items(json_path, 'terms.item'))
+        self.assertEqual(items, [{"en": "water", "fon": "sìn", "score": 0.5}])
+        self.assertEqual(list(iter_json_items(json_path, 'item')), [])
+        with mock.patch.object(glossary_manager, 'ORJSON_AVAILABLE', False):
+            self.assertEqual(list(iter_json_items(json_path, 'terms.item')), items)
+    
+    def test_import_terminology_json(self):
+        """Les deux formats JSON de terminologie sont importés et comptés par langue"""
+        concepts = [
+            {"source_term": "water", "domain": "science",
+             "translations": [{"language": "fon", "term": "sin"}, {"language": "ewe", "term": "tsi"}]},
+            {"source_term": "moon", "translations": [{"language": "fon", "term": "sun"}]}
+        ]
+        nested = {"terms": [{"en": "fire", "fon": "myɔ", "yor": "iná", "domain": "general"}]}
+        
+        importer = TerminologyImporter(self.db_path)
+        for data, expected in [(concepts, {"fon": 1, "ewe": 1}), (nested, {"fon": 1, "yor": 1})]:
+            with open(self.glossary_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            # "moon" n'a pas de domaine et le domaine par défaut n'existe pas
+            self.assertEqual(importer.import_multilingual_terminology(self.glossary_path, "en"), expected)
+        
+        stats = importer.import_multilingual_terminology(self.glossary_path, "en", target_langs=["yor"])
+        self.assertEqual(stats, {"yor": 1})
+        
+        with GlossaryManager(self.db_path) as gm:
+            self.assertEqual(gm.search_term("water", "en", "ewe")[0]['confidence_score'], 0.9)
+            self.assertEqual(gm.search_term("fire", "en", "yor")[0]['target_term'], "iná")
+            self.assertEqual(gm.search_term("moon", "en", "fon"), [])
+    
+    def test_import_terminology_tbx(self):
+        """Les concepts TBX sont importés un par un, avec les codes de langue normalisés"""
+        tbx_path = self.db_path + '.tbx'
+        self.addCleanup(os.unlink, tbx_path)
+        concepts = [("water", [("fon-BJ", "sin"), ("ewe", "tsi")]), ("fire", [("fon", "myɔ")])]
+        with open(tbx_path, 'w', encoding='utf-8') as f:
+            f.write('<tbx xmlns="urn:iso:std:iso:30042:ed-1"><text><body>')
+            for source, translations in concepts:
+                f.write('<conceptEntry>')
+                for lang, term in [("en", source)] + translations:
+                    f.write(f'<langSec><termSec><termNote type="language">{lang}</termNote>'
+                            f'<term>{term}</term></termSec></langSec>')
+                f.write('</conceptEntry>')
+            f.write('</body></text></tbx>')
+        
+        importer = TerminologyImporter(self.db_path)
+        stats = importer.import_multilingual_terminology(tbx_path, "en", domain="general")
+        self.assertEqual(stats, {"fon": 2, "ewe": 1})
+        stats = importer.import_multilingual_terminology(tbx_path, "en", target_langs=["ewe"], domain="general")
+        self.assertEqual(stats, {"ewe": 1})
+        
+        with GlossaryManager(self.db_path) as gm:
+            self.assertEqual(gm.search_term("water", "en", "fon")[0]['target_term'], "sin")
+            self.assertEqual(gm.search_term("fire", "en", "fon")[0]['validated'], 1)
+    
+    def test_import_terminology_tabular(self):
+        """Les colonnes term_XX d'un fichier TSV sont importées par langue"""
+        tsv_path = self.db_path + '.tsv'
+        self.addCleanup(os.unlink, tsv_path)
+        with open(tsv_path, 'w', encoding='utf-8') as f:
+            f.write("term_en\tTerm_fon\tterm_ewe\tdomain\n"
+                    "water\tsin\ttsi\tgeneral\n"
+                    "\txu\t\tgeneral\n"
+                    "fire\tmyɔ\t\tinconnu\n")
+        
+        importer = TerminologyImporter(self.db_path)
+        self.assertEqual(importer.import_multilingual_terminology(tsv_path, "en"), {"fon": 1, "ewe": 1})
+        self.assertEqual(importer.import_multilingual_terminology(tsv_path, "fr"), {})
+        self.assertEqual(importer.import_multilingual_terminology(tsv_path, "en", target_langs=("ewe",)), {"ewe": 1})
+        
+        with GlossaryManager(self.db_path) as gm:
+            self.assertEqual(gm.search_term("water", "en", "ewe")[0]['target_term'], "tsi")
+            self.assertEqual(gm.search_term("fire", "en", "fon"), [])
+    
+    def test_get_existing_terms(self):
+        """get_existing_terms trouve les termes par entrée ou par variante source"""
+        with GlossaryManager(self.db_path) as gm:
+            entry_id = gm.add_term("water", "en", "sin", "fon")
+            gm.add_term_variant(entry_id, "waters")
+            gm.add_term_variant(entry_id, "sìn", is_source=False)
+            gm.add_term("fire", "en", "dzo", "ewe")
+            
+            words = ["water", "waters", "sìn", "fire"] + [f"word{i}" for i in range(600)]
+            self.assertEqual(gm.get_existing_terms("en", "fon", words), {"water", "waters"})
+    
+    def test_search_terms_bulk(self):
+        """search_terms_bulk retourne les mêmes résultats que search_term"""
+        with GlossaryManager(self.db_path) as gm:
+            gm.batch_import(self.glossary_path)
+            entry_id = gm.add_term("water", "en", "sin", "fon")
+            gm.add_term_variant(entry_id, "waters")
+            
+            terms = ["computer", "water", "waters", "moon"]
+            found = gm.search_terms_bulk(terms, "en", "fon")
+            
+            self.assertEqual(set(found), {"computer", "water", "waters"})
+            for term in terms:
+                self.assertEqual(found.get(term, []), gm.search_term(term, "en", "fon"))
+    
     def test_glossary_matcher(self):
         """Teste le matcher de glossaire"""
         with GlossaryManager(self.db_path) as gm:
@@ -115,6 +448,105 @@ class TestGlossary(unittest.TestCase):
                 self.assertEqual(exported[0]['source_term'], "computer")
             
             os.unlink(export_path)
+    
+    def test_extract_potential_translations(self):
+        """Les cooccurrences et occurrences sont comptées sur tout le lot"""
+        learner = EnhancedGlossaryLearner(self.db_path)
+        segments = [
+            ("water", "sin"),
+            ("cold water", "sin fifa"),
+            ("fire", "myɔ"),
+            ("computer", "kompyuta")
+        ]
+        word_pairs = learner._extract_potential_translations(segments)
+        
+        stats = word_pairs[("water", "sin")]
+        self.assertEqual(stats['count'], 2)
+        self.assertEqual(stats['source_occurrences'], 2)
+        self.assertEqual(stats['target_occurrences'], 2)
+        self.assertEqual(word_pairs[("cold water", "sin fifa")]['count'], 1)
+        self.assertNotIn(("fire", "sin"), word_pairs)
+        # Longueurs trop différentes pour être une traduction
+        self.assertNotIn(("cold water", "sin"), word_pairs)
+        
+        # Seules les paires qui atteignent le seuil sont conservées
+        filtered = learner._extract_potential_translations(segments, min_confidence=0.6)
+        self.assertEqual(list(filtered), [("computer", "kompyuta")])
+        for pair, stats in word_pairs.items():
+            passes = learner._calculate_confidence_score(stats) >= 0.6
+            self.assertEqual(pair in filtered, passes, pair)
+            if passes:
+                self.assertEqual(filtered[pair], stats)
+    
+    def test_document_frequency_filter(self):
+        """Les mots vides et les hapax d'un grand lot ne forment pas de paires"""
+        learner = EnhancedGlossaryLearner(self.db_path)
+        segments = []
+        for source, target in [("water", "sin"), ("fire", "myɔ"), ("moon", "sun"), ("sea", "xu")]:
+            segments += [(f"the {source}", f"{target} ɔ")] * 5
+        segments.append(("the sky", "jiwu ɔ"))
+        
+        word_pairs = learner._extract_potential_translations(segments)
+        self.assertIn(("water", "sin"), word_pairs)
+        self.assertIn(("the water", "sin ɔ"), word_pairs)
+        self.assertFalse(any(s == "the" or t == "ɔ" for s, t in word_pairs))
+        self.assertNotIn(("sky", "jiwu"), word_pairs)
+        self.assertEqual(word_pairs.source_stopwords, {"the"})
+        self.assertEqual(word_pairs.target_stopwords, {"ɔ"})
+        
+        # Les mots vides sont mémorisés et écartés des lots suivants, même petits
+        with GlossaryManager(self.db_path) as gm:
+            learner._select_learned_terms(gm, word_pairs, "en", "fon", 0.0)
+            small = learner._extract_potential_translations([("the", "ɔ"), ("sky", "jiwu")])
+            terms = learner._select_learned_terms(gm, small, "en", "fon", 0.0)
+        self.assertEqual([(s, t) for s, t, _ in terms], [("sky", "jiwu")])
+    
+    def test_tokenize(self):
+        """La tokenisation ASCII rapide et la tokenisation Unicode sont cohérentes"""
+        learner = EnhancedGlossaryLearner(self.db_path)
+        self.assertEqual(learner._tokenize("L'eau, c'est la_vie! (2024)"),
+                         ["l", "eau", "c", "est", "la_vie", "2024"])
+        self.assertEqual(learner._tokenize("Sìn, ɖò xó!"), ["sìn", "ɖò", "xó"])
+    
+    def test_learn_from_aligned_corpora(self):
+        """L'apprentissage groupé donne le même glossaire que l'apprentissage fichier par fichier"""
+        corpora = [
+            [("water is life", "sin wɛ nyí gbɛ"), ("the water", "sin ɔ")],
+            [("water", "sin"), ("life is good", "gbɛ nyɔ")]
+        ]
+        corpus_paths = []
+        for segments in corpora:
+            temp_corpus = tempfile.NamedTemporaryFile('w', suffix='.tsv', delete=False, encoding='utf-8')
+            temp_corpus.write("source\ttarget\n")
+            for source, target in segments:
+                temp_corpus.write(f"{source}\t{target}\n")
+            temp_corpus.close()
+            corpus_paths.append(temp_corpus.name)
+        
+        reference_db = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+        reference_db.close()
+        create_database_schema(reference_db.name)
+        
+        try:
+            learner = EnhancedGlossaryLearner(reference_db.name)
+            expected = sum(learner.learn_from_aligned_corpus(path, "en", "fon", min_confidence=0.5)
+                           for path in corpus_paths)
+            
+            # Extraction parallèle, écritures dans le processus principal
+            learned = EnhancedGlossaryLearner(self.db_path).learn_from_aligned_corpora(
+                corpus_paths, "en", "fon", min_confidence=0.5, workers=2
+            )
+            self.assertGreater(learned, 0)
+            self.assertEqual(learned, expected)
+            
+            query = "SELECT source_term, target_term, confidence_score FROM glossary_entries ORDER BY source_term"
+            with GlossaryManager(reference_db.name) as ref, GlossaryManager(self.db_path) as gm:
+                self.assertEqual([tuple(row) for row in gm.conn.execute(query)],
+                                 [tuple(row) for row in ref.conn.execute(query)])
+        finally:
+            os.unlink(reference_db.name)
+            for path in corpus_paths:
+                os.unlink(path)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,135 @@
+# tests/test_resource_manager.py
+
+import os
+import sys
+import unittest
+import tempfile
+import shutil
+from unittest import mock
+
+# Ajouter le répertoire parent au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.corpus import resource_manager
+from src.corpus.resource_manager import LinguisticResourceManager
+from src.database.glossary_manager import GlossaryManager
+from src.database.schema import create_database_schema
+
+
+class TestLinguisticResourceManager(unittest.TestCase):
+    """Tests de l'enrichissement du glossaire depuis toutes les sources"""
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.config = {
+            'paths': {
+                'glossary_db': os.path.join(self.data_dir, 'glossary.db'),
+                'data_dir': self.data_dir
+            }
+        }
+        self.manager = LinguisticResourceManager(self.config)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def test_enrich_without_corpus(self):
+        """Les autres étapes s'exécutent quand aucun corpus OPUS n'est disponible"""
+        # Fichier de terminologie au format domaine_source_cible.ext
+        open(os.path.join(self.manager.terminology_dir, 'tech_en_fon.csv'), 'w').close()
+
+        custom_manager = mock.Mock()
+        custom_manager.download_language_specific_resources.return_value = []
+
+        with mock.patch.object(self.manager, 'download_corpus', return_value=None), \
+             mock.patch.object(self.manager, 'extract_wiktionary_terms', return_value=7) as wiktionary, \
+             mock.patch.object(self.manager, 'import_terminology', return_value={'fon': 3}) as terminology, \
+             mock.patch.object(resource_manager, '_get_custom_corpus_manager', return_value=custom_manager), \
+             mock.patch.object(resource_manager, '_get_learner') as get_learner:
+            stats = self.manager.enrich_from_all_sources('en', 'fon')
+
+        wiktionary.assert_called_once_with('en', 'fon', max_words=300)
+        terminology.assert_called_once()
+        custom_manager.download_language_specific_resources.assert_called_once_with('fon')
+        get_learner.assert_not_called()
+
+        self.assertEqual(stats['corpus'], 0)
+        self.assertEqual(stats['wiktionary'], 7)
+        self.assertEqual(stats['terminology'], 3)
+        self.assertEqual(stats['terminology_details'], {'tech': 3})
+        self.assertEqual(stats['total'], 10)
+
+    def test_glossary_statistics_are_memoized(self):
+        """Les statistiques sont mémorisées tant que la base n'est pas modifiée"""
+        create_database_schema(self.config['paths']['glossary_db'])
+        with GlossaryManager(self.config['paths']['glossary_db']) as gm:
+            gm.add_term("computer", "en", "ordinatɛ", "fon", "tech")
+
+        stats = self.manager.get_glossary_statistics('en', 'fon')
+        self.assertEqual(stats['pair_entries'], 1)
+
+        # Résultat mémorisé : aucune requête sur la base
+        with mock.patch('src.database.glossary_manager.GlossaryManager', side_effect=AssertionError):
+            self.assertEqual(self.manager.get_glossary_statistics('en', 'fon'), stats)
+
+        # Une écriture directe, hors de ce gestionnaire, est prise en compte
+        with GlossaryManager(self.config['paths']['glossary_db']) as gm:
+            gm.add_term("water", "en", "sin", "fon")
+        self.assertEqual(self.manager.get_glossary_statistics('en', 'fon')['pair_entries'], 2)
+
+    def test_glossary_statistics_are_copies(self):
+        """Modifier les statistiques retournées n'altère pas les appels suivants"""
+        create_database_schema(self.config['paths']['glossary_db'])
+        with GlossaryManager(self.config['paths']['glossary_db']) as gm:
+            gm.add_term("computer", "en", "ordinatɛ", "fon", "tech")
+
+        stats = self.manager.get_glossary_statistics('en', 'fon')
+        stats['pair_entries'] = 42
+        stats['domains'].clear()
+
+        stats = self.manager.get_glossary_statistics('en', 'fon')
+        self.assertEqual(stats['pair_entries'], 1)
+        self.assertEqual(stats['domains'], {'tech': 1})
+
+    def test_glossary_statistics_per_database(self):
+        """Deux bases distinctes ne partagent pas leurs statistiques"""
+        create_database_schema(self.config['paths']['glossary_db'])
+        with GlossaryManager(self.config['paths']['glossary_db']) as gm:
+            gm.add_term("computer", "en", "ordinatɛ", "fon", "tech")
+        self.assertEqual(self.manager.get_glossary_statistics('en', 'fon')['pair_entries'], 1)
+
+        other_dir = os.path.join(self.data_dir, 'other')
+        other_config = {
+            'paths': {
+                'glossary_db': os.path.join(other_dir, 'glossary.db'),
+                'data_dir': other_dir
+            }
+        }
+        other_manager = LinguisticResourceManager(other_config)
+        create_database_schema(other_config['paths']['glossary_db'])
+        self.assertEqual(other_manager.get_glossary_statistics('en', 'fon')['pair_entries'], 0)
+
+        # Un même gestionnaire pointé vers une autre base recalcule
+        self.manager.db_path = other_config['paths']['glossary_db']
+        self.assertEqual(self.manager.get_glossary_statistics('en', 'fon')['pair_entries'], 0)
+
+    def test_wiktionary_extraction_invalidates_statistics(self):
+        """L'extraction Wiktionary supprime les statistiques mémorisées"""
+        db_path = self.config['paths']['glossary_db']
+        create_database_schema(db_path)
+        self.assertEqual(self.manager.get_glossary_statistics('en', 'fon')['pair_entries'], 0)
+
+        def extract_translations(source_lang, target_lang, max_words):
+            with GlossaryManager(db_path) as gm:
+                gm.add_term("water", "en", "sin", "fon")
+            return 1
+
+        extractor_module = mock.Mock()
+        extractor_module.WiktionaryExtractor.return_value.extract_translations.side_effect = extract_translations
+        with mock.patch.dict(sys.modules, {'src.database.wiktionary_extractor': extractor_module}):
+            self.assertEqual(self.manager.extract_wiktionary_terms('en', 'fon', max_words=5), 1)
+
+        self.assertEqual(self.manager.get_glossary_statistics('en', 'fon')['pair_entries'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()